@@ -0,0 +1,514 @@
+"""
+Kontrol, telemetri ve video yolları için performans ölçümleri.
+
+Tüm ölçümler süreç içi simülatöre ("sim://") karşı ve FastAPI uygulamasına
+ASGI üzerinden doğrudan bağlanarak çalışır; SITL veya ağ gerekmez (httpx
+gerekir). Sonuçlar JSON olarak yazılır ve kayıtlı bir referansla
+karşılaştırılabilir:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline baseline.json --threshold 0.2
+
+Metrik adları yönü belirtir: "_ms" ile bitenlerde düşük, "_per_s" ve "_hz"
+ile bitenlerde yüksek değer daha iyidir.
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    sys.exit("Ölçümler için httpx gerekli: pip install httpx")
+
+from src.api.endpoints import setup_api_endpoints
+from src.api.frames import FrameBuffer, pack_frames
+from src.core import geodesy
+from src.core.drone_controller import RealDroneController
+from src.core.geofence import Geofence
+from src.gui.video import VideoConsumer
+
+SIM_TIME_SCALE = 100
+
+
+def summarize(samples_ms):
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if samples.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "max_ms": float(samples.max()),
+    }
+
+
+async def wait_connected(controller, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not controller.connected:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Simülatör bağlantısı kurulamadı")
+        await asyncio.sleep(0.01)
+
+
+async def bench_command_latency(client, iterations):
+    # Simülatör saati hızlandırıldığı için manevra süreleri birkaç ms sürer;
+    # ölçülen değer API + kontrolcü + tamamlanma bekleme yoludur.
+    routes = {
+        "move3d": "/move3d?velocity_x=1&velocity_y=0&velocity_z=0&duration=0.5",
+        "turn": "/turn?angle=15&wait=true",
+        "stop": "/stop",
+    }
+    results = {}
+    for name, url in routes.items():
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = await client.get(url)
+            samples.append((time.perf_counter() - started) * 1000.0)
+            response.raise_for_status()
+        results[name] = summarize(samples)
+    return results
+
+
+async def bench_setpoint_stream(controller, seconds):
+    vehicle = controller.vehicle
+    stamps = []
+    original = vehicle.send_mavlink
+
+    def recording_send(message):
+        if message.get_type() == "SET_POSITION_TARGET_LOCAL_NED":
+            stamps.append(time.perf_counter())
+        original(message)
+
+    vehicle.send_mavlink = recording_send
+    controller.setpoints.stats()
+    try:
+        await controller.send_ned_velocity(1, 0, 0, duration=seconds * SIM_TIME_SCALE)
+    finally:
+        vehicle.send_mavlink = original
+    intervals = np.diff(np.asarray(stamps)) * 1000.0
+    expected_ms = 1000.0 / controller.setpoints.stats()["rate_hz"]
+    jitter = np.abs(intervals - expected_ms) if intervals.size else np.zeros(1)
+    return {
+        "configured_hz": controller.setpoints.stats()["rate_hz"],
+        "achieved_hz": float(len(stamps) / seconds),
+        "jitter_mean_ms": float(jitter.mean()),
+        "jitter_p99_ms": float(np.percentile(jitter, 99)),
+        "jitter_max_ms": float(jitter.max()),
+    }
+
+
+async def bench_telemetry_throughput(client, clients, seconds):
+    samples = []
+    deadline = time.perf_counter() + seconds
+
+    async def poller():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get("/telemetry")
+            samples.append((time.perf_counter() - started) * 1000.0)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(poller() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    result = summarize(samples)
+    result["clients"] = clients
+    result["requests_per_s"] = len(samples) / elapsed
+    return result
+
+
+async def bench_telemetry_formats(client, iterations):
+    # Aynı snapshot tekrar okunduğunda kodlama önbellekten gelir; ölçülen
+    # değer istek yolu ve yük boyutudur.
+    results = {}
+    for name in ("json", "msgpack", "binary"):
+        response = await client.get(f"/telemetry?format={name}")
+        if response.status_code == 406:
+            continue  # İsteğe bağlı kodlayıcı kurulu değil
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = await client.get(f"/telemetry?format={name}")
+            samples.append((time.perf_counter() - started) * 1000.0)
+        result = summarize(samples)
+        result["payload_bytes"] = len(response.content)
+        results[name] = result
+    return results
+
+
+async def bench_ws_telemetry(app, clients, rate, seconds):
+    # httpx ASGI taşıyıcısı WebSocket desteklemediği için istemciler ASGI
+    # arayüzü üzerinden doğrudan bağlanır.
+    received = [0] * clients
+    stop = asyncio.Event()
+
+    async def viewer(index):
+        connected = False
+
+        async def receive():
+            nonlocal connected
+            if not connected:
+                connected = True
+                return {"type": "websocket.connect"}
+            await stop.wait()
+            return {"type": "websocket.disconnect", "code": 1000}
+
+        async def send(message):
+            if message["type"] == "websocket.send":
+                received[index] += 1
+
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": "/ws/telemetry",
+            "raw_path": b"/ws/telemetry",
+            "query_string": f"rate={rate}".encode(),
+            "headers": [],
+            "subprotocols": [],
+            "client": ("bench", index),
+            "server": ("bench", 80),
+        }
+        await app(scope, receive, send)
+
+    cpu_started = time.process_time()
+    tasks = [asyncio.ensure_future(viewer(i)) for i in range(clients)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    cpu = time.process_time() - cpu_started
+    per_client = np.asarray(received, dtype=np.float64) / seconds
+    return {
+        "clients": clients,
+        "messages_per_s": float(per_client.sum()),
+        "client_min_hz": float(per_client.min()),
+        "client_mean_hz": float(per_client.mean()),
+        "cpu_ms_per_s": cpu * 1000.0 / seconds,
+    }
+
+
+def make_jpeg(width=1280, height=720):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (40, 90, 160)).save(buffer, "JPEG", quality=80)
+    return buffer.getvalue()
+
+
+async def bench_frame_latency(client, fps, seconds):
+    base = make_jpeg()
+    sent = {}
+    latencies = []
+    frames = int(fps * seconds)
+    done = asyncio.Event()
+
+    async def producer():
+        period = 1.0 / fps
+        next_time = time.perf_counter()
+        for seq in range(frames):
+            # JPEG sonu işaretinden sonraki baytları çözücüler yok sayar;
+            # sıra numarası kareleri ayırt etmek için buraya eklenir.
+            frame = base + seq.to_bytes(4, "big")
+            sent[frame[-4:]] = time.perf_counter()
+            await client.post(
+                "/upload_frame", files={"file": ("frame.jpg", frame, "image/jpeg")}
+            )
+            next_time += period
+            await asyncio.sleep(max(0.0, next_time - time.perf_counter()))
+        await asyncio.sleep(0.2)
+        done.set()
+
+    async def consumer():
+        seen = set()
+        cursor = 0
+        while not done.is_set():
+            # Long-poll: yeni kare gelene kadar sunucuda beklenir.
+            response = await client.get(f"/camera_feed?after={cursor}&timeout=0.1")
+            if response.status_code == 200:
+                cursor = int(response.headers["X-Frame-Seq"])
+                key = response.content[-4:]
+                if key in sent and key not in seen:
+                    seen.add(key)
+                    latencies.append((time.perf_counter() - sent[key]) * 1000.0)
+        return len(seen)
+
+    started = time.perf_counter()
+    _, received = await asyncio.gather(producer(), consumer())
+    elapsed = time.perf_counter() - started
+    result = summarize(latencies)
+    result["frames_sent"] = frames
+    result["frames_received"] = received
+    result["serve_fps_per_s"] = received / elapsed
+    return result
+
+
+async def bench_frame_ingest(client, frames, batch):
+    # 1080p kare; her alım yolu aynı sayıda kareyi olabildiğince hızlı gönderir.
+    data = make_jpeg(1920, 1080)
+    paths = {
+        "multipart": lambda seq: client.post(
+            "/upload_frame", files={"file": ("frame.jpg", data, "image/jpeg")}
+        ),
+        "raw": lambda seq: client.post(
+            "/ingest/frame",
+            content=data,
+            headers={
+                "Content-Type": "image/jpeg",
+                "X-Capture-Time": repr(time.time()),
+                "X-Source-Seq": str(seq),
+            },
+        ),
+    }
+    results = {"frame_bytes": len(data)}
+    for name, send in paths.items():
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for seq in range(frames):
+            await send(seq)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        results[name] = {
+            "frames_per_s": frames / elapsed,
+            "cpu_per_frame_ms": cpu * 1000.0 / frames,
+        }
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for first in range(0, frames, batch):
+        records = [(data, time.time(), seq) for seq in range(first, min(first + batch, frames))]
+        await client.post("/ingest/batch", content=pack_frames(records))
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    results["batch"] = {
+        "frames_per_s": frames / elapsed,
+        "cpu_per_frame_ms": cpu * 1000.0 / frames,
+    }
+    return results
+
+
+async def bench_renditions(client, viewers, frames):
+    # Her karede viewers izleyici aynı anda 640x480 kopyayı ister; kopya
+    # kare başına bir kez üretilmelidir.
+    data = make_jpeg(1920, 1080)
+    headers = {"Content-Type": "image/jpeg"}
+    samples = []
+    started = time.perf_counter()
+    for _ in range(frames):
+        await client.post("/ingest/frame", content=data, headers=headers)
+
+        async def viewer():
+            t0 = time.perf_counter()
+            await client.get("/camera_feed?w=640&h=480")
+            samples.append((time.perf_counter() - t0) * 1000.0)
+
+        await asyncio.gather(*(viewer() for _ in range(viewers)))
+    elapsed = time.perf_counter() - started
+    result = summarize(samples)
+    result["viewers"] = viewers
+    result["frames_per_s"] = frames / elapsed
+    result["renders"] = (await client.get("/camera_stats")).json()["renders"]
+    return result
+
+
+def bench_local_video(frames):
+    # GUI'nin süreç içi kare aboneliği: yayından çözülmüş karenin Tk'ye
+    # hazır olmasına kadar geçen süre (gösterim döngüsü aralığı hariç).
+    buffer = FrameBuffer()
+    consumer = VideoConsumer(size=(640, 480), frames=buffer)
+    consumer.start()
+    data = make_jpeg()
+    samples = []
+    try:
+        for _ in range(frames):
+            started = time.perf_counter()
+            buffer.publish(data)
+            while consumer.take() is None:
+                time.sleep(0.0002)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    finally:
+        consumer.stop()
+    return summarize(samples)
+
+
+def bench_geodesy(points, iterations):
+    # Tarama rotası: points noktalı bir yılan deseni, tek çağrıda işlenir.
+    rng = np.random.default_rng(0)
+    north = np.cumsum(rng.uniform(0, 20, points))
+    east = np.where(np.arange(points) // 50 % 2, 500.0, 0.0)
+    results = {"points": points}
+    cases = {
+        "ned_to_geodetic": lambda: geodesy.ned_to_geodetic(north, east, -30.0, 41.0, 29.0),
+    }
+    lat, lon, _ = cases["ned_to_geodetic"]()
+    cases["haversine_path"] = lambda: geodesy.path_length(lat, lon)
+    cases["vincenty_path"] = lambda: geodesy.path_length(lat, lon, method="vincenty")
+    cases["bearing"] = lambda: geodesy.bearing(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    for name, fn in cases.items():
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000.0)
+        results[name] = summarize(samples)
+    return results
+
+
+def bench_geofence(zones, checks):
+    # zones adet küçük yasak poligon/silindir, ~20 km'lik bir alana dağıtılır.
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-0.1, 0.1, (zones, 2)) + (29.0, 41.0)
+    features = []
+    for i, (lon, lat) in enumerate(centers):
+        if i % 2:
+            h = 5e-4
+            ring = [[lon - h, lat - h], [lon + h, lat - h], [lon + h, lat + h], [lon - h, lat + h]]
+            geometry = {"type": "Polygon", "coordinates": [ring]}
+            properties = {}
+        else:
+            geometry = {"type": "Point", "coordinates": [lon, lat]}
+            properties = {"radius": 40}
+        features.append({"type": "Feature", "geometry": geometry, "properties": properties})
+    started = time.perf_counter()
+    fence = Geofence.from_geojson({"type": "FeatureCollection", "features": features})
+    load_ms = (time.perf_counter() - started) * 1000.0
+    points = (rng.uniform(-0.1, 0.1, (checks, 2)) + (41.0, 29.0)).tolist()
+    started = time.perf_counter()
+    for lat, lon in points:
+        fence.check(lat, lon, 30.0)
+    elapsed = time.perf_counter() - started
+    return {
+        "zones": zones,
+        "load_ms": load_ms,
+        "check_mean_ms": elapsed * 1000.0 / checks,
+        "checks_per_s": checks / elapsed,
+    }
+
+
+async def run_all(args):
+    controller = RealDroneController(
+        f"sim://?time_scale={SIM_TIME_SCALE}", setpoint_rate_hz=args.setpoint_rate
+    )
+    controller.log = lambda message: None
+    app = setup_api_endpoints(controller)
+    controller.start()
+    await wait_connected(controller)
+    await controller.arm_and_takeoff(10)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {
+            "command_latency": await bench_command_latency(client, args.iterations),
+            "setpoint_stream": await bench_setpoint_stream(controller, args.seconds),
+            "telemetry": await bench_telemetry_throughput(
+                client, args.clients, args.seconds
+            ),
+            "telemetry_formats": await bench_telemetry_formats(client, args.iterations),
+            "frames": await bench_frame_latency(client, args.fps, args.seconds),
+            "frame_ingest": await bench_frame_ingest(client, args.ingest_frames, 10),
+            "renditions": await bench_renditions(client, args.clients, 30),
+            "local_video": bench_local_video(30),
+            "ws_telemetry": await bench_ws_telemetry(
+                app, args.ws_clients, args.ws_rate, args.seconds
+            ),
+            "geodesy": bench_geodesy(args.route_points, args.iterations),
+            "geofence": bench_geofence(args.fence_zones, 20000),
+        }
+    await controller.disconnect()
+    return results
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    """
+    Her metrik için referansa göre oransal değişimi döndürür. Eşikten büyük
+    kötüleşmeler "regression" olarak işaretlenir.
+    """
+    current_flat = flatten(current)
+    rows = []
+    for name, base in flatten(baseline).items():
+        if name not in current_flat or not base:
+            continue
+        if name.endswith("_ms"):
+            lower_is_better = True
+        elif name.endswith("_per_s") or name.endswith("_hz"):
+            lower_is_better = False
+        else:
+            continue
+        value = current_flat[name]
+        change = (value - base) / abs(base)
+        worse = change > threshold if lower_is_better else change < -threshold
+        rows.append(
+            {
+                "metric": name,
+                "baseline": base,
+                "current": value,
+                "change": change,
+                "regression": worse,
+            }
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak referans JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--ingest-frames", type=int, default=90)
+    parser.add_argument("--setpoint-rate", type=int, default=20)
+    parser.add_argument("--ws-clients", type=int, default=200)
+    parser.add_argument("--ws-rate", type=float, default=10.0)
+    parser.add_argument("--route-points", type=int, default=10000)
+    parser.add_argument("--fence-zones", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": asyncio.run(run_all(args)),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report["results"], baseline["results"], args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        print(json.dumps({"comparison": rows, "regressions": len(regressions)}, indent=2))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
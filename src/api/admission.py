@@ -0,0 +1,100 @@
+import math
+import time
+from collections import namedtuple
+
+SAFETY = "safety"
+MOTION = "motion"
+COMMAND = "command"
+
+# rate: saniyede yenilenen jeton, burst: kova kapasitesi, max_inflight: şerit
+# genelinde aynı anda işlenebilecek istek sayısı. None sınırsız demektir.
+LaneLimit = namedtuple("LaneLimit", ["rate", "burst", "max_inflight"])
+
+DEFAULT_LIMITS = {
+    # Durdurma ve iniş hiçbir zaman reddedilmez.
+    SAFETY: LaneLimit(None, None, None),
+    MOTION: LaneLimit(50.0, 100.0, 64),
+    COMMAND: LaneLimit(5.0, 10.0, 16),
+}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now):
+        """Jeton varsa alır ve 0 döner; yoksa bir jeton için beklenecek süre."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class AdmissionControl:
+    """
+    Komut isteklerinin kabulü. Her istemcinin her şerit için ayrı bir jeton
+    kovası vardır; ayrıca şerit başına eşzamanlı istek sayısı sınırlıdır.
+    Reddedilen istek beklemeye alınmaz, kaç saniye sonra denenebileceği
+    bildirilir. Tüm çağrılar olay döngüsünden yapılır; kilit gerekmez.
+    """
+
+    def __init__(self, limits=None, max_clients=1024, clock=time.monotonic):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_clients = max_clients
+        self._clock = clock
+        self._buckets = {}
+        self._inflight = {lane: 0 for lane in self.limits}
+        self.admitted = {lane: 0 for lane in self.limits}
+        self.rejected = {(lane, reason): 0 for lane in self.limits for reason in ("rate", "busy")}
+
+    def admit(self, client, lane):
+        """Kabul edilirse None, reddedilirse (sebep, tekrar deneme süresi)."""
+        limit = self.limits[lane]
+        if limit.max_inflight is not None and self._inflight[lane] >= limit.max_inflight:
+            self.rejected[(lane, "busy")] += 1
+            return "busy", 1.0 / limit.rate if limit.rate else 1.0
+        if limit.rate is not None:
+            now = self._clock()
+            key = (client, lane)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._prune(now)
+                bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst, now)
+            wait = bucket.take(now)
+            if wait:
+                self.rejected[(lane, "rate")] += 1
+                return "rate", wait
+        self._inflight[lane] += 1
+        self.admitted[lane] += 1
+        return None
+
+    def release(self, lane):
+        self._inflight[lane] -= 1
+
+    def _prune(self, now):
+        # Dolmuş kovalar yeni oluşturulanla aynı durumdadır; silinmeleri
+        # istemciye bir şey kaybettirmez.
+        for key, bucket in list(self._buckets.items()):
+            if bucket.tokens + (now - bucket.updated) * bucket.rate >= bucket.capacity:
+                del self._buckets[key]
+
+    def stats(self):
+        return {
+            "clients": len(self._buckets),
+            "inflight": dict(self._inflight),
+            "admitted": dict(self.admitted),
+            "rejected": {f"{lane}.{reason}": n for (lane, reason), n in self.rejected.items()},
+        }
+
+
+def retry_after_header(seconds):
+    # Retry-After tam saniye ister; alt sınır 1 s.
+    return str(max(1, math.ceil(seconds)))
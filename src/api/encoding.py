@@ -0,0 +1,197 @@
+"""
+Telemetri için içerik anlaşması ve kodlayıcılar.
+
+Desteklenen biçimler:
+  application/json                 - düz JSON (orjson kuruluysa onunla)
+  application/msgpack              - MessagePack (msgpack kuruluysa)
+  application/vnd.uav.telemetry    - sabit düzenli ikili kayıt, bkz. BINARY_LAYOUT
+
+Kodlanmış baytlar snapshot başına bir kez üretilir; aynı sürümün tekrar
+okunması yalnızca önbellekten bayt döndürür.
+"""
+import json
+import math
+import struct
+
+try:
+    import orjson
+except ImportError:  # İsteğe bağlı; yoksa standart json kullanılır.
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # İsteğe bağlı; yoksa MessagePack sunulmaz.
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+BINARY = "application/vnd.uav.telemetry"
+
+FORMATS = {"json": JSON, "msgpack": MSGPACK, "binary": BINARY}
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+BINARY_MAGIC = b"UT"
+BINARY_VERSION = 1
+# (alan, struct kodu, açıklama). Tüm sayılar little-endian; eksik değerler
+# NaN, eksik gruplar "flags" bitleriyle bildirilir.
+BINARY_LAYOUT = (
+    ("magic", "2s", 'Sabit "UT"'),
+    ("format_version", "B", "Düzen sürümü (1)"),
+    ("flags", "B", "bit0: gps, bit1: battery, bit2: attitude mevcut"),
+    ("version", "I", "Snapshot sürümü"),
+    ("gps.lat", "d", "Enlem, derece"),
+    ("gps.lon", "d", "Boylam, derece"),
+    ("gps.alt", "f", "Göreli irtifa, m"),
+    ("battery.voltage", "f", "V"),
+    ("battery.current", "f", "A"),
+    ("battery.level", "f", "%"),
+    ("attitude.roll", "f", "rad"),
+    ("attitude.pitch", "f", "rad"),
+    ("attitude.yaw", "f", "rad"),
+    ("timestamps.gps", "d", "Son GPS güncellemesi, epoch s"),
+    ("timestamps.battery", "d", "Son batarya güncellemesi, epoch s"),
+    ("timestamps.attitude", "d", "Son attitude güncellemesi, epoch s"),
+)
+BINARY_STRUCT = struct.Struct("<" + "".join(code for _, code, _ in BINARY_LAYOUT))
+_GROUPS = ("gps", "battery", "attitude")
+_NAN = float("nan")
+
+
+def available_formats():
+    formats = [JSON, BINARY]
+    if msgpack is not None:
+        formats.insert(1, MSGPACK)
+    return formats
+
+
+def binary_spec():
+    """İkili düzenin yayımlanan tanımı; alan konumları struct'tan hesaplanır."""
+    fields = []
+    offset = 0
+    for name, code, description in BINARY_LAYOUT:
+        size = struct.calcsize("<" + code)
+        fields.append(
+            {
+                "name": name,
+                "type": code,
+                "offset": offset,
+                "size": size,
+                "description": description,
+            }
+        )
+        offset += size
+    return {
+        "media_type": BINARY,
+        "byte_order": "little",
+        "magic": BINARY_MAGIC.decode(),
+        "format_version": BINARY_VERSION,
+        "size": BINARY_STRUCT.size,
+        "struct": BINARY_STRUCT.format,
+        "missing_value": "NaN",
+        "fields": fields,
+    }
+
+
+def negotiate(accept=None, format_name=None, allowed=None):
+    """
+    ?format= varsa onu, yoksa Accept başlığındaki en yüksek q değerli
+    desteklenen biçimi seçer. Uygun biçim yoksa None (406).
+    """
+    supported = available_formats()
+    allowed = [media for media in (allowed or supported) if media in supported]
+    if format_name is not None:
+        media = FORMATS.get(format_name)
+        return media if media in allowed else None
+    if not accept:
+        return JSON
+    choices = []
+    for i, part in enumerate(accept.split(",")):
+        media, *params = [p.strip() for p in part.split(";")]
+        media = _ALIASES.get(media, media)
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            choices.append((-q, i, media))
+    for _, _, media in sorted(choices):
+        if media in ("*/*", "application/*"):
+            return JSON
+        if media in allowed:
+            return media
+    return None
+
+
+def dumps_json(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def encode(value, media):
+    """JSON uyumlu değeri seçilen biçimde kodlar (ikili düzen hariç)."""
+    if media == MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    return dumps_json(value)
+
+
+def _number(value):
+    return _NAN if value is None else value
+
+
+def pack_snapshot(snapshot):
+    flags = 0
+    values = []
+    for bit, group in enumerate(_GROUPS):
+        fields = getattr(snapshot, group)
+        if fields is None:
+            values.extend((_NAN, _NAN, _NAN))
+        else:
+            flags |= 1 << bit
+            values.extend(_number(v) for v in fields)
+    values.extend(_number(v) for v in snapshot.timestamps)
+    return BINARY_STRUCT.pack(BINARY_MAGIC, BINARY_VERSION, flags, snapshot.version, *values)
+
+
+def unpack_snapshot(data):
+    """pack_snapshot'ın tersi; düz alan sözlüğü döner (istemciler için örnek)."""
+    values = BINARY_STRUCT.unpack(data)
+    if values[0] != BINARY_MAGIC:
+        raise ValueError("Geçersiz telemetri kaydı")
+    out = {}
+    for (name, _, _), value in zip(BINARY_LAYOUT[3:], values[3:]):
+        out[name] = None if isinstance(value, float) and math.isnan(value) else value
+    for bit, group in enumerate(_GROUPS):
+        if not values[2] & (1 << bit):
+            for name in list(out):
+                if name.startswith(group + "."):
+                    out[name] = None
+    return out
+
+
+class SnapshotEncoder:
+    """
+    Araç başına son snapshot'ın kodlanmış hallerini tutar. Önbellek snapshot
+    nesnesine bağlıdır; yeni sürüm gelince eski kodlamalar bırakılır.
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def encode(self, controller, media):
+        snapshot = controller.telemetry.snapshot()
+        cached = self._cache.get(controller)
+        if cached is None or cached[0] is not snapshot:
+            cached = (snapshot, {})
+            self._cache[controller] = cached
+        encoded = cached[1].get(media)
+        if encoded is None:
+            if media == BINARY:
+                encoded = pack_snapshot(snapshot)
+            else:
+                encoded = encode(snapshot.to_dict(), media)
+            cached[1][media] = encoded
+        return snapshot, encoded
@@ -1,6 +1,38 @@
-from fastapi import FastAPI, Query, Response, UploadFile, File
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+)
+from starlette.requests import HTTPConnection
 from fastapi.middleware.cors import CORSMiddleware
-import queue
+import asyncio
+import contextlib
+import threading
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .frames import (
+    FrameBuffer,
+    choose_rendition,
+    frame_etag,
+    frame_headers,
+    mjpeg_stream,
+    unpack_frames,
+)
+from .encoding import BINARY, JSON, MSGPACK, binary_spec, encode, negotiate
+from .jobs import JobManager
+from . import metrics
+from .remote import resolved
+from .admission import COMMAND, MOTION, SAFETY, AdmissionControl, retry_after_header
+from .telemetry_stream import TelemetryStreams
 
 # Bu app nesnesi ana dosyada (main.py) oluşturulacak ve buraya enjekte edilecek.
 app = FastAPI()
@@ -14,25 +46,157 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Rota başına istek gecikmeleri; /metrics ile Prometheus biçiminde sunulur.
+route_latency = metrics.RouteLatency()
+app.add_middleware(metrics.MetricsMiddleware, routes=route_latency)
+
 # Bu global değişkenler main.py'de ayarlanacak
 global_controller = None
-frame_queue = queue.Queue(maxsize=50)
-counter_value = 0
+global_fleet = None
+# API olay döngüsünün varsayılan executor'ı (kare ölçekleme vb.); main.py ve
+# worker'lar sayaçlı bir executor verir, /metrics ondan okur.
+api_executor = None
+# Kareler tüm izleyicilerle paylaşılan halkada tutulur; okumak kareyi tüketmez.
+frame_buffer = FrameBuffer(capacity=50)
+MJPEG_BOUNDARY = "frame"
+telemetry_streams = TelemetryStreams()
+jobs = JobManager()
+admission_control = AdmissionControl()
 
-def setup_api_endpoints(controller):
-    global global_controller
-    global_controller = controller
 
-    @app.get("/connect")
-    async def api_connect():
-        return {"status": "Gerçek drone connected"}
+class Counter:
+    """Süreç içi sayaç; çok worker'lı çalışmada paylaşılan sayaçla değiştirilir."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def value(self):
+        return self._value
+
+    def increment(self):
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+counter = Counter()
+
+
+def share_state(frame_store=None, counter_store=None, job_manager=None):
+    """
+    uvicorn --workers ile çalışırken worker'lar arasında ortak olması
+    gereken durumu bağlar: kare halkası, sayaç ve iş kaydı. Verilmeyenler
+    süreç içi kalır. setup_api_endpoints'ten önce ya da sonra çağrılabilir.
+    """
+    global counter, jobs
+    if frame_store is not None:
+        frame_buffer.share(frame_store)
+    if counter_store is not None:
+        counter = counter_store
+    if job_manager is not None:
+        jobs = job_manager
+
+
+def get_controller(request: HTTPConnection):
+    """
+    /vehicles/{vehicle_id}/... altındaki isteklerde ilgili aracı, kök
+    yollarda ise varsayılan aracı döndürür.
+    """
+    vehicle_id = request.path_params.get("vehicle_id")
+    if vehicle_id is None:
+        return global_controller
+    controller = global_fleet.get(vehicle_id) if global_fleet is not None else None
+    if controller is None:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen araç: {vehicle_id}")
+    return controller
+
+
+class MissionWaypoint(BaseModel):
+    lat: float
+    lon: float
+    alt: float
+
+
+class MissionRequest(BaseModel):
+    waypoints: List[MissionWaypoint]
+    takeoff_alt: Optional[float] = None
+    finish: Optional[str] = None
+
+
+def admit(lane):
+    """
+    Komut rotalarının kabul bağımlılığı. İstemci başına jeton kovası ve
+    şerit başına eşzamanlılık sınırı aşılırsa istek beklemeden 429 alır.
+    Güvenlik şeridi (durdurma, iniş) sayılır ama reddedilmez.
+    """
+
+    async def dependency(request: Request):
+        client = request.client.host if request.client is not None else "unknown"
+        control = admission_control
+        rejected = control.admit(client, lane)
+        if rejected is not None:
+            reason, retry_after = rejected
+            raise HTTPException(
+                status_code=429,
+                detail=f"İstek sınırı aşıldı ({lane}: {reason})",
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+        try:
+            yield
+        finally:
+            control.release(lane)
+
+    return dependency
+
+
+async def run_command(controller, name, *args, **kwargs):
+    # Komutlar aracın kuyruğundan geçer; sık gelen hareket istekleri
+    # birikmek yerine en sonuncusuyla değiştirilir.
+    return await asyncio.wrap_future(controller.submit(name, *args, **kwargs))
+
+
+async def run_job(controller, name, *args, wait=False):
+    """
+    Uzun süren komutu iş olarak başlatır. wait=False ise 202 ve iş kaydı
+    hemen döner; wait=True ise iş bitene kadar beklenir ve None döner.
+    """
+    job = await resolved(jobs.submit(controller, name, *args))
+    if wait:
+        await jobs.wait(job)
+        return None
+    return JSONResponse(
+        status_code=202, content=job.to_dict(), headers={"Location": f"/jobs/{job.id}"}
+    )
+
 
-    @app.get("/arm_takeoff")
-    async def api_arm_takeoff(altitude: int = 10):
-        await global_controller.arm_and_takeoff(altitude)
-        return {"status": f"Drone {altitude} metreye çıktı"}
+def build_vehicle_router():
+    # Bu router hem kök dizine hem de /vehicles/{vehicle_id} altına eklenir;
+    # böylece her araç komutu araç bazlı bir karşılığa sahip olur.
+    router = APIRouter()
 
-    @app.get("/move")
+    @router.get("/connect", dependencies=[Depends(admit(COMMAND))])
+    async def api_connect(controller=Depends(get_controller)):
+        await resolved(controller.start())
+        return {
+            "status": "Gerçek drone bağlantısı başlatıldı",
+            "link": await resolved(controller.link.status()),
+        }
+
+    @router.get("/link")
+    async def api_link(controller=Depends(get_controller)):
+        return await resolved(controller.link.status())
+
+    # Aracı kaldıran istek GET olamaz (bkz. /mission/start).
+    @router.post("/arm_takeoff", dependencies=[Depends(admit(COMMAND))])
+    async def api_arm_takeoff(
+        altitude: int = 10, wait: bool = False, controller=Depends(get_controller)
+    ):
+        # Varsayılan olarak iş kimliği hemen döner; ilerleme /jobs/{id} ile izlenir.
+        accepted = await run_job(controller, "arm_and_takeoff", altitude, wait=wait)
+        return accepted or {"status": f"Drone {altitude} metreye çıktı"}
+
+    @router.get("/move", dependencies=[Depends(admit(MOTION))])
     async def api_move(
         direction: str = Query(
             ...,
@@ -42,89 +206,382 @@ def setup_api_endpoints(controller):
         # Bu kısım orijinal kodda dummy olarak bırakılmış, aynı şekilde bırakıyorum.
         return {"status": f"Drone {direction} hareket etti (dummy)"}
 
-    @app.get("/move3d")
+    @router.get("/move3d", dependencies=[Depends(admit(MOTION))])
     async def api_move3d(
-        velocity_x: float, velocity_y: float, velocity_z: float, duration: float = 1
+        velocity_x: float,
+        velocity_y: float,
+        velocity_z: float,
+        duration: float = 1,
+        controller=Depends(get_controller),
     ):
-        await global_controller.move_3d(velocity_x, velocity_y, velocity_z, duration)
+        await run_command(controller, "move_3d", velocity_x, velocity_y, velocity_z, duration)
         return {"status": "Drone 3 boyutlu hareket gerçekleştirdi"}
 
-    @app.get("/turn")
-    async def api_turn(angle: float):
-        await global_controller.turn_by_angle(angle)
-        return {"status": f"Drone {angle} derece döndü"}
+    @router.get("/turn", dependencies=[Depends(admit(MOTION))])
+    async def api_turn(angle: float, wait: bool = False, controller=Depends(get_controller)):
+        accepted = await run_job(controller, "turn_by_angle", angle, wait=wait)
+        return accepted or {"status": f"Drone {angle} derece döndü"}
 
-    @app.get("/move_distance")
-    async def api_move_distance(distance: float):
-        await global_controller.move_distance(distance)
-        return {"status": f"Drone {distance} metre ilerledi"}
+    @router.get("/move_distance", dependencies=[Depends(admit(MOTION))])
+    async def api_move_distance(
+        distance: float, wait: bool = False, controller=Depends(get_controller)
+    ):
+        accepted = await run_job(controller, "move_distance", distance, wait=wait)
+        return accepted or {"status": f"Drone {distance} metre ilerledi"}
 
-    @app.get("/stop")
-    async def api_stop():
-        await global_controller.stop()
+    @router.get("/stop", dependencies=[Depends(admit(SAFETY))])
+    async def api_stop(controller=Depends(get_controller)):
+        await run_command(controller, "stop")
         return {"status": "Drone durdu"}
 
-    @app.get("/land")
-    async def api_land():
-        await global_controller.land()
-        return {"status": "Drone indi"}
+    @router.get("/land", dependencies=[Depends(admit(SAFETY))])
+    async def api_land(wait: bool = False, controller=Depends(get_controller)):
+        accepted = await run_job(controller, "land", wait=wait)
+        return accepted or {"status": "Drone indi"}
 
-    @app.get("/disconnect")
-    async def api_disconnect():
-        await global_controller.disconnect()
+    @router.get("/disconnect", dependencies=[Depends(admit(SAFETY))])
+    async def api_disconnect(controller=Depends(get_controller)):
+        await run_command(controller, "disconnect")
         return {"status": "Drone disconnected"}
 
-    @app.get("/telemetry")
-    async def api_telemetry():
+    @router.get("/telemetry")
+    async def api_telemetry(
+        request: Request, format: str = None, controller=Depends(get_controller)
+    ):
+        # Biçim ?format= ya da Accept ile seçilir; kodlanmış baytlar snapshot
+        # sürümü başına bir kez üretilir.
+        media = _negotiate(request, format)
+        snapshot, body = telemetry_streams.encoder.encode(controller, media)
+        return Response(
+            content=body,
+            media_type=media,
+            headers={"Vary": "Accept", "X-Telemetry-Version": str(snapshot.version)},
+        )
+
+    @router.websocket("/ws/telemetry")
+    async def ws_telemetry(
+        websocket: WebSocket,
+        fields: str = None,
+        rate: float = 10.0,
+        format: str = "json",
+        controller=Depends(get_controller),
+    ):
+        # ?fields=gps,battery.level&rate=5 ; abonelik bağlantı sırasında da
+        # {"fields": [...], "rate": hz} mesajıyla değiştirilebilir.
+        media = negotiate(format_name=format)
+        if media is None:
+            await websocket.close(code=1003, reason=f"Desteklenmeyen biçim: {format}")
+            return
+        await telemetry_streams.serve(
+            websocket, controller, fields=fields, rate=rate, media=media
+        )
+
+    @router.get("/telemetry/history")
+    async def api_telemetry_history(
+        request: Request,
+        since: float = None,
+        fields: str = None,
+        max_points: int = Query(500, ge=1, le=10000),
+        format: str = None,
+        controller=Depends(get_controller),
+    ):
+        media = _negotiate(request, format, allowed=(JSON, MSGPACK))
         try:
-            loc = global_controller.vehicle.location.global_frame
-            alt = global_controller.vehicle.location.global_relative_frame.alt
-            gps = {"lat": loc.lat, "lon": loc.lon, "alt": alt}
-        except Exception:
-            gps = {}
+            history = await resolved(
+                controller.history.query(
+                    since=since,
+                    fields=fields.split(",") if fields else None,
+                    max_points=max_points,
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Response(
+            content=encode(history, media), media_type=media, headers={"Vary": "Accept"}
+        )
+
+    @router.post("/mission", dependencies=[Depends(admit(COMMAND))])
+    async def api_upload_mission(mission: MissionRequest, controller=Depends(get_controller)):
+        waypoints = [(w.lat, w.lon, w.alt) for w in mission.waypoints]
         try:
-            bat = global_controller.vehicle.battery
-            battery = {"voltage": bat.voltage, "current": bat.current, "level": bat.level}
-        except Exception:
-            battery = {}
+            uploaded = await run_command(
+                controller, "upload_mission", waypoints,
+                takeoff_alt=mission.takeoff_alt, finish=mission.finish,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not uploaded:
+            raise HTTPException(status_code=409, detail="Görev yüklenemedi")
+        return await resolved(controller.mission.status())
+
+    @router.get("/mission")
+    async def api_mission_status(controller=Depends(get_controller)):
+        return await resolved(controller.mission.status())
+
+    @router.post("/mission/start", dependencies=[Depends(admit(COMMAND))])
+    async def api_start_mission(wait: bool = False, controller=Depends(get_controller)):
+        # Aracı kaldırıp uçurduğu için GET değildir; önbellek, tarayıcı ön
+        # yüklemesi ya da tekrar denemesi görevi başlatamaz. Varsayılan olarak
+        # görev başlatılınca dönülür; ilerleme /mission ile izlenir.
+        # Kuyruktan geçer: sıradaki komutlarla aynı anda çalışmaz, durdurma ve
+        # iniş çalışan görevi keser.
+        started = await run_command(controller, "start_mission", wait=wait)
+        return {"started": started, "mission": await resolved(controller.mission.status())}
+
+    @router.post("/geofence", dependencies=[Depends(admit(COMMAND))])
+    async def api_load_geofence(
+        geojson: Dict[str, Any],
+        cell_size: float = Query(100.0, gt=0),
+        controller=Depends(get_controller),
+    ):
         try:
-            att = global_controller.vehicle.attitude
-            attitude = {"roll": att.roll, "pitch": att.pitch, "yaw": att.yaw}
-        except Exception:
-            attitude = {}
-        return {"gps": gps, "battery": battery, "attitude": attitude}
+            return await resolved(controller.load_geofence(geojson, cell_size=cell_size))
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            raise HTTPException(status_code=400, detail=f"Geçersiz geofence: {e}")
+
+    @router.get("/geofence")
+    async def api_geofence_status(controller=Depends(get_controller)):
+        return await resolved(controller.geofence_status())
+
+    @router.delete("/geofence", dependencies=[Depends(admit(COMMAND))])
+    async def api_clear_geofence(controller=Depends(get_controller)):
+        await resolved(controller.clear_geofence())
+        return {"status": "Geofence kaldırıldı"}
+
+    @router.get("/commands")
+    async def api_command_stats(controller=Depends(get_controller)):
+        return await resolved(controller.commands.stats())
+
+    @router.get("/setpoint_stats")
+    async def api_setpoint_stats(controller=Depends(get_controller)):
+        return await resolved(controller.setpoints.stats())
+
+    return router
+
+
+def _negotiate(request, format_name=None, allowed=None):
+    media = negotiate(request.headers.get("accept"), format_name, allowed)
+    if media is None:
+        raise HTTPException(status_code=406, detail="Desteklenmeyen biçim")
+    return media
+
+
+async def _job_or_404(job_id):
+    job = await resolved(jobs.get(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen iş: {job_id}")
+    return job
+
+
+@contextlib.asynccontextmanager
+async def _install_executor(app):
+    if api_executor is not None:
+        asyncio.get_running_loop().set_default_executor(api_executor)
+    yield
+
+
+def setup_api_endpoints(controller, fleet=None, executor=None):
+    global global_controller, global_fleet, api_executor
+    global_controller = controller
+    global_fleet = fleet
+    api_executor = executor
+    if executor is not None:
+        # Döngü uvicorn'un; executor açılışta o döngüye kurulur.
+        app.include_router(APIRouter(lifespan=_install_executor))
+
+    router = build_vehicle_router()
+    app.include_router(router)
+    app.include_router(router, prefix="/vehicles/{vehicle_id}")
+
+    @app.get("/vehicles")
+    async def api_vehicles():
+        if global_fleet is None:
+            return {}
+        return await resolved(global_fleet.status())
+
+    @app.get("/telemetry/streams")
+    async def api_telemetry_streams():
+        return telemetry_streams.stats()
+
+    @app.get("/metrics")
+    async def api_metrics():
+        if global_fleet is not None:
+            controllers = global_fleet.items()
+        elif global_controller is not None:
+            vehicle_id = getattr(global_controller, "vehicle_id", None) or "default"
+            controllers = [(vehicle_id, global_controller)]
+        else:
+            controllers = []
+        stats = await metrics.gather_stats(controllers)
+        return Response(
+            content=metrics.collect(
+                controllers, route_latency, frame_buffer, admission=admission_control,
+                stats=stats, executor=api_executor,
+            ),
+            media_type=metrics.CONTENT_TYPE,
+        )
+
+    @app.get("/admission")
+    async def api_admission():
+        return admission_control.stats()
+
+    @app.get("/telemetry/schema")
+    async def api_telemetry_schema():
+        # application/vnd.uav.telemetry kaydının yayımlanan düzeni.
+        return binary_spec()
+
+    @app.get("/jobs")
+    async def api_jobs(status: str = None):
+        return await resolved(jobs.list(status))
+
+    @app.get("/jobs/{job_id}")
+    async def api_job(job_id: str):
+        return (await _job_or_404(job_id)).to_dict()
+
+    @app.get("/jobs/{job_id}/events")
+    async def api_job_events(job_id: str):
+        # Server-sent events: ilerleme değiştikçe "progress", sonda "done".
+        return StreamingResponse(
+            jobs.events(await _job_or_404(job_id)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    @app.delete("/jobs/{job_id}")
+    async def api_cancel_job(job_id: str):
+        job = await _job_or_404(job_id)
+        if not await resolved(jobs.cancel(job)):
+            raise HTTPException(status_code=409, detail="İş iptal edilemez")
+        return job.to_dict()
+
+    @app.get("/vehicles/telemetry")
+    async def api_fleet_telemetry():
+        if global_fleet is None:
+            return {}
+        return global_fleet.telemetry()
 
     @app.post("/upload_frame")
     async def upload_frame(file: UploadFile = File(...)):
         try:
             contents = await file.read()
-            if frame_queue.full():
-                frame_queue.get()
-            frame_queue.put(contents)
-            return {"status": "Frame alındı"}
+            seq = frame_buffer.publish(contents)
+            return {"status": "Frame alındı", "seq": seq}
         except Exception as e:
             return {"error": str(e)}
 
-    @app.get("/camera_feed")
-    async def api_camera_feed():
+    @app.post("/ingest/frame")
+    async def ingest_frame(request: Request):
+        # Ham image/jpeg gövdesi; form ayrıştırma yapılmaz. Çekim zamanı ve
+        # kaynak sıra numarası X-Capture-Time / X-Source-Seq başlıklarıyla gelir.
+        if request.headers.get("content-type", "").split(";")[0].strip() != "image/jpeg":
+            raise HTTPException(status_code=415, detail="image/jpeg bekleniyor")
+        try:
+            captured_at = request.headers.get("x-capture-time")
+            source_seq = request.headers.get("x-source-seq")
+            captured_at = float(captured_at) if captured_at is not None else None
+            source_seq = int(source_seq) if source_seq is not None else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Geçersiz kare başlığı")
+        body = await request.body()
+        if not body:
+            raise HTTPException(status_code=400, detail="Boş kare")
+        try:
+            seq = frame_buffer.publish(body, captured_at, source_seq)
+        except ValueError as e:
+            # Paylaşılan halkanın yuva boyutunu aşan kare.
+            raise HTTPException(status_code=413, detail=str(e))
+        return {"seq": seq}
+
+    @app.post("/ingest/batch")
+    async def ingest_batch(request: Request):
+        # Tek istekte birden çok kare: her biri INGEST_RECORD başlığıyla.
         try:
-            if not frame_queue.empty():
-                frame_data = frame_queue.get()
-                return Response(content=frame_data, media_type="image/jpeg")
-            else:
+            frames = unpack_frames(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            seqs = [frame_buffer.publish(*frame) for frame in frames]
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return {"frames": len(seqs), "seqs": seqs}
+
+    @app.websocket("/ingest/ws")
+    async def ingest_ws(websocket: WebSocket):
+        # Kalıcı alım kanalı: her ikili mesaj bir ya da daha fazla kayıt
+        # taşır. Kare başına yanıt gönderilmez; durum /camera_stats'tan izlenir.
+        await websocket.accept()
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            payload = message.get("bytes")
+            if payload is None:
+                await websocket.close(code=1003, reason="İkili mesaj bekleniyor")
+                return
+            try:
+                frames = unpack_frames(payload)
+            except ValueError as e:
+                await websocket.close(code=1007, reason=str(e))
+                return
+            try:
+                for frame in frames:
+                    frame_buffer.publish(*frame)
+            except ValueError as e:
+                await websocket.close(code=1009, reason=str(e))
+                return
+
+    @app.get("/camera_feed")
+    async def api_camera_feed(
+        request: Request,
+        after: int = None,
+        timeout: float = Query(10.0, ge=0, le=60),
+        w: int = Query(None, gt=0),
+        h: int = Query(None, gt=0),
+    ):
+        # after verilmezse son kare hemen döner; verilirse daha yeni bir kare
+        # gelene kadar beklenir (long-poll), zaman aşımında 204. w/h verilirse
+        # bu boyutu kaplayan en küçük sunucu kopyası gönderilir.
+        if after is None:
+            frame = frame_buffer.latest()
+            if frame is None:
                 return Response(status_code=503)
-        except Exception as e:
-            return Response(status_code=500)
+        else:
+            frame = await frame_buffer.wait_after(after, timeout=timeout)
+            if frame is None:
+                return Response(status_code=204)
+        name = choose_rendition(w, h)
+        etag = frame_etag(frame, name)
+        if request.headers.get("if-none-match") == etag:
+            # İstemcide zaten olan kare; yeni kare yok.
+            return Response(status_code=304, headers={"ETag": etag})
+        data = await frame_buffer.rendition(frame, name)
+        return Response(
+            content=data, media_type="image/jpeg", headers=frame_headers(frame, name)
+        )
+
+    @app.get("/camera_stream")
+    async def api_camera_stream(
+        fps: float = Query(None, gt=0, le=60),
+        w: int = Query(None, gt=0),
+        h: int = Query(None, gt=0),
+    ):
+        return StreamingResponse(
+            mjpeg_stream(
+                frame_buffer, MJPEG_BOUNDARY, max_fps=fps, rendition=choose_rendition(w, h)
+            ),
+            media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+        )
+
+    @app.get("/camera_stats")
+    async def api_camera_stats():
+        return frame_buffer.stats()
 
     @app.get("/counter")
     def get_counter():
-        global counter_value
-        return {"counter": counter_value}
+        return {"counter": counter.value()}
 
     @app.post("/counter/increment")
     def increment_counter():
-        global counter_value
-        counter_value += 1
-        return {"counter": counter_value}
+        return {"counter": counter.increment()}
 
     return app
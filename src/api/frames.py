@@ -0,0 +1,419 @@
+import asyncio
+import concurrent.futures
+import io
+import struct
+import threading
+import time
+from collections import namedtuple
+
+# captured_at: kameranın çekim zamanı (epoch s), source_seq: kameranın kendi
+# sıra numarası; ikisi de üretici göndermediyse None'dır.
+Frame = namedtuple(
+    "Frame", ["seq", "data", "timestamp", "captured_at", "source_seq"],
+    defaults=(None, None),
+)
+
+# Toplu ve WebSocket alımında her kare bu başlıkla gelir:
+# uzunluk (uint32), çekim zamanı (float64), kaynak sıra numarası (uint32).
+# Ağ bayt sırası kullanılır.
+INGEST_RECORD = struct.Struct("!IdI")
+
+# Sunucuda üretilen ölçekli kopyalar, küçükten büyüğe. Boyutlar sığdırılacak
+# kutudur; en-boy oranı korunur. "original" yüklenen baytların kendisidir.
+RENDITIONS = (("thumb", (160, 120)), ("vga", (640, 480)), ("original", None))
+_RENDITION_BOXES = dict(RENDITIONS)
+RENDITION_QUALITY = 80
+
+
+def choose_rendition(width=None, height=None):
+    """İstenen boyutu kaplayan en küçük kopyanın adı."""
+    if not width and not height:
+        return "original"
+    for name, box in RENDITIONS:
+        if box is not None and (width or 0) <= box[0] and (height or 0) <= box[1]:
+            return name
+    return "original"
+
+
+def render(data, box, quality=RENDITION_QUALITY):
+    """
+    JPEG'i box'a sığacak şekilde küçültür. Taslak (draft) kipinde çözücü
+    DCT ölçeklemesiyle doğrudan küçük boyutta açar; tam çözünürlük hiç
+    çözülmez.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", box)
+    image = image.convert("RGB")
+    image.thumbnail(box, Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+class RateMeter:
+    """
+    Olay hızının üstel ortalaması (olay/s). tick() yalnızca birkaç aritmetik
+    işlem yapar; uzun süre olay gelmezse hız sıfır okunur.
+    """
+
+    __slots__ = ("rate", "_last", "_alpha", "_idle")
+
+    def __init__(self, alpha=0.1, idle=2.0):
+        self.rate = 0.0
+        self._last = None
+        self._alpha = alpha
+        self._idle = idle
+
+    def tick(self, now):
+        last, self._last = self._last, now
+        if last is not None and now > last:
+            self.rate += self._alpha * (1.0 / (now - last) - self.rate)
+
+    def value(self, now):
+        if self._last is None or now - self._last > self._idle:
+            return 0.0
+        return self.rate
+
+
+class FrameBuffer:
+    """
+    Tek üreticili, çok tüketicili kare halkası. Her kare artan bir sıra
+    numarası alır; tüketiciler kareleri kuyruktan almaz, yalnızca kendi
+    imleçlerini (son gördükleri sıra numarası) tutar. İzleyici eklemek kare
+    kaybettirmez ve izleyici başına bellek kullanmaz; baytlar kopyalanmadan
+    tüm izleyicilere aynı nesne olarak verilir.
+    """
+
+    def __init__(self, capacity=50, clock=time.time, poll_interval=0.01):
+        self.capacity = capacity
+        self._clock = clock
+        self._slots = [None] * capacity
+        self._lock = threading.Lock()
+        self._latest = None
+        self._waiters = []
+        self.published = 0
+        self.source_gaps = 0
+        self._source_seq = None
+        self._renditions = {}
+        self.renders = 0
+        self.served = 0
+        self._ingest_rate = RateMeter()
+        self._serve_rate = RateMeter()
+        self._store = None
+        self._synced = 0
+        self._poller = None
+        self.poll_interval = poll_interval
+        self._subscribers = ()
+
+    def share(self, store):
+        """
+        Çok worker'lı çalışmada kareler tüm worker'ların ortak halkasına
+        (store) yazılır ve sıra numaraları oradan alınır. Diğer worker'ların
+        yazdığı kareler okuma sırasında bu tampona alınır; bekleyen izleyici
+        varsa halka poll_interval aralıkla yoklanır. store arayüzü:
+        write(data, timestamp, captured_at, source_seq) -> seq, read(seq) ve
+        latest_seq().
+        """
+        self._store = store
+
+    def subscribe(self, callback):
+        """
+        Süreç içi abone: callback(frame) her yeni en son karede, kareyi
+        yayımlayan thread'den çağrılır; kısa sürmeli ve bloklamamalıdır.
+        Kare baytları kopyalanmaz, tüm abonelere aynı değişmez nesne verilir.
+        """
+        self._subscribers = self._subscribers + (callback,)
+
+    def unsubscribe(self, callback):
+        self._subscribers = tuple(c for c in self._subscribers if c != callback)
+
+    def publish(self, data, captured_at=None, source_seq=None):
+        """Kareyi ekler ve sıra numarasını döndürür; herhangi bir thread'den çağrılabilir."""
+        store = self._store
+        if store is not None:
+            now = self._clock()
+            seq = store.write(data, now, captured_at, source_seq)
+            self._insert(Frame(seq, data, now, captured_at, source_seq))
+            return seq
+        with self._lock:
+            seq = self.published + 1
+            frame = Frame(seq, data, self._clock(), captured_at, source_seq)
+            waiters = self._add(frame)
+        self._notify(frame, waiters)
+        return seq
+
+    def _insert(self, frame):
+        with self._lock:
+            waiters = self._add(frame)
+        if waiters is not None:
+            self._notify(frame, waiters)
+
+    def _notify(self, frame, waiters):
+        self._wake(waiters)
+        for callback in self._subscribers:
+            try:
+                callback(frame)
+            except Exception as e:
+                print(f"Kare abonesi hatası: {e}")
+
+    def _add(self, frame):
+        # Kilit altında çağrılır; kare en son kare olduysa uyandırılacak
+        # bekleyenleri, olmadıysa None döndürür.
+        index = frame.seq % self.capacity
+        stored = self._slots[index]
+        if stored is not None and stored.seq >= frame.seq:
+            return None
+        self._slots[index] = frame
+        self._ingest_rate.tick(frame.timestamp)
+        if frame.seq <= self.published:
+            # Başka worker'dan geç gelen eski kare; en son kare değişmez.
+            return None
+        self._latest = frame
+        self.published = frame.seq
+        source_seq = frame.source_seq
+        if source_seq is not None:
+            # Kaynak numarasındaki atlamalar yolda kaybolan karelerdir.
+            if self._source_seq is not None and source_seq > self._source_seq + 1:
+                self.source_gaps += source_seq - self._source_seq - 1
+            self._source_seq = source_seq
+        waiters, self._waiters = self._waiters, []
+        return waiters
+
+    def _sync(self):
+        # Ortak halkadaki yeni kareleri alır; değişiklik yoksa tek bir 8 baytlık okuma.
+        store = self._store
+        if store is None:
+            return
+        latest = store.latest_seq()
+        if latest <= self._synced:
+            return
+        for seq in range(max(self._synced + 1, latest - self.capacity + 1), latest + 1):
+            if self._stored(seq) is None:
+                record = store.read(seq)
+                if record is not None:
+                    self._insert(Frame(*record))
+        self._synced = latest
+
+    def latest(self):
+        self._sync()
+        return self._latest
+
+    def get(self, seq):
+        """Halkada hâlâ duruyorsa seq numaralı kare, yoksa None."""
+        self._sync()
+        return self._stored(seq)
+
+    def _stored(self, seq):
+        frame = self._slots[seq % self.capacity]
+        return frame if frame is not None and frame.seq == seq else None
+
+    def after(self, seq):
+        """
+        seq'ten yeni en son kare; yoksa None. Geride kalan izleyiciler ara
+        kareleri beklemek yerine doğrudan en yeniye atlar.
+        """
+        self._sync()
+        return self._newer(seq)
+
+    def _newer(self, seq):
+        # Yalnızca halkaya bakar; kilit altında da çağrılabilir.
+        frame = self._latest
+        if frame is None or (seq is not None and frame.seq <= seq):
+            return None
+        return frame
+
+    async def wait_after(self, seq, timeout=None):
+        """seq'ten yeni bir kare gelene kadar bekler; zaman aşımında None döner."""
+        frame = self.after(seq)
+        if frame is not None:
+            return frame
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Ortak halka kilit dışında okunur: _sync() kareyi eklerken aynı
+        # kilidi alır. Bu aradaki kareyi ekleyen thread bekleyeni uyandırır.
+        self._sync()
+        with self._lock:
+            frame = self._newer(seq)
+            if frame is not None:
+                return frame
+            if len(self._waiters) >= 64:
+                # Zaman aşımına uğramış bekleyenler kare gelmese de birikmesin.
+                self._waiters = [w for w in self._waiters if not w[1].done()]
+            self._waiters.append((loop, future))
+        if self._store is not None and (self._poller is None or self._poller.done()):
+            self._poller = loop.create_task(self._poll())
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.after(seq)
+
+    async def _poll(self):
+        # Bekleyen izleyici kaldıkça diğer worker'ların karelerini yoklar.
+        while any(not future.done() for _, future in self._waiters):
+            await asyncio.sleep(self.poll_interval)
+            self._sync()
+
+    async def rendition(self, frame, name):
+        """
+        Karenin istenen kopyası. Her (kare, kopya) çifti en fazla bir kez
+        üretilir; aynı anda isteyen izleyiciler aynı sonucu bekler. Üretim
+        olay döngüsünü bloklamamak için thread havuzunda yapılır.
+        """
+        # Her sunulan kare buradan geçer; sayaç yalnızca olay döngüsünden yazılır.
+        self.served += 1
+        self._serve_rate.tick(self._clock())
+        box = _RENDITION_BOXES[name]
+        if box is None:
+            return frame.data
+        key = (frame.seq, name)
+        with self._lock:
+            future = self._renditions.get(key)
+            owner = future is None
+            if owner:
+                future = self._renditions[key] = concurrent.futures.Future()
+                # Halkadan düşmüş karelerin kopyaları da bırakılır.
+                oldest = self.published - self.capacity
+                for stale in [k for k in self._renditions if k[0] <= oldest]:
+                    del self._renditions[stale]
+        if owner:
+            # Sonuç isteği başlatan izleyiciye değil üretime bağlanır: izleyici
+            # ayrılsa (istek iptal edilse) de future tamamlanır, diğerleri takılmaz.
+            rendering = asyncio.get_running_loop().run_in_executor(
+                None, render, frame.data, box
+            )
+            rendering.add_done_callback(lambda done: self._rendered(key, future, done))
+        # wrap_future iptali ortak future'a yansıtır; her izleyici yalnızca
+        # kendi beklemesini bırakır.
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _rendered(self, key, future, done):
+        if done.cancelled() or done.exception() is not None:
+            # Hatalı üretim önbellekte kalmaz; sonraki izleyici yeniden dener.
+            with self._lock:
+                self._renditions.pop(key, None)
+            error = done.exception() if not done.cancelled() else None
+            future.set_exception(error or RuntimeError("Kopya üretimi iptal edildi"))
+            return
+        self.renders += 1
+        future.set_result(done.result())
+
+    @staticmethod
+    def _wake(waiters):
+        # Aynı döngüdeki bekleyenler tek bir çağrıyla uyandırılır.
+        by_loop = {}
+        for loop, future in waiters:
+            by_loop.setdefault(loop, []).append(future)
+        for loop, futures in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_resolve_all, futures)
+            except RuntimeError:
+                pass  # Döngü kapanmış
+
+    def stats(self):
+        self._sync()
+        frame = self._latest
+        stored = [f for f in self._slots if f is not None]
+        now = self._clock()
+        return {
+            "capacity": self.capacity,
+            "latest_seq": frame.seq if frame is not None else None,
+            "published": self.published,
+            "source_gaps": self.source_gaps,
+            "renders": self.renders,
+            "served": self.served,
+            "stored_frames": len(stored),
+            "ingest_fps": self._ingest_rate.value(now),
+            "serve_fps": self._serve_rate.value(now),
+            "stored_bytes": sum(len(f.data) for f in stored),
+            "waiters": len(self._waiters),
+            "subscribers": len(self._subscribers),
+        }
+
+
+def frame_etag(frame, name="original"):
+    return f'"{frame.seq}-{name}"'
+
+
+def frame_headers(frame, name="original"):
+    """Kareyle birlikte gönderilen HTTP başlıkları."""
+    headers = {"X-Frame-Seq": str(frame.seq), "ETag": frame_etag(frame, name)}
+    if frame.captured_at is not None:
+        headers["X-Capture-Time"] = repr(frame.captured_at)
+    if frame.source_seq is not None:
+        headers["X-Source-Seq"] = str(frame.source_seq)
+    return headers
+
+
+def pack_frames(frames):
+    """
+    (data, captured_at, source_seq) demetlerini toplu alım biçimine çevirir.
+    Kamera tarafındaki istemciler için; sunucu unpack_frames ile açar.
+    """
+    parts = []
+    for data, captured_at, source_seq in frames:
+        parts.append(INGEST_RECORD.pack(len(data), captured_at, source_seq))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_frames(payload):
+    """
+    Art arda dizilmiş kayıtları (data, captured_at, source_seq) olarak
+    döndürür. Başlıklar memoryview üzerinden okunur; her kare gövdeden
+    yalnızca bir kez kopyalanır. Eksik ya da taşan kayıtta ValueError.
+    """
+    view = memoryview(payload)
+    size = INGEST_RECORD.size
+    offset = 0
+    frames = []
+    while offset < len(view):
+        if len(view) - offset < size:
+            raise ValueError("Kesik kare başlığı")
+        length, captured_at, source_seq = INGEST_RECORD.unpack_from(view, offset)
+        offset += size
+        if length == 0 or offset + length > len(view):
+            raise ValueError("Geçersiz kare uzunluğu")
+        frames.append((bytes(view[offset:offset + length]), captured_at, source_seq))
+        offset += length
+    return frames
+
+
+def _resolve_all(futures):
+    for future in futures:
+        if not future.done():
+            future.set_result(None)
+
+
+async def mjpeg_stream(
+    buffer, boundary, max_fps=None, idle_timeout=5.0, rendition="original"
+):
+    """
+    multipart/x-mixed-replace gövdesi üretir. Her parça başlığı ve kare
+    baytları ayrı ayrı gönderilir; kare baytları birleştirilerek kopyalanmaz.
+    """
+    frame = buffer.latest()
+    cursor = frame.seq - 1 if frame is not None else 0
+    period = 1.0 / max_fps if max_fps else 0.0
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
+    while True:
+        frame = await buffer.wait_after(cursor, timeout=idle_timeout)
+        if frame is None:
+            continue
+        cursor = frame.seq
+        data = await buffer.rendition(frame, rendition)
+        headers = "".join(
+            f"{k}: {v}\r\n" for k, v in frame_headers(frame, rendition).items()
+        )
+        yield (
+            f"--{boundary}\r\nContent-Type: image/jpeg\r\n"
+            f"Content-Length: {len(data)}\r\n{headers}\r\n"
+        ).encode()
+        yield data
+        yield b"\r\n"
+        if period:
+            next_time = max(next_time + period, loop.time())
+            await asyncio.sleep(next_time - loop.time())
@@ -0,0 +1,395 @@
+import asyncio
+import json
+import math
+import time
+import uuid
+from collections import deque
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _altitude(snapshot):
+    gps = snapshot.gps
+    return gps.alt if gps is not None else None
+
+
+def _heading(snapshot):
+    attitude = snapshot.attitude
+    if attitude is None or attitude.yaw is None:
+        return None
+    return math.degrees(attitude.yaw) % 360.0
+
+
+def _ground_distance(start, gps):
+    # Birkaç yüz metrelik manevralar için eşdikdörtgen yaklaşım yeterlidir.
+    north = (gps.lat - start.lat) * 111320.0
+    east = (gps.lon - start.lon) * 111320.0 * math.cos(math.radians(start.lat))
+    return math.hypot(north, east)
+
+
+def _fraction(done, total):
+    if done is None or not total:
+        return None
+    return max(0.0, min(1.0, done / total))
+
+
+def _takeoff_progress(start, altitude):
+    def progress(snapshot):
+        current = _altitude(snapshot)
+        return {"altitude": current, "fraction": _fraction(current, altitude)}
+
+    return progress
+
+
+def _land_progress(start):
+    start_alt = _altitude(start)
+
+    def progress(snapshot):
+        current = _altitude(snapshot)
+        descended = start_alt - current if current is not None and start_alt else None
+        return {"altitude": current, "fraction": _fraction(descended, start_alt)}
+
+    return progress
+
+
+def _turn_progress(start, angle):
+    start_heading = _heading(start)
+
+    def progress(snapshot):
+        heading = _heading(snapshot)
+        turned = None
+        if heading is not None and start_heading is not None:
+            turned = abs((heading - start_heading + 180.0) % 360.0 - 180.0)
+        return {
+            "altitude": _altitude(snapshot),
+            "heading": heading,
+            "fraction": _fraction(turned, abs(angle)),
+        }
+
+    return progress
+
+
+def _distance_progress(start, distance):
+    start_gps = start.gps
+
+    def progress(snapshot):
+        gps = snapshot.gps
+        travelled = None
+        if start_gps is not None and gps is not None and gps.lat is not None:
+            travelled = _ground_distance(start_gps, gps)
+        return {
+            "altitude": _altitude(snapshot),
+            "distance": travelled,
+            "fraction": _fraction(travelled, abs(distance)),
+        }
+
+    return progress
+
+
+# İlerlemesi telemetriden hesaplanabilen komutlar. Başlangıç durumu iş
+# oluşturulurken alınır; kuyrukta bekleme süresi kısa olduğu için yeterlidir.
+PROGRESS = {
+    "arm_and_takeoff": _takeoff_progress,
+    "land": _land_progress,
+    "turn_by_angle": _turn_progress,
+    "move_distance": _distance_progress,
+}
+
+
+class Job:
+    """
+    Aracın komut kuyruğuna verilmiş tek bir komut. Durum ve ilerleme
+    sorgulandığında hesaplanır; iş başına arka plan görevi ya da thread yoktur.
+    """
+
+    def __init__(self, controller, name, args, clock=time.time):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.args = list(args)
+        self.controller = controller
+        self.created_at = clock()
+        self.finished_at = None
+        self.cancel_requested = False
+        self._clock = clock
+        start = controller.telemetry.snapshot()
+        factory = PROGRESS.get(name)
+        self._progress = factory(start, *args) if factory is not None else None
+        self._final = None
+        self.future = controller.submit(name, *args)
+        self.future.add_done_callback(self._finished)
+
+    def _finished(self, future):
+        self.finished_at = self._clock()
+        self._final = self._measure()
+        if self.status == SUCCEEDED and self._final.get("fraction") is not None:
+            self._final["fraction"] = 1.0
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def status(self):
+        future = self.future
+        if not future.done():
+            return RUNNING if future.running() else PENDING
+        if future.cancelled():
+            return CANCELLED
+        if future.exception() is not None:
+            return FAILED
+        if future.result() is False:
+            return CANCELLED if self.cancel_requested else FAILED
+        return SUCCEEDED
+
+    def _measure(self):
+        if self._progress is None:
+            return {}
+        return self._progress(self.controller.telemetry.snapshot())
+
+    def progress(self):
+        if self._final is not None:
+            return self._final
+        return self._measure() if self.future.running() else {}
+
+    def to_dict(self):
+        status = self.status
+        result = error = None
+        if self.future.done() and not self.future.cancelled():
+            exception = self.future.exception()
+            if exception is not None:
+                error = str(exception)
+            else:
+                result = self.future.result()
+        return {
+            "id": self.id,
+            "command": self.name,
+            "args": self.args,
+            "status": status,
+            "progress": self.progress(),
+            "result": result,
+            "error": error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Uzun süren komutları iş olarak yürütür: istek işi kuyruğa verip hemen
+    döner, istemci /jobs/{id} ya da SSE akışıyla izler. Bitmiş işlerin
+    yalnızca son max_finished tanesi saklanır.
+    """
+
+    def __init__(self, max_finished=500, interval=0.2):
+        self.max_finished = max_finished
+        self.interval = interval
+        self._jobs = {}
+        self._finished = deque()
+
+    def submit(self, controller, name, *args):
+        job = Job(controller, name, args)
+        self._jobs[job.id] = job
+        job.future.add_done_callback(lambda _: self._retire(job))
+        return job
+
+    def _retire(self, job):
+        # Farklı thread'lerden çağrılabilir; dict/deque işlemleri atomiktir.
+        self._finished.append(job.id)
+        while len(self._finished) > self.max_finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list(self, status=None):
+        jobs = [job.to_dict() for job in list(self._jobs.values())]
+        if status is not None:
+            jobs = [job for job in jobs if job["status"] == status]
+        return jobs
+
+    def cancel(self, job):
+        """İş iptal edilebildiyse True; bitmiş ya da kesilemeyen işte False."""
+        if job.done:
+            return False
+        job.cancel_requested = True
+        if not job.controller.cancel(job.future):
+            job.cancel_requested = False
+            return False
+        return True
+
+    async def wait(self, job, timeout=None):
+        await asyncio.wait_for(_done(job), timeout)
+        return job
+
+    async def events(self, job):
+        """
+        text/event-stream gövdesi: durum ya da ilerleme değiştikçe "progress",
+        iş bitince bir kez "done" olayı. İş bitene kadar interval aralıkla
+        telemetriden ilerleme hesaplanır; bitiş beklenmeden hemen bildirilir.
+        """
+        finished = _done(job)
+        last = None
+        try:
+            while True:
+                info = job.to_dict()
+                if job.done:
+                    yield _sse("done", info)
+                    return
+                if info != last:
+                    yield _sse("progress", info)
+                    last = info
+                await asyncio.wait([finished], timeout=self.interval)
+        finally:
+            finished.cancel()
+
+    def stats(self):
+        counts = {}
+        for job in list(self._jobs.values()):
+            status = job.status
+            counts[status] = counts.get(status, 0) + 1
+        return {"jobs": len(self._jobs), "by_status": counts}
+
+
+TERMINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobService:
+    """
+    Çok worker'lı çalışmada işler bağlantı sahibi süreçte tutulur; böylece
+    bir worker'ın başlattığı iş diğerlerinden de sorgulanabilir. Worker'lar
+    bu nesnenin metotlarını yerel çağrı kanalı üzerinden çağırır; yalnızca
+    iş kimlikleri ve sözlükler taşınır.
+    """
+
+    def __init__(self, manager, fleet):
+        self.manager = manager
+        self.fleet = fleet
+
+    def submit(self, vehicle_id, name, args):
+        controller = self.fleet.get(vehicle_id)
+        if controller is None:
+            raise KeyError(f"Bilinmeyen araç: {vehicle_id}")
+        return self.manager.submit(controller, name, *args).to_dict()
+
+    def get(self, job_id):
+        job = self.manager.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def list(self, status=None):
+        return self.manager.list(status)
+
+    def cancel(self, job_id):
+        job = self.manager.get(job_id)
+        return self.manager.cancel(job) if job is not None else False
+
+    async def wait(self, job_id, timeout=None):
+        job = self.manager.get(job_id)
+        if job is None:
+            return None
+        await self.manager.wait(job, timeout)
+        return job.to_dict()
+
+    def stats(self):
+        return self.manager.stats()
+
+
+class RemoteJob:
+    """Worker'da bir işin son bilinen kaydı."""
+
+    def __init__(self, info):
+        self.info = info
+        self.id = info["id"]
+
+    @property
+    def done(self):
+        return self.info["status"] in TERMINAL
+
+    def to_dict(self):
+        return self.info
+
+
+class RemoteJobs:
+    """
+    JobManager arayüzünü JobService'e yönlendirir. call(metot, *args)
+    bir concurrent.futures.Future döndürmelidir. Metotlar coroutine'dir;
+    yanıt beklenirken worker'ın olay döngüsü bloklanmaz.
+    """
+
+    def __init__(self, call, interval=0.2, timeout=5.0):
+        self._call = call
+        self.interval = interval
+        self.timeout = timeout
+
+    async def _request(self, method, *args):
+        return await asyncio.wait_for(
+            asyncio.wrap_future(self._call(method, *args)), self.timeout
+        )
+
+    async def submit(self, controller, name, *args):
+        return RemoteJob(await self._request("submit", controller.vehicle_id, name, args))
+
+    async def get(self, job_id):
+        info = await self._request("get", job_id)
+        return RemoteJob(info) if info is not None else None
+
+    async def list(self, status=None):
+        return await self._request("list", status)
+
+    async def cancel(self, job):
+        cancelled = await self._request("cancel", job.id)
+        if cancelled:
+            job.info = await self._request("get", job.id) or job.info
+        return cancelled
+
+    async def wait(self, job, timeout=None):
+        job.info = await asyncio.wrap_future(self._call("wait", job.id, timeout))
+        return job
+
+    async def events(self, job):
+        # JobManager.events ile aynı olaylar; ilerleme bağlantı sahibi
+        # süreçten interval aralıkla sorgulanır, bitiş beklenmeden bildirilir.
+        finished = asyncio.wrap_future(self._call("wait", job.id, None))
+        last = None
+        try:
+            while True:
+                info = await asyncio.wrap_future(self._call("get", job.id))
+                if info is None or info["status"] in TERMINAL:
+                    yield _sse("done", info or job.info)
+                    return
+                if info != last:
+                    yield _sse("progress", info)
+                    last = info
+                await asyncio.wait([finished], timeout=self.interval)
+        finally:
+            finished.cancel()
+
+    async def stats(self):
+        return await self._request("stats")
+
+
+def _done(job):
+    # Çağıranın döngüsünde, iş bitince tamamlanan bir asyncio future'ı.
+    # asyncio.wrap_future kullanılmaz: onun iptali işin kendisini de iptal eder.
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+
+    def resolve(_):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def notify(future):
+        try:
+            loop.call_soon_threadsafe(resolve, future)
+        except RuntimeError:
+            pass  # Döngü kapanmış
+
+    job.future.add_done_callback(notify)
+    return waiter
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,268 @@
+"""
+Prometheus metin biçiminde (/metrics) çalışma zamanı ölçümleri.
+
+Sıcak yoldaki sayaçlar kilitsizdir: her sayaç tek bir thread'den yazılır
+(istek gecikmeleri olay döngüsünden, MAVLink sayaçları gönderen thread'den)
+ve güncelleme yalnızca tamsayı/float aritmetiğidir. Diğer değerler kazıma
+anında mevcut istatistiklerden okunur; ölçüm için ayrı bir yol açılmaz.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+
+from .remote import resolved
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden gecikme kovaları; son kova +Inf'tir.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Sabit kovalı histogram; observe() ek nesne üretmez."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Her HTTP isteğinin yanıt başlığı gönderilene kadar geçen süresini
+    eşleşen rota şablonuna göre kaydeder. Akış ve long-poll yanıtlarında
+    süre ilk bayta kadardır; gövde süresi sayılmaz.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                self.routes.observe(scope.get("route"), time.perf_counter() - started)
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+class RouteLatency:
+    """
+    Rota nesnesi başına bir histogram. Rotalar uygulama boyunca yaşadığı
+    için anahtar olarak id() kullanılır; etiketler kazıma anında üretilir.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._unmatched = Histogram()
+
+    def observe(self, route, seconds):
+        if route is None:
+            self._unmatched.observe(seconds)
+            return
+        entry = self._histograms.get(id(route))
+        if entry is None:
+            entry = self._histograms[id(route)] = (route, Histogram())
+        entry[1].observe(seconds)
+
+    def items(self):
+        for route, histogram in list(self._histograms.values()):
+            methods = ",".join(sorted(getattr(route, "methods", None) or ()))
+            yield {"route": route.path, "method": methods}, histogram
+        if self._unmatched.count:
+            yield {"route": "unmatched", "method": ""}, self._unmatched
+
+
+class _Family:
+    __slots__ = ("name", "kind", "help", "samples")
+
+    def __init__(self, name, kind, help_text):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples = []
+
+    def add(self, labels, value, suffix=""):
+        if value is not None:
+            self.samples.append((suffix, labels, value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(families):
+    lines = []
+    for family in families:
+        if not family.samples:
+            continue
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for suffix, labels, value in family.samples:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            label_text = "{" + label_text + "}" if label_text else ""
+            lines.append(f"{family.name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _histogram_samples(family, labels, histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+        cumulative += count
+        family.add(dict(labels, le=_format_value(bound)), cumulative, "_bucket")
+    family.add(labels, histogram.sum, "_sum")
+    family.add(labels, histogram.count, "_count")
+
+
+def _executor_stats(executor):
+    # Yalnızca kendi sayaçlarını stats() ile sunan executor'lar ölçülür.
+    stats = getattr(executor, "stats", None)
+    return stats() if stats is not None else None
+
+
+def _controller_stats(controller):
+    setpoints = getattr(controller, "setpoints", None)
+    commands = getattr(controller, "commands", None)
+    executor_stats = getattr(controller, "executor_stats", None)
+    return {
+        "mavlink_sent": getattr(controller, "mavlink_sent", None),
+        "setpoints": setpoints.stats() if setpoints is not None else None,
+        "commands": commands.stats() if commands is not None else None,
+        "executor": executor_stats() if executor_stats is not None else None,
+    }
+
+
+async def gather_stats(controllers):
+    """
+    collect() için kontrolcü istatistikleri. Çok worker'lı çalışmada
+    vekillerin sorguları awaitable döner; hepsi aynı anda beklenir. Yanıt
+    alınamayan değer atlanır, kazıma başarısız olmaz.
+    """
+    stats = [_controller_stats(controller) for _, controller in controllers]
+    keys = ("mavlink_sent", "setpoints", "commands", "executor")
+    values = await asyncio.gather(
+        *(resolved(s[key]) for s in stats for key in keys), return_exceptions=True
+    )
+    values = [None if isinstance(v, Exception) else v for v in values]
+    return [
+        dict(zip(keys, values[i * len(keys):(i + 1) * len(keys)])) for i in range(len(stats))
+    ]
+
+
+def collect(
+    controllers, routes, frame_buffer=None, admission=None, now=None, stats=None, executor=None
+):
+    """
+    controllers: (araç kimliği, kontrolcü) çiftleri. stats verilmezse
+    kontrolcü istatistikleri burada eşzamanlı okunur (bkz. gather_stats).
+    executor: API olay döngüsünün varsayılan executor'ı.
+    """
+    now = time.time() if now is None else now
+    if stats is None:
+        stats = [_controller_stats(controller) for _, controller in controllers]
+    f = {
+        name: _Family("uav_" + name, kind, help_text)
+        for name, kind, help_text in (
+            ("http_request_duration_seconds", "histogram", "Yanıt başlığına kadar süre"),
+            ("mavlink_messages_sent_total", "counter", "Gönderilen MAVLink mesajları"),
+            ("setpoint_ticks_total", "counter", "Setpoint döngüsü tick sayısı"),
+            ("setpoint_jitter_seconds", "gauge", "Setpoint tick gecikmesi"),
+            ("setpoint_rate_hz", "gauge", "Hedef setpoint frekansı"),
+            ("command_queue_depth", "gauge", "Bekleyen komut sayısı"),
+            ("commands_total", "counter", "Komut kuyruğu sayaçları"),
+            ("command_max_wait_seconds", "gauge", "Kuyrukta en uzun bekleme"),
+            ("executor_queue_depth", "gauge", "Executor'da bekleyen iş sayısı"),
+            ("executor_threads", "gauge", "Executor thread sayısı"),
+            ("threads_active", "gauge", "Süreçteki aktif thread sayısı"),
+            ("telemetry_age_seconds", "gauge", "Son güncellemeden bu yana geçen süre"),
+            ("telemetry_version", "gauge", "Telemetri snapshot sürümü"),
+            ("frame_buffer_frames", "gauge", "Kare halkasındaki kare sayısı"),
+            ("frame_buffer_waiters", "gauge", "Yeni kare bekleyen istemci sayısı"),
+            ("frames_ingested_total", "counter", "Alınan kareler"),
+            ("frames_served_total", "counter", "İzleyicilere gönderilen kareler"),
+            ("frames_dropped_total", "counter", "Kaynak sıra numarasına göre kaybolan kareler"),
+            ("frame_renders_total", "counter", "Üretilen ölçekli kopyalar"),
+            ("frames_fps", "gauge", "Anlık kare hızı"),
+            ("admission_admitted_total", "counter", "Kabul edilen komut istekleri"),
+            ("admission_rejected_total", "counter", "429 ile reddedilen komut istekleri"),
+            ("admission_inflight", "gauge", "Şeritte işlenmekte olan istekler"),
+        )
+    }
+    for labels, histogram in routes.items():
+        _histogram_samples(f["http_request_duration_seconds"], labels, histogram)
+    f["threads_active"].add({}, threading.active_count())
+    executors = [("api", _executor_stats(executor))] if executor is not None else []
+    for (vehicle_id, controller), controller_stats in zip(controllers, stats):
+        vehicle = {"vehicle": vehicle_id}
+        sent = controller_stats["mavlink_sent"] or {}
+        for message_type, count in list(sent.items()):
+            f["mavlink_messages_sent_total"].add(dict(vehicle, type=message_type), count)
+        setpoints = controller_stats["setpoints"]
+        if setpoints is not None and "ticks" in setpoints:
+            f["setpoint_ticks_total"].add(vehicle, setpoints["ticks"])
+            for stat in ("mean", "stddev", "max"):
+                f["setpoint_jitter_seconds"].add(
+                    dict(vehicle, stat=stat), setpoints[f"{stat}_jitter_ms"] / 1000.0
+                )
+            f["setpoint_rate_hz"].add(vehicle, setpoints["rate_hz"])
+        commands = controller_stats["commands"]
+        if commands is not None:
+            f["command_queue_depth"].add(vehicle, commands["depth"])
+            f["command_max_wait_seconds"].add(vehicle, commands["max_wait_ms"] / 1000.0)
+            for state in ("submitted", "executed", "dropped", "cancelled"):
+                f["commands_total"].add(dict(vehicle, state=state), commands[state])
+        if controller_stats["executor"] is not None:
+            executors.append((vehicle_id, controller_stats["executor"]))
+        snapshot = controller.telemetry.snapshot()
+        f["telemetry_version"].add(vehicle, snapshot.version)
+        for field, updated in snapshot.timestamps._asdict().items():
+            if updated is not None:
+                age = max(0.0, now - updated)
+                f["telemetry_age_seconds"].add(dict(vehicle, field=field), age)
+    for name, executor in executors:
+        if executor is not None:
+            f["executor_queue_depth"].add({"executor": name}, executor["queued"])
+            f["executor_threads"].add({"executor": name}, executor["threads"])
+    if frame_buffer is not None:
+        stats = frame_buffer.stats()
+        f["frame_buffer_frames"].add({}, stats["stored_frames"])
+        f["frame_buffer_waiters"].add({}, stats["waiters"])
+        f["frames_ingested_total"].add({}, stats["published"])
+        f["frames_served_total"].add({}, stats["served"])
+        f["frames_dropped_total"].add({}, stats["source_gaps"])
+        f["frame_renders_total"].add({}, stats["renders"])
+        f["frames_fps"].add({"direction": "ingest"}, stats["ingest_fps"])
+        f["frames_fps"].add({"direction": "serve"}, stats["serve_fps"])
+    if admission is not None:
+        for lane, count in admission.admitted.items():
+            f["admission_admitted_total"].add({"lane": lane}, count)
+        for (lane, reason), count in admission.rejected.items():
+            f["admission_rejected_total"].add({"lane": lane, "reason": reason}, count)
+        for lane, count in admission.stats()["inflight"].items():
+            f["admission_inflight"].add({"lane": lane}, count)
+    return render(f.values())
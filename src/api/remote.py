@@ -0,0 +1,13 @@
+"""
+Çok worker'lı çalışmada kontrolcü, filo ve iş kaydı bağlantı sahibi
+süreçteki nesnelerin vekilleridir; sorguları awaitable döndürür ki yanıt
+beklenirken worker'ın olay döngüsü bloklanmasın. Tek süreçte aynı çağrılar
+değeri doğrudan döndürür. resolved() ikisini de aynı şekilde karşılar.
+"""
+import inspect
+
+
+async def resolved(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+from starlette.websockets import WebSocketDisconnect
+
+from .encoding import BINARY, JSON, SnapshotEncoder, dumps_json, encode
+
+DEFAULT_RATE_HZ = 10.0
+MIN_RATE_HZ = 0.1
+MAX_RATE_HZ = 50.0
+
+
+class TelemetryStreams:
+    """
+    /ws/telemetry abonelerini sunar. Her istemci kendi hızında uyanır, aracın
+    son snapshot'ını okur ve yalnızca seçtiği alanlardan değişenleri gönderir.
+    İstemci yavaşsa arada kalan snapshot'lar atlanır; istemci başına kuyruk
+    tutulmaz. Snapshot'ların düz hali sürüm başına bir kez üretilir ve tüm
+    istemciler arasında paylaşılır.
+    """
+
+    def __init__(self):
+        self._flat = {}
+        self.encoder = SnapshotEncoder()
+        self.clients = 0
+        self.messages = 0
+        self.skipped = 0
+
+    def latest(self, controller):
+        snapshot = controller.telemetry.snapshot()
+        cached = self._flat.get(controller)
+        if cached is not None and cached[0] is snapshot:
+            return snapshot, cached[1]
+        flat = snapshot.flat()
+        self._flat[controller] = (snapshot, flat)
+        return snapshot, flat
+
+    def stats(self):
+        return {"clients": self.clients, "messages": self.messages, "skipped": self.skipped}
+
+    async def serve(
+        self, websocket, controller, fields=None, rate=DEFAULT_RATE_HZ, media=JSON
+    ):
+        """
+        media: JSON ve MessagePack'te değişen alanlar gönderilir; ikili
+        düzende (BINARY) her yeni sürümde sabit boyutlu kaydın tamamı gider.
+        """
+        await websocket.accept()
+        _, flat = self.latest(controller)
+        try:
+            subscription = _Subscription(flat, fields, rate)
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+        self.clients += 1
+        receiver = asyncio.ensure_future(self._receive(websocket, subscription, flat))
+        try:
+            await self._push(websocket, controller, subscription, receiver, media)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            self.clients -= 1
+            receiver.cancel()
+
+    async def _push(self, websocket, controller, subscription, receiver, media):
+        loop = asyncio.get_running_loop()
+        sent = {}
+        last_version = None
+        next_time = loop.time()
+        while not receiver.done():
+            snapshot, flat = self.latest(controller)
+            if snapshot.version != last_version or subscription.changed:
+                if subscription.changed:
+                    # Alan seti değişti: yeni setin tamamı gönderilir.
+                    sent = {}
+                    subscription.changed = False
+                if last_version is not None and snapshot.version > last_version + 1:
+                    self.skipped += snapshot.version - last_version - 1
+                changes = {
+                    name: flat[name]
+                    for name in subscription.fields
+                    if name not in sent or sent[name] != flat[name]
+                }
+                if media == BINARY:
+                    # Kayıt snapshot başına bir kez kodlanır, tüm istemcilere aynı baytlar gider.
+                    await websocket.send_bytes(self.encoder.encode(controller, BINARY)[1])
+                    self.messages += 1
+                elif changes or last_version is None:
+                    message = {"version": snapshot.version, "data": changes}
+                    if media == JSON:
+                        await websocket.send_text(dumps_json(message).decode())
+                    else:
+                        await websocket.send_bytes(encode(message, media))
+                    self.messages += 1
+                    sent.update(changes)
+                last_version = snapshot.version
+            next_time += subscription.period
+            now = loop.time()
+            if next_time < now:
+                # Gönderim gecikti; kaçırılan aralıklar telafi edilmez.
+                next_time = now
+            await asyncio.sleep(next_time - now)
+
+    async def _receive(self, websocket, subscription, flat):
+        # İstemci {"fields": [...], "rate": hz} göndererek aboneliğini değiştirebilir.
+        while True:
+            try:
+                text = await websocket.receive_text()
+            except (WebSocketDisconnect, RuntimeError):
+                return
+            try:
+                request = json.loads(text)
+                subscription.update(flat, request.get("fields"), request.get("rate"))
+            except (ValueError, TypeError, AttributeError) as e:
+                await websocket.send_text(json.dumps({"error": str(e)}))
+
+
+class _Subscription:
+    def __init__(self, flat, fields, rate):
+        self.fields = ()
+        self.period = 1.0 / DEFAULT_RATE_HZ
+        self.changed = False
+        self.update(flat, fields, rate)
+
+    def update(self, flat, fields=None, rate=None):
+        if fields is not None:
+            if isinstance(fields, str):
+                fields = [f for f in fields.split(",") if f]
+            self.fields = _expand(flat, fields)
+            self.changed = True
+        elif not self.fields:
+            self.fields = tuple(flat)
+        if rate is not None:
+            rate = float(rate)
+            if not rate > 0:
+                raise ValueError("rate pozitif olmalı")
+            self.period = 1.0 / min(max(rate, MIN_RATE_HZ), MAX_RATE_HZ)
+
+
+def _expand(flat, fields):
+    # "gps" gibi grup adları o grubun tüm alanlarına açılır.
+    selected = []
+    for field in fields:
+        if field in flat:
+            selected.append(field)
+            continue
+        group = [name for name in flat if name.startswith(field + ".")]
+        if not group:
+            raise ValueError(f"Bilinmeyen alan: {field}")
+        selected.extend(group)
+    return tuple(dict.fromkeys(selected))
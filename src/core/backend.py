@@ -0,0 +1,76 @@
+import time
+from urllib.parse import parse_qs, urlparse
+
+
+class VehicleBackend:
+    """
+    Kontrolcünün araçla konuştuğu arka uç. connect() DroneKit Vehicle
+    arayüzünün kontrolcü tarafından kullanılan alt kümesini sağlayan bir nesne
+    döndürür: location, battery, attitude, heading, armed, is_armable, mode,
+    last_heartbeat, message_factory, send_mavlink, simple_takeoff,
+    add/remove_attribute_listener, add/remove_message_listener ve close.
+    """
+
+    # Setpoint süreleri ve zaman damgaları bu saatle ölçülür.
+    clock = staticmethod(time.monotonic)
+
+    def connect(self, connection_string, wait_ready=True, timeout=60):
+        raise NotImplementedError
+
+    def mode(self, name):
+        raise NotImplementedError
+
+    def mission_command(self, item):
+        """Bir MissionItem'ı aracın commands listesine eklenecek nesneye çevirir."""
+        raise NotImplementedError
+
+    def upload_mission(self, vehicle, items, timeout=None):
+        """
+        Görevi tek bir toplu aktarımla yükler (MISSION_COUNT ardından
+        otopilotun istediği öğeler). Bloklar; yürütücüde çağrılmalıdır.
+        """
+        commands = vehicle.commands
+        commands.clear()
+        for item in items:
+            commands.add(self.mission_command(item))
+        commands.upload(timeout=timeout)
+
+
+class DronekitBackend(VehicleBackend):
+    """Gerçek araç veya SITL için DroneKit üzerinden MAVLink bağlantısı."""
+
+    def connect(self, connection_string, wait_ready=True, timeout=60):
+        # DroneKit yalnızca gerçek bağlantı kurulurken gerekir.
+        from dronekit import connect
+
+        return connect(connection_string, wait_ready=wait_ready, timeout=timeout)
+
+    def mode(self, name):
+        from dronekit import VehicleMode
+
+        return VehicleMode(name)
+
+    def mission_command(self, item):
+        from dronekit import Command
+
+        return Command(
+            0, 0, 0, item.frame, item.command, 0, 1,
+            item.param1, item.param2, item.param3, item.param4,
+            item.x, item.y, item.z,
+        )
+
+
+def backend_for(connection_string):
+    """
+    "sim://" ile başlayan bağlantı dizeleri süreç içi simülatörü seçer, ör.
+    "sim://?time_scale=20&lat=41.0&lon=29.0". Diğerleri DroneKit'e gider.
+    """
+    if connection_string.startswith("sim://"):
+        from .simulator import SimulatorBackend
+
+        params = {k: v[-1] for k, v in parse_qs(urlparse(connection_string).query).items()}
+        return SimulatorBackend(
+            time_scale=float(params.get("time_scale", 1.0)),
+            home=(float(params.get("lat", 41.0)), float(params.get("lon", 29.0))),
+        )
+    return DronekitBackend()
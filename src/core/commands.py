@@ -0,0 +1,294 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+
+MOTION = "motion"
+PREEMPT = "preempt"
+SEQUENTIAL = "sequential"
+
+# Hareket komutlarında yalnızca en son istek anlamlıdır; durdurma, iniş ve
+# bağlantı kesme diğer her şeyin önüne geçer. Listede olmayanlar sırayla çalışır.
+COMMAND_KINDS = {
+    "move_3d": MOTION,
+    "send_ned_velocity": MOTION,
+    "turn_by_angle": MOTION,
+    "move_distance": MOTION,
+    "turn_and_move": MOTION,
+    "fly_legs": MOTION,
+    "upload_mission": SEQUENTIAL,
+    "start_mission": SEQUENTIAL,
+    "stop": PREEMPT,
+    "land": PREEMPT,
+    "disconnect": PREEMPT,
+}
+
+
+# Kuyruğu beklemeden aracı durduran güvenlik komutları.
+SAFETY_COMMANDS = ("stop", "land")
+
+
+def _resolve(future, result):
+    # Çağıran Future'ı iptal etmiş olabilir.
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def _follow(future, source):
+    # Birleştirilen komut, yerine çalışan komutun sonucunu alır.
+    if source.cancelled():
+        _resolve(future, False)
+    elif source.exception() is not None:
+        try:
+            future.set_exception(source.exception())
+        except InvalidStateError:
+            pass
+    else:
+        _resolve(future, source.result())
+
+
+class _Command:
+    __slots__ = ("name", "kind", "factory", "future", "submitted")
+
+    def __init__(self, name, kind, factory):
+        self.name = name
+        self.kind = kind
+        self.factory = factory
+        self.future = Future()
+        self.submitted = time.monotonic()
+
+
+class CommandQueue:
+    """
+    Araç başına komut kuyruğu. Bekleyen hareket komutu tek bir yuvada tutulur
+    ve yenisi gelince düşürülür; çalışan hareket komutu da yeni bir hareket
+    komutuyla kesilir. Böylece girdi ne kadar hızlı gelirse gelsin komut
+    gecikmesi en fazla bir komutun iptal süresi kadardır.
+
+    submit() herhangi bir thread'den çağrılabilir ve komutun sonucuyla
+    tamamlanan bir concurrent.futures.Future döndürür; düşürülen veya kesilen
+    komutlar False ile tamamlanır. Bekleyen aynı öncelikli komutun tekrarı
+    ayrıca çalışmaz, onun sonucuyla tamamlanır.
+    """
+
+    def __init__(self, log=print, max_sequential=16):
+        self.log = log
+        self.max_sequential = max_sequential
+        self._lock = threading.Lock()
+        self._preempt = deque()
+        self._sequential = deque()
+        self._motion = None
+        self._running = None
+        self._running_task = None
+        self._loop = None
+        self._wakeup = None
+        self._worker = None
+        self.submitted = 0
+        self.executed = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.max_wait = 0.0
+
+    def start(self, loop=None):
+        """
+        Çalıştırıcıyı verilen olay döngüsünde başlatır; başka thread'den
+        çağrılabilir. Döngü yoksa ilk submit() çalışan döngüde başlatır.
+        """
+        if self._loop is not None:
+            return
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+        self._loop = loop
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._start_on_loop()
+        else:
+            loop.call_soon_threadsafe(self._start_on_loop)
+
+    def _start_on_loop(self):
+        self._wakeup = asyncio.Event()
+        self._worker = self._loop.create_task(self._run())
+        with self._lock:
+            pending = bool(self._preempt or self._sequential or self._motion)
+        if pending:
+            self._wakeup.set()
+
+    def submit(self, name, factory):
+        """
+        factory() bir coroutine döndürmelidir; komut sırası gelince olay
+        döngüsünde oluşturulur, böylece düşürülen komutlar hiç başlamaz.
+        """
+        command = _Command(name, COMMAND_KINDS.get(name, SEQUENTIAL), factory)
+        if self._loop is None:
+            self.start()
+        if self._loop is None:
+            self.log(f"Komut kuyruğu başlatılmadı, {name} çalıştırılamadı.")
+            _resolve(command.future, False)
+            return command.future
+        dropped = []
+        coalesced = None
+        with self._lock:
+            self.submitted += 1
+            if command.kind == PREEMPT:
+                dropped.extend(self._sequential)
+                self._sequential.clear()
+                if self._motion is not None:
+                    dropped.append(self._motion)
+                    self._motion = None
+                if not self._preempt or self._preempt[-1].name != name:
+                    self._preempt.append(command)
+                else:
+                    # Art arda aynı öncelikli komut tek seferde çalıştırılır.
+                    coalesced = self._preempt[-1]
+            elif command.kind == MOTION:
+                if self._motion is not None:
+                    dropped.append(self._motion)
+                self._motion = command
+            else:
+                if len(self._sequential) >= self.max_sequential:
+                    dropped.append(self._sequential.popleft())
+                self._sequential.append(command)
+            running = self._running
+            interrupt = running is not None and (
+                (command.kind == PREEMPT and running.kind != PREEMPT)
+                or (command.kind == MOTION and running.kind == MOTION)
+            )
+            self.dropped += len(dropped)
+        for old in dropped:
+            _resolve(old.future, False)
+        if coalesced is not None:
+            coalesced.future.add_done_callback(lambda f: _follow(command.future, f))
+        if interrupt:
+            self._loop.call_soon_threadsafe(self._cancel_running, running)
+        self._loop.call_soon_threadsafe(self._wake)
+        return command.future
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _cancel_running(self, command):
+        if self._running is command and self._running_task is not None:
+            self._running_task.cancel()
+
+    def _next(self):
+        with self._lock:
+            if self._preempt:
+                command = self._preempt.popleft()
+            elif self._sequential:
+                command = self._sequential.popleft()
+            elif self._motion is not None:
+                command, self._motion = self._motion, None
+            else:
+                return None
+            self._running = command
+        return command
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                command = self._next()
+                if command is None:
+                    break
+                await self._execute(command)
+
+    async def _execute(self, command):
+        if not command.future.set_running_or_notify_cancel():
+            with self._lock:
+                self._running = None
+            return
+        self.max_wait = max(self.max_wait, time.monotonic() - command.submitted)
+        task = self._loop.create_task(command.factory())
+        self._running_task = task
+        try:
+            # Task'ın kendisi beklenmez; iptal edildiğinde çalıştırıcı ayakta kalır.
+            await asyncio.wait([task])
+        finally:
+            with self._lock:
+                self._running = None
+                self._running_task = None
+        if task.cancelled():
+            self.cancelled += 1
+            self.log(f"{command.name} komutu daha yeni bir komutla kesildi.")
+            command.future.set_result(False)
+        elif task.exception() is not None:
+            self.executed += 1
+            command.future.set_exception(task.exception())
+        else:
+            self.executed += 1
+            command.future.set_result(task.result())
+
+    def cancel(self, future):
+        """
+        submit()'in döndürdüğü Future'a ait komutu iptal eder. Bekleyen komut
+        kuyruktan çıkarılır ("pending"), çalışan komut kesilir ("running");
+        iki durumda da Future False ile tamamlanır. Çalışan öncelikli komutlar
+        (iniş, durdurma) kesilmez; bulunamayan ya da bitmiş komutta None döner.
+        """
+        with self._lock:
+            state = None
+            if self._motion is not None and self._motion.future is future:
+                command, self._motion = self._motion, None
+                state = "pending"
+            else:
+                for pending in (self._preempt, self._sequential):
+                    for command in pending:
+                        if command.future is future:
+                            pending.remove(command)
+                            state = "pending"
+                            break
+                    if state is not None:
+                        break
+            if state is None:
+                command = self._running
+                if command is None or command.future is not future or command.kind == PREEMPT:
+                    return None
+                state = "running"
+            else:
+                self.dropped += 1
+        if state == "pending":
+            _resolve(command.future, False)
+        else:
+            self._loop.call_soon_threadsafe(self._cancel_running, command)
+        return state
+
+    def stats(self):
+        with self._lock:
+            depth = len(self._preempt) + len(self._sequential) + (self._motion is not None)
+            running = self._running.name if self._running is not None else None
+        return {
+            "depth": depth,
+            "running": running,
+            "submitted": self.submitted,
+            "executed": self.executed,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    async def close(self):
+        worker, self._worker = self._worker, None
+        self._loop = None
+        if worker is not None:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        with self._lock:
+            pending = list(self._preempt) + list(self._sequential)
+            if self._motion is not None:
+                pending.append(self._motion)
+            self._preempt.clear()
+            self._sequential.clear()
+            self._motion = None
+        for command in pending:
+            _resolve(command.future, False)
@@ -0,0 +1,97 @@
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, InvalidStateError
+
+ConditionEvent = namedtuple("ConditionEvent", ["name", "value"])
+
+_Waiter = namedtuple("_Waiter", ["triggers", "predicate", "future"])
+
+
+class VehicleConditions:
+    """
+    Uçuş komutlarının tamamlanma koşullarını araçtan gelen olaylarla çözer.
+    DroneKit'e araç başına yalnızca bir kez listener eklenir; bekleyenler kendi
+    listemizde tutulur, böylece DroneKit'in listener listeleri bildirim
+    sırasında değiştirilmez.
+    """
+
+    ATTRIBUTES = (
+        "armed",
+        "mode",
+        "gps_0",
+        "ekf_ok",
+        "heading",
+        "location.global_relative_frame",
+    )
+    MESSAGES = ("COMMAND_ACK", "EXTENDED_SYS_STATE", "MISSION_ITEM_REACHED")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = ()
+        self._vehicle = None
+
+    def attach(self, vehicle):
+        self.detach()
+        self._vehicle = vehicle
+        for name in self.ATTRIBUTES:
+            vehicle.add_attribute_listener(name, self._on_event)
+        for name in self.MESSAGES:
+            vehicle.add_message_listener(name, self._on_event)
+
+    def detach(self):
+        vehicle = self._vehicle
+        if vehicle is None:
+            return
+        for name in self.ATTRIBUTES:
+            try:
+                vehicle.remove_attribute_listener(name, self._on_event)
+            except Exception:
+                pass
+        for name in self.MESSAGES:
+            try:
+                vehicle.remove_message_listener(name, self._on_event)
+            except Exception:
+                pass
+        self._vehicle = None
+
+    def wait_for(self, predicate, triggers):
+        """
+        predicate(vehicle, name, value) doğru döndüğünde ConditionEvent ile
+        tamamlanan bir concurrent.futures.Future döndürür. Future iptal
+        edilirse bekleyen kayıt kendiliğinden silinir.
+        """
+        future = Future()
+        waiter = _Waiter(frozenset(triggers), predicate, future)
+        with self._lock:
+            self._waiters = self._waiters + (waiter,)
+        future.add_done_callback(lambda _: self._remove(waiter))
+        # Koşul kayıttan önce zaten sağlanmış olabilir.
+        vehicle = self._vehicle
+        if vehicle is not None:
+            self._evaluate(waiter, vehicle, None, None)
+        return future
+
+    def _remove(self, waiter):
+        with self._lock:
+            self._waiters = tuple(w for w in self._waiters if w is not waiter)
+
+    def _on_event(self, vehicle, name, value):
+        for waiter in self._waiters:
+            if name in waiter.triggers:
+                self._evaluate(waiter, vehicle, name, value)
+
+    @staticmethod
+    def _evaluate(waiter, vehicle, name, value):
+        if waiter.future.done():
+            return
+        try:
+            matched = waiter.predicate(vehicle, name, value)
+        except Exception:
+            return
+        if not matched:
+            return
+        try:
+            waiter.future.set_result(ConditionEvent(name, value))
+        except InvalidStateError:
+            # Başka bir thread aynı anda tamamladı ya da bekleyen iptal edildi.
+            pass
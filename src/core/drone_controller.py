@@ -1,77 +1,296 @@
 import asyncio
-import time
-from dronekit import connect, VehicleMode
+import math
+import os
+
+from .backend import backend_for
+from .commands import SAFETY_COMMANDS, CommandQueue
+from .conditions import VehicleConditions
+from .geofence import Geofence
+from .history import TelemetryHistory
+from .link import LinkState, VehicleLink
+from .mission import MissionTracker, compile_mission, route_from_legs
+from .recorder import FlightRecorder
+from .setpoint import SetpointStreamer
+from .telemetry import TelemetryCache
+
+MAV_CMD_NAV_TAKEOFF = 22
+MAV_CMD_CONDITION_YAW = 115
+MAV_CMD_COMPONENT_ARM_DISARM = 400
+MAV_LANDED_STATE_ON_GROUND = 1
+MAV_FRAME_BODY_NED = 8
+# MAV_RESULT_ACCEPTED ve MAV_RESULT_IN_PROGRESS dışındaki ACK'ler ret sayılır.
+_ACCEPTED_RESULTS = (0, 5)
+# fly_legs irtifa verilmeden çağrılırsa araç bu göreli irtifanın üstünde
+# (havada) olmalıdır; yerdeyken görev yer seviyesinde uçulurdu.
+MIN_LEG_ALTITUDE = 2.0
+
 
 class RealDroneController:
-    def __init__(self, connection_string="127.0.0.1:5760"):
+    def __init__(
+        self,
+        connection_string="127.0.0.1:5760",
+        setpoint_rate_hz=10,
+        setpoint_streamer=None,
+        executor=None,
+        connect_executor=None,
+        vehicle_id=None,
+        flight_log_dir=None,
+        backend=None,
+        fence_lookahead=1.0,
+    ):
         """
         Raspberry Pi 4B üzerinden Pixhawk'a seri bağlantı için örnek bağlantı dizesi.
         Kendi donanımınıza göre güncellenebilir.
         """
-        self.connected = False
         self.connection_string = connection_string
+        # "sim://" bağlantı dizeleri süreç içi simülatörü, diğerleri DroneKit'i seçer.
+        self.backend = backend or backend_for(connection_string)
+        self.vehicle_id = vehicle_id
         self.vehicle = None
-        self.log("Gerçek drone bağlantısı oluşturuluyor...")
-        self._connect_drone()
+        self.telemetry = TelemetryCache()
+        self.history = TelemetryHistory()
+        self.telemetry.subscribe(self.history.record)
+        self.recorder = None
+        if flight_log_dir is not None and vehicle_id is not None:
+            flight_log_dir = os.path.join(flight_log_dir, str(vehicle_id))
+        self._flight_log_dir = flight_log_dir
+        self._open_recorder()
+        self.conditions = VehicleConditions()
+        self.mission = MissionTracker()
+        # Her setpoint, aracın fence_lookahead saniye sonraki tahmini konumu
+        # üzerinden çite karşı denetlenir.
+        self.geofence = None
+        self.fence_lookahead = fence_lookahead
+        self.fence_breaches = 0
+        self.last_fence_breach = None
+        # Filo içinde setpoint thread'i ve bağlantı executor'ı araçlar
+        # arasında paylaşılır; tek başına kullanımda kontrolcü kendisininkini açar.
+        if setpoint_streamer is None:
+            setpoint_streamer = SetpointStreamer(
+                rate_hz=setpoint_rate_hz, clock=self.backend.clock
+            )
+            setpoint_streamer.start()
+        self.setpoints = setpoint_streamer.channel(self._send_velocity_setpoint)
+        self.link = VehicleLink(
+            connection_string,
+            self.backend.connect,
+            on_ready=self._on_vehicle_ready,
+            on_lost=self._on_vehicle_lost,
+            log=self.log,
+            executor=executor,
+            connect_executor=connect_executor,
+        )
+        self._executor = executor
+        self._loop = None
+        self.commands = CommandQueue(log=self.log)
+        # Gönderilen MAVLink mesajları, türe göre. Her tür hep aynı thread'den
+        # gönderildiği için sayaçlar kilitsiz güncellenir.
+        self.mavlink_sent = {}
 
     def log(self, message):
+        if self.vehicle_id is not None:
+            message = f"[{self.vehicle_id}] {message}"
         print(message)
 
-    def _connect_drone(self):
-        try:
-            # Pixhawk'a Raspberry Pi üzerinden seri bağlantı kuruluyor.
-            self.vehicle = connect(self.connection_string, wait_ready=True, timeout=60)
-            self.connected = True
-            self.log("Drone bağlantısı başarılı.")
-        except Exception as e:
-            self.log(f"Drone bağlantı hatası: {e}")
-            self.connected = False
+    @property
+    def connected(self):
+        return self.vehicle is not None and self.link.state in (
+            LinkState.READY,
+            LinkState.DEGRADED,
+        )
 
-    async def arm_and_takeoff(self, target_altitude):
-        if not self.connected:
-            self.log("Drone bağlı değil. Lütfen bağlantıyı kontrol edin.")
+    def start(self, loop=None):
+        """
+        Bağlantıyı arka planda başlatır ve hemen döner; API ve GUI araç
+        hazır olmasını beklemeden açılabilir. İlk çağrıdaki olay döngüsü
+        (verilmezse çalışan döngü) saklanır; sonraki çağrılar, ör. API'den
+        yeniden bağlanma, hep aynı döngüyü kullanır.
+        """
+        if self._loop is None:
+            self._loop = loop if loop is not None else asyncio.get_running_loop()
+        self._open_recorder()
+        # Pixhawk'a Raspberry Pi üzerinden seri bağlantı kuruluyor.
+        self.log("Gerçek drone bağlantısı oluşturuluyor...")
+        self.link.start(self._loop)
+        self.commands.start(self._loop)
+
+    def submit(self, name, *args, **kwargs):
+        """
+        Komutu aracın komut kuyruğuna ekler; herhangi bir thread'den
+        çağrılabilir. Sonuçla tamamlanan bir concurrent.futures.Future döner.
+        """
+        if name in SAFETY_COMMANDS:
+            # Hızlı şerit: sıfır hız hedefi kuyruğu ve olay döngüsünü beklemeden
+            # verilir, bir sonraki setpoint tick'inde araca ulaşır. Komutun
+            # kendisi (ör. LAND moduna geçiş) kuyruktan öncelikli çalışır.
+            self.setpoints.set_target(0, 0, 0, 1)
+        return self.commands.submit(name, lambda: getattr(self, name)(*args, **kwargs))
+
+    def cancel(self, future):
+        """
+        submit()'in döndürdüğü komutu iptal eder; iptal edilebildiyse True.
+        Çalışırken kesilen manevradan sonra araç sıfır hızla yerinde tutulur.
+        """
+        state = self.commands.cancel(future)
+        if state == "running":
+            # stop komutu kuyruktaki diğer komutları da düşüreceği için
+            # sıfır hız hedefi doğrudan verilir.
+            self.setpoints.set_target(0, 0, 0, 1)
+            self.log("Çalışan komut iptal edildi, araç durduruldu.")
+        return state is not None
+
+    def _open_recorder(self):
+        # Her bağlantı oturumu kendi kayıt dizinine yazılır; açık kayıt varsa
+        # (ör. ilk start()) olduğu gibi kullanılır.
+        if self._flight_log_dir is None:
+            return
+        if self.recorder is not None and not self.recorder.closed:
+            return
+        self.recorder = FlightRecorder(self._flight_log_dir)
+        self.telemetry.subscribe(self.recorder.record_telemetry)
+
+    async def _close_recorder(self):
+        recorder = self.recorder
+        if recorder is None or recorder.closed:
             return
-        await asyncio.get_event_loop().run_in_executor(
-            None, self._arm_and_takeoff_blocking, target_altitude
+        self.telemetry.unsubscribe(recorder.record_telemetry)
+        # Kapatma, hazırlanan sonraki segmenti bekleyebilir; döngü bloklanmaz.
+        await asyncio.get_running_loop().run_in_executor(self._executor, recorder.close)
+
+    def _record_command(self, name, *args):
+        if self.recorder is not None:
+            self.recorder.record_command(name, *args)
+
+    def _on_vehicle_ready(self, vehicle):
+        self.vehicle = vehicle
+        self.telemetry.attach(vehicle)
+        # Görev ilerlemesi, aynı mesajı bekleyen koşullardan önce güncellenir.
+        self.mission.attach(vehicle)
+        self.conditions.attach(vehicle)
+
+    def _on_vehicle_lost(self, vehicle):
+        self.setpoints.clear()
+        self.conditions.detach()
+        self.mission.detach()
+        self.telemetry.detach()
+        self.vehicle = None
+
+    async def _wait_until(self, predicate, triggers, timeout, description):
+        """
+        Koşul araçtan gelen bir olayla sağlanana ya da süre dolana kadar
+        bekler; bu sırada hiçbir executor thread'i meşgul edilmez.
+        Koşul sağlanırsa tetikleyen ConditionEvent, zaman aşımında None döner.
+        """
+        future = self.conditions.wait_for(predicate, triggers)
+        return await self._await_event(future, timeout, description)
+
+    async def _await_event(self, future, timeout, description):
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.log(f"Zaman aşımı: {description} ({timeout} s)")
+            return None
+
+    @staticmethod
+    def _is_rejected(name, value, command):
+        return (
+            name == "COMMAND_ACK"
+            and value.command == command
+            and value.result not in _ACCEPTED_RESULTS
         )
 
-    def _arm_and_takeoff_blocking(self, target_altitude):
+    async def arm_and_takeoff(self, target_altitude, timeout=60):
+        if not self.connected:
+            self.log("Drone bağlı değil. Lütfen bağlantıyı kontrol edin.")
+            return False
         vehicle = self.vehicle
+        self._record_command("arm_and_takeoff", target_altitude)
         self.log("Arm işlemi başlatılıyor...")
-        while not vehicle.is_armable:
-            self.log("Drone arm edilebilir durumda değil, bekleniyor...")
-            time.sleep(1)
-        vehicle.mode = VehicleMode("GUIDED")
+        ready = await self._wait_until(
+            lambda v, name, value: v.is_armable,
+            ("mode", "gps_0", "ekf_ok"),
+            timeout,
+            "drone arm edilebilir duruma gelmedi",
+        )
+        if ready is None:
+            return False
+        self._set_mode(vehicle, "GUIDED")
         vehicle.armed = True
-        while not vehicle.armed:
-            self.log("Drone arm oluyor, bekleniyor...")
-            time.sleep(1)
+        # DroneKit arm isteğini COMPONENT_ARM_DISARM COMMAND_LONG'u olarak gönderir.
+        self._count_mavlink("COMMAND_LONG")
+        event = await self._wait_until(
+            lambda v, name, value: v.armed
+            or self._is_rejected(name, value, MAV_CMD_COMPONENT_ARM_DISARM),
+            ("armed", "COMMAND_ACK"),
+            timeout,
+            "drone arm olmadı",
+        )
+        if event is None:
+            return False
+        if event.name == "COMMAND_ACK":
+            self.log(f"Arm komutu reddedildi (sonuç: {event.value.result}).")
+            return False
         self.log("Drone armed, kalkışa geçiliyor...")
         vehicle.simple_takeoff(target_altitude)
-        while True:
-            alt = vehicle.location.global_relative_frame.alt
-            self.log(f"Mevcut irtifa: {alt:.2f} m")
-            if alt >= target_altitude * 0.95:
-                break
-            time.sleep(1)
+        self._count_mavlink("COMMAND_LONG")
+        event = await self._wait_until(
+            lambda v, name, value: v.location.global_relative_frame.alt
+            >= target_altitude * 0.95
+            or self._is_rejected(name, value, MAV_CMD_NAV_TAKEOFF),
+            ("location.global_relative_frame", "COMMAND_ACK"),
+            timeout,
+            "hedef irtifaya ulaşılamadı",
+        )
+        if event is None:
+            return False
+        if event.name == "COMMAND_ACK":
+            self.log(f"Kalkış komutu reddedildi (sonuç: {event.value.result}).")
+            return False
         self.log("Hedef irtifaya ulaşıldı.")
+        return True
 
     async def send_ned_velocity(self, velocity_x, velocity_y, velocity_z, duration=1):
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            self._send_ned_velocity_blocking,
-            velocity_x,
-            velocity_y,
-            velocity_z,
-            duration,
-        )
+        # Hedef setpoint akışına devredilir; önceki hareket komutu bir sonraki
+        # tick'te geçersiz kalır. Tamamlanırsa True, başka komutla kesilirse False.
+        breach = self._predict_breach(velocity_x, velocity_y, velocity_z, duration, path=True)
+        if breach is not None:
+            self._on_fence_breach(breach)
+            return False
+        future = self.setpoints.set_target(velocity_x, velocity_y, velocity_z, duration)
+        try:
+            completed = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Kuyruk komutu kesti (ör. yeni bir hareket komutu): hedef hâlâ bu
+            # çağrınınsa akış eski hızı göndermeye devam etmesin, araç tutulur.
+            self.setpoints.set_target(0, 0, 0, 1, replaces=future)
+            raise
+        if completed:
+            self.log(
+                f"{duration} saniye boyunca (x:{velocity_x}, y:{velocity_y}, z:{velocity_z}) hızı gönderildi."
+            )
+        else:
+            self.log(
+                f"(x:{velocity_x}, y:{velocity_y}, z:{velocity_z}) hız komutu yeni bir komutla kesildi."
+            )
+        return completed
 
-    def _send_ned_velocity_blocking(self, velocity_x, velocity_y, velocity_z, duration):
+    def _send_velocity_setpoint(self, velocity_x, velocity_y, velocity_z):
         vehicle = self.vehicle
+        if vehicle is None or not self.connected:
+            return
+        breach = self._predict_breach(
+            velocity_x, velocity_y, velocity_z, self.fence_lookahead
+        )
+        if breach is not None:
+            # Tahmini konum çitin dışında: araç durdurulur ve komut kesilir.
+            self._on_fence_breach(breach)
+            velocity_x = velocity_y = velocity_z = 0
+            self.setpoints.clear()
         msg = vehicle.message_factory.set_position_target_local_ned_encode(
             0,
             0,
             0,
+            MAV_FRAME_BODY_NED,  # Hızlar aracın burnuna göre (x: ileri, y: sağ)
             0b0000111111000111,  # Sadece hız bileşenleri aktif
             0,
             0,
@@ -85,11 +304,75 @@ class RealDroneController:
             0,
             0,
         )
-        for _ in range(int(duration * 10)):
-            vehicle.send_mavlink(msg)
-            time.sleep(0.1)
+        self._send_mavlink(vehicle, msg)
+
+    def _send_mavlink(self, vehicle, msg):
+        vehicle.send_mavlink(msg)
+        self._count_mavlink(msg.get_type())
+
+    def _count_mavlink(self, name, count=1):
+        # DroneKit setter'larının (mod, arm, kalkış, görev) gönderdiği
+        # mesajlar da türüne göre burada sayılır.
+        self.mavlink_sent[name] = self.mavlink_sent.get(name, 0) + count
+
+    def _set_mode(self, vehicle, name):
+        vehicle.mode = self.backend.mode(name)
+        self._count_mavlink("SET_MODE")
+
+    def executor_stats(self):
+        """Paylaşılan bağlantı executor'ının kuyruk derinliği ve thread sayısı."""
+        stats = getattr(self._executor, "stats", None)
+        return stats() if stats is not None else None
+
+    def load_geofence(self, geojson, cell_size=100.0):
+        self.geofence = Geofence.from_geojson(geojson, cell_size=cell_size)
+        self.log(f"Geofence yüklendi: {len(self.geofence)} bölge.")
+        return self.geofence.summary()
+
+    def clear_geofence(self):
+        self.geofence = None
+
+    def geofence_status(self):
+        breach = self.last_fence_breach
+        return {
+            "fence": self.geofence.summary() if self.geofence is not None else None,
+            "lookahead": self.fence_lookahead,
+            "breaches": self.fence_breaches,
+            "last_breach": breach._asdict() if breach is not None else None,
+        }
+
+    def _predict_breach(self, velocity_x, velocity_y, velocity_z, horizon, path=False):
+        """
+        Gövde eksenli hızla horizon saniye sonra varılacak konumu çite karşı
+        denetler; path=True ise aradaki doğru da örneklenir. İhlal yoksa None.
+        """
+        fence = self.geofence
+        if fence is None or not (velocity_x or velocity_y or velocity_z):
+            return None
+        snapshot = self.telemetry.snapshot()
+        gps = snapshot.gps
+        if gps is None or gps.lat is None or gps.alt is None:
+            return None
+        yaw = snapshot.attitude.yaw if snapshot.attitude is not None else 0.0
+        cos_yaw, sin_yaw = math.cos(yaw), math.sin(yaw)
+        north = (velocity_x * cos_yaw - velocity_y * sin_yaw) * horizon
+        east = (velocity_x * sin_yaw + velocity_y * cos_yaw) * horizon
+        lat, lon = fence.offset(gps.lat, gps.lon, north, east)
+        alt = gps.alt - velocity_z * horizon
+        if path:
+            breach = fence.check_path(((gps.lat, gps.lon, gps.alt), (lat, lon, alt)))
+        else:
+            breach = fence.check(lat, lon, alt)
+        if breach is not None:
+            self.last_fence_breach = breach
+        return breach
+
+    def _on_fence_breach(self, breach):
+        self.fence_breaches += 1
+        zone = breach.zone if breach.zone is not None else "izin verilen alan dışı"
         self.log(
-            f"{duration} saniye boyunca (x:{velocity_x}, y:{velocity_y}, z:{velocity_z}) hızı gönderildi."
+            f"Geofence ihlali ({breach.kind}: {zone}) "
+            f"{breach.lat:.6f}, {breach.lon:.6f}, {breach.alt:.1f} m; hareket reddedildi."
         )
 
     async def move_3d(
@@ -102,51 +385,201 @@ class RealDroneController:
         self.log(
             f"3 boyutlu hareket: x:{velocity_x}, y:{velocity_y}, z:{velocity_z} için {duration} saniye."
         )
-        await self.send_ned_velocity(velocity_x, velocity_y, velocity_z, duration)
-
-    async def turn_by_angle(self, angle):
-        await asyncio.get_event_loop().run_in_executor(
-            None, self._turn_by_angle_blocking, angle
-        )
+        self._record_command("move_3d", velocity_x, velocity_y, velocity_z, duration)
+        return await self.send_ned_velocity(velocity_x, velocity_y, velocity_z, duration)
 
-    def _turn_by_angle_blocking(self, angle):
+    async def turn_by_angle(self, angle, timeout=30, tolerance=3.0):
         vehicle = self.vehicle
+        if vehicle is None or not self.connected:
+            self.log("Drone bağlı değil.")
+            return False
+        self._record_command("turn_by_angle", angle)
+        target_heading = ((vehicle.heading or 0) + angle) % 360
         self.log(f"{angle:.2f} derece dönme komutu gönderiliyor...")
         msg = vehicle.message_factory.command_long_encode(
-            0, 0, 115, 0, angle, 0, 1, 1, 0, 0, 0  # MAV_CMD_CONDITION_YAW
+            0, 0, MAV_CMD_CONDITION_YAW, 0, angle, 0, 1, 1, 0, 0, 0
         )
-        vehicle.send_mavlink(msg)
-        time.sleep(3)
+
+        def heading_reached(v, name, value):
+            if self._is_rejected(name, value, MAV_CMD_CONDITION_YAW):
+                return True
+            error = abs((v.heading - target_heading + 180) % 360 - 180)
+            return error <= tolerance
+
+        # Bekleyen, komut gönderilmeden önce kaydedilir ki ACK kaçırılmasın.
+        future = self.conditions.wait_for(
+            heading_reached, ("heading", "COMMAND_ACK")
+        )
+        self._send_mavlink(vehicle, msg)
+        event = await self._await_event(
+            future, timeout, f"{angle:.2f} derece dönüş tamamlanmadı"
+        )
+        if event is None:
+            return False
+        if event.name == "COMMAND_ACK":
+            self.log(f"Dönüş komutu reddedildi (sonuç: {event.value.result}).")
+            return False
         self.log(f"{angle:.2f} derece dönüş tamamlandı.")
+        return True
 
     async def stop(self):
         self.log("Drone durduruluyor...")
-        await self.send_ned_velocity(0, 0, 0)
+        self._record_command("stop")
+        self._leave_auto()
+        return await self.send_ned_velocity(0, 0, 0)
+
+    def _leave_auto(self):
+        # AUTO modda otopilot hız setpoint'lerini yok sayar; görev GUIDED'a
+        # geçilerek bırakılır ve araç bulunduğu yerde tutulur.
+        vehicle = self.vehicle
+        if vehicle is not None and vehicle.mode is not None and vehicle.mode.name == "AUTO":
+            self._set_mode(vehicle, "GUIDED")
+            self.log("Görev durduruldu, GUIDED moda geçildi.")
 
-    async def land(self):
+    async def land(self, timeout=120):
         if not self.connected:
             self.log("Drone bağlı değil.")
-            return
-        await asyncio.get_event_loop().run_in_executor(None, self._land_blocking)
-
-    def _land_blocking(self):
+            return False
         vehicle = self.vehicle
+        self._record_command("land")
         self.log("İniş komutu gönderiliyor...")
-        vehicle.mode = VehicleMode("LAND")
-        time.sleep(10)
+        self._set_mode(vehicle, "LAND")
+        # Yere temas EXTENDED_SYS_STATE ile bildirilir; bu mesajı yayınlamayan
+        # otopilotlarda inişten sonraki otomatik disarm yeterli kabul edilir.
+        landed = await self._wait_until(
+            lambda v, name, value: (
+                value.landed_state == MAV_LANDED_STATE_ON_GROUND
+                if name == "EXTENDED_SYS_STATE"
+                else not v.armed
+            ),
+            ("EXTENDED_SYS_STATE", "armed"),
+            timeout,
+            "iniş tamamlanmadı",
+        )
+        if landed is None:
+            return False
         self.log("Drone indi.")
+        return True
 
     async def disconnect(self):
-        await asyncio.get_event_loop().run_in_executor(None, self._disconnect_blocking)
-
-    def _disconnect_blocking(self):
-        if self.vehicle:
+        if self.link.running or self.vehicle:
             self.log("Drone bağlantısı kesiliyor...")
-            self.vehicle.close()
-            self.connected = False
+            self._record_command("disconnect")
+            await self.link.stop()
             self.log("Drone bağlantısı kesildi.")
+        await self._close_recorder()
 
     async def move_distance(self, distance):
         self.log(f"Drone {distance:.2f} metre ileri hareket edecek.")
+        self._record_command("move_distance", distance)
         duration = abs(distance) / 1.0
-        await self.send_ned_velocity(1 if distance >= 0 else -1, 0, 0, duration)
+        return await self.send_ned_velocity(1 if distance >= 0 else -1, 0, 0, duration)
+
+    async def turn_and_move(self, angle, distance):
+        # Otonom modun dönüş + ilerleme çifti kuyrukta tek hareket komutudur;
+        # aksi halde ilerleme komutu dönüşü yarıda keserdi.
+        if not await self.turn_by_angle(angle):
+            return False
+        return await self.move_distance(distance)
+
+    async def upload_mission(self, waypoints, takeoff_alt=None, finish=None, timeout=30):
+        """
+        Waypoint'leri tek bir görev olarak otopilota yükler. Görev, her nokta
+        için ayrı komut gönderip beklemek yerine AUTO modda otopilotun kendisi
+        tarafından yürütülür.
+        """
+        if not self.connected:
+            self.log("Drone bağlı değil.")
+            return False
+        items = compile_mission(waypoints, takeoff_alt=takeoff_alt, finish=finish)
+        if self.geofence is not None:
+            route = [(w.x, w.y, w.z) for w in items if w.x or w.y]
+            gps = self.telemetry.snapshot().gps
+            if gps is not None and gps.lat is not None:
+                route.insert(0, (gps.lat, gps.lon, items[0].z))
+            breach = self.geofence.check_path(route)
+            if breach is not None:
+                self.last_fence_breach = breach
+                self._on_fence_breach(breach)
+                return False
+        vehicle = self.vehicle
+        self._record_command("upload_mission", len(items))
+        self.log(f"{len(items)} öğelik görev yükleniyor...")
+        self._count_mavlink("MISSION_COUNT")
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.backend.upload_mission, vehicle, items, timeout
+            )
+        except Exception as e:
+            self.log(f"Görev yüklenemedi: {e}")
+            return False
+        # Otopilotun istediği her öğe bir kez gönderilir (yeniden istekler hariç).
+        self._count_mavlink("MISSION_ITEM", len(items))
+        self.mission.loaded(items)
+        self.log("Görev yüklendi.")
+        return True
+
+    async def start_mission(self, wait=True, timeout=600):
+        """
+        Yüklü görevi AUTO modda başlatır. Araç yerdeyse önce görevin kalkış
+        irtifasına çıkılır. wait=True ise son öğeye ulaşılana kadar beklenir.
+        """
+        if not self.connected:
+            self.log("Drone bağlı değil.")
+            return False
+        if not self.mission.items:
+            self.log("Yüklü görev yok.")
+            return False
+        vehicle = self.vehicle
+        if not vehicle.armed:
+            if not await self.arm_and_takeoff(self.mission.items[0].z):
+                return False
+        self._record_command("start_mission", self.mission.last_seq)
+        last_seq = self.mission.last_seq
+        # Bekleyen, mod değiştirilmeden önce kaydedilir ki son öğe kaçırılmasın.
+        future = self.conditions.wait_for(
+            lambda v, name, value: name == "MISSION_ITEM_REACHED" and value.seq >= last_seq,
+            ("MISSION_ITEM_REACHED",),
+        )
+        self.setpoints.clear()
+        vehicle.commands.next = 1
+        self._count_mavlink("MISSION_SET_CURRENT")
+        self._set_mode(vehicle, "AUTO")
+        self.mission.started()
+        self.log("Görev AUTO modda başlatıldı.")
+        if not wait:
+            future.cancel()
+            return True
+        try:
+            event = await self._await_event(future, timeout, "görev tamamlanmadı")
+        except asyncio.CancelledError:
+            # Komut kuyruğunda durdurma, iniş ya da iptal görevi keser.
+            self._leave_auto()
+            raise
+        if event is None:
+            return False
+        self.log("Görev tamamlandı.")
+        return True
+
+    async def fly_legs(self, legs, altitude=None, wait=True):
+        """
+        (dönüş açısı, mesafe) adımlarını bulunulan konum ve yönden itibaren
+        waypoint'lere çevirip tek görev olarak uçar. altitude verilmezse
+        bulunulan irtifada uçulur; araç yerdeyse komut reddedilir.
+        """
+        snapshot = self.telemetry.snapshot()
+        if not self.connected or snapshot.gps is None:
+            self.log("Drone bağlı değil.")
+            return False
+        if altitude is None:
+            altitude = snapshot.gps.alt
+            if altitude is None or altitude < MIN_LEG_ALTITUDE:
+                self.log("Drone havada değil; rota için irtifa verilmeli.")
+                return False
+        self._record_command("fly_legs", len(legs), altitude)
+        waypoints = route_from_legs(
+            snapshot.gps.lat, snapshot.gps.lon, self.vehicle.heading or 0, legs, altitude
+        )
+        if not await self.upload_mission(waypoints, takeoff_alt=altitude):
+            return False
+        return await self.start_mission(wait=wait)
@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    İşlerini sayan ThreadPoolExecutor. Sayaçlar submit() sarmalayıcısında,
+    işin başında/sonunda ve açılan her thread'in initializer'ında tutulur;
+    stats() executor'ın iç kuyruğuna veya thread listesine erişmez.
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix="", initializer=None, initargs=()):
+        self._counts_lock = threading.Lock()
+        self._thread_initializer = initializer
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.threads = 0
+        super().__init__(max_workers, thread_name_prefix, self._on_thread_start, initargs)
+
+    def _on_thread_start(self, *args):
+        with self._counts_lock:
+            self.threads += 1
+        if self._thread_initializer is not None:
+            self._thread_initializer(*args)
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._counts_lock:
+            self.submitted += 1
+        try:
+            future = super().submit(self._run, fn, args, kwargs)
+        except BaseException:
+            with self._counts_lock:
+                self.submitted -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn, args, kwargs):
+        with self._counts_lock:
+            self.started += 1
+        return fn(*args, **kwargs)
+
+    def _on_done(self, future):
+        # İptal yalnızca henüz başlamamış işte başarılı olur.
+        with self._counts_lock:
+            if future.cancelled():
+                self.cancelled += 1
+            else:
+                self.completed += 1
+
+    def stats(self):
+        with self._counts_lock:
+            return {
+                "queued": self.submitted - self.started - self.cancelled,
+                "running": self.started - self.completed,
+                "threads": self.threads,
+                "submitted": self.submitted,
+                "completed": self.completed,
+            }
@@ -0,0 +1,119 @@
+from .drone_controller import RealDroneController
+from .executor import CountingExecutor
+from .replay import ReplayController
+from .setpoint import SetpointStreamer
+
+
+class Fleet:
+    """
+    Birden fazla aracı tek süreçte yöneten kayıt. Her aracın kendi bağlantısı
+    ve telemetri önbelleği vardır; setpoint thread'i ve executor'lar ise tüm
+    filo için ortaktır, böylece araç sayısı arttıkça thread sayısı artmaz.
+
+    Bağlantı kurma (heartbeat beklerken 60 sn'ye kadar bloklar) ayrı bir
+    havuzda çalışır; yanıt vermeyen araçlar bağlantı kapatma ve görev
+    yükleme gibi kısa işleri bekletmez. Havuzun thread'leri ihtiyaç
+    oldukça açılır, max_connects eşzamanlı bağlantı denemesini sınırlar.
+    """
+
+    def __init__(self, setpoint_rate_hz=10, max_link_workers=4, max_connects=64):
+        self.setpoints = SetpointStreamer(rate_hz=setpoint_rate_hz)
+        self.setpoints.start()
+        self.executor = CountingExecutor(
+            max_workers=max_link_workers, thread_name_prefix="vehicle-link"
+        )
+        self.connect_executor = CountingExecutor(
+            max_workers=max_connects, thread_name_prefix="vehicle-connect"
+        )
+        self._controllers = {}
+        self.default_id = None
+        self._frozen = None
+
+    def add(self, vehicle_id, connection_string, **kwargs):
+        controller = RealDroneController(
+            connection_string,
+            setpoint_streamer=self.setpoints,
+            executor=self.executor,
+            connect_executor=self.connect_executor,
+            vehicle_id=vehicle_id,
+            **kwargs,
+        )
+        return self.register(vehicle_id, controller)
+
+    def add_replay(self, vehicle_id, log_path, speed=1.0, start_time=None):
+        controller = ReplayController(
+            log_path, speed=speed, start_time=start_time, vehicle_id=vehicle_id
+        )
+        return self.register(vehicle_id, controller)
+
+    def freeze(self, reason):
+        """
+        Araç eklemeyi ve çıkarmayı kapatır. Araç listesini başlangıçta
+        kopyalayan tüketiciler (ör. çok worker'lı API) için çağrılır;
+        sonradan yapılan değişiklik sessizce ayrışmak yerine hata verir.
+        """
+        self._frozen = reason
+
+    def _check_mutable(self):
+        if self._frozen is not None:
+            raise RuntimeError(f"Araç listesi değiştirilemez: {self._frozen}")
+
+    def register(self, vehicle_id, controller):
+        self._check_mutable()
+        if vehicle_id in self._controllers:
+            raise ValueError(f"Araç zaten kayıtlı: {vehicle_id}")
+        self._controllers[vehicle_id] = controller
+        if self.default_id is None:
+            self.default_id = vehicle_id
+        return controller
+
+    async def remove(self, vehicle_id):
+        self._check_mutable()
+        controller = self._controllers.pop(vehicle_id)
+        await controller.disconnect()
+        await controller.commands.close()
+        controller.setpoints.close()
+        if self.default_id == vehicle_id:
+            self.default_id = next(iter(self._controllers), None)
+
+    def get(self, vehicle_id=None):
+        if vehicle_id is None:
+            vehicle_id = self.default_id
+        return self._controllers.get(vehicle_id)
+
+    @property
+    def default(self):
+        return self.get()
+
+    def ids(self):
+        return list(self._controllers)
+
+    def items(self):
+        return list(self._controllers.items())
+
+    def __len__(self):
+        return len(self._controllers)
+
+    def __contains__(self, vehicle_id):
+        return vehicle_id in self._controllers
+
+    def start(self, loop=None):
+        for controller in self._controllers.values():
+            controller.start(loop)
+
+    async def disconnect(self):
+        for controller in list(self._controllers.values()):
+            await controller.disconnect()
+
+    def telemetry(self):
+        # Her araç için tek referans okuması; araç sayısıyla doğrusal, kilitsiz.
+        return {
+            vehicle_id: controller.telemetry.snapshot().to_dict()
+            for vehicle_id, controller in self._controllers.items()
+        }
+
+    def status(self):
+        return {
+            vehicle_id: controller.link.status()
+            for vehicle_id, controller in self._controllers.items()
+        }
@@ -0,0 +1,209 @@
+"""
+NumPy tabanlı, vektörleştirilmiş jeodezi yardımcıları.
+
+Tüm fonksiyonlar skaler ya da dizi girdi kabul eder ve NumPy yayınlama
+(broadcasting) kurallarıyla çalışır; bir rotanın veya telemetri geçmişinin
+tamamı tek çağrıda işlenir. Açılar derece, mesafeler metredir.
+"""
+import numpy as np
+
+# WGS-84 elipsoidi
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+# Küresel formüllerde kullanılan ortalama yarıçap
+MEAN_RADIUS = 6371008.8
+
+
+def _arrays(*values):
+    return [np.asarray(v, dtype=np.float64) for v in values]
+
+
+def haversine(lat1, lon1, lat2, lon2, radius=MEAN_RADIUS):
+    """Küre üzerindeki büyük daire mesafesi."""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in _arrays(lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def vincenty(lat1, lon1, lat2, lon2, tolerance=1e-12, max_iterations=200):
+    """
+    WGS-84 elipsoidi üzerinde Vincenty ters çözümü (milimetre altı doğruluk).
+    Yakınsamayan (neredeyse antipodal) noktalar için NaN döner. Yineleme tüm
+    dizi üzerinde yürür; yakınsayan elemanlar maskelenir.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in _arrays(lat1, lon1, lat2, lon2))
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(lat1, lon1, lat2, lon2)
+    f, a, b = WGS84_F, WGS84_A, WGS84_B
+    L = lon2 - lon1
+    U1 = np.arctan((1 - f) * np.tan(lat1))
+    U2 = np.arctan((1 - f) * np.tan(lat2))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    active = np.ones(lam.shape, dtype=bool)
+    sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sigma_m = np.zeros(lam.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Ekvator üzerindeki doğrularda cos2_alpha sıfırdır.
+            cos_2sigma_m = np.where(
+                cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha
+            )
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            new_lam = L + (1 - C) * f * sin_alpha * (
+                sigma
+                + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+            )
+            active = np.abs(new_lam - lam) > tolerance
+            lam = np.where(active, new_lam, lam)
+            if not active.any():
+                break
+
+        u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (
+            cos_2sigma_m
+            + B / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        distance = b * A * (sigma - delta_sigma)
+    return np.where(active, np.nan, distance)
+
+
+def bearing(lat1, lon1, lat2, lon2):
+    """Başlangıç noktasından hedefe ilk pusula yönü (0-360, kuzeyden saat yönünde)."""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in _arrays(lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def destination(lat, lon, bearing_deg, distance, radius=MEAN_RADIUS):
+    """Verilen yön ve mesafede varılan nokta (küresel model); (lat, lon) döner."""
+    lat, lon, theta, distance = _arrays(lat, lon, bearing_deg, distance)
+    lat, lon, theta = np.radians(lat), np.radians(lon), np.radians(theta)
+    delta = distance / radius
+    lat2 = np.arcsin(
+        np.sin(lat) * np.cos(delta) + np.cos(lat) * np.sin(delta) * np.cos(theta)
+    )
+    lon2 = lon + np.arctan2(
+        np.sin(theta) * np.sin(delta) * np.cos(lat),
+        np.cos(delta) - np.sin(lat) * np.sin(lat2),
+    )
+    return np.degrees(lat2), (np.degrees(lon2) + 540.0) % 360.0 - 180.0
+
+
+def segment_lengths(lat, lon, method="haversine"):
+    """Ardışık noktalar arasındaki mesafeler (n nokta için n-1 eleman)."""
+    lat, lon = _arrays(lat, lon)
+    if method == "haversine":
+        distance = haversine
+    elif method == "vincenty":
+        distance = vincenty
+    else:
+        raise ValueError(f"Bilinmeyen yöntem: {method}")
+    return distance(lat[..., :-1], lon[..., :-1], lat[..., 1:], lon[..., 1:])
+
+
+def path_length(lat, lon, method="haversine"):
+    """Bir rotanın toplam uzunluğu."""
+    return float(np.nansum(segment_lengths(lat, lon, method)))
+
+
+def geodetic_to_ecef(lat, lon, alt):
+    lat, lon, alt = _arrays(lat, lon, alt)
+    lat, lon = np.radians(lat), np.radians(lon)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    x = (n + alt) * cos_lat * np.cos(lon)
+    y = (n + alt) * cos_lat * np.sin(lon)
+    z = (n * (1 - WGS84_E2) + alt) * sin_lat
+    return x, y, z
+
+
+def ecef_to_geodetic(x, y, z, iterations=4):
+    """Kuzey/güney kutupları dışında birkaç yinelemede milimetre altına yakınsar."""
+    x, y, z = _arrays(x, y, z)
+    lon = np.arctan2(y, x)
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - WGS84_E2))
+    for _ in range(iterations):
+        n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+        alt = p / np.cos(lat) - n
+        lat = np.arctan2(z, p * (1 - WGS84_E2 * n / (n + alt)))
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+    alt = p / np.cos(lat) - n
+    return np.degrees(lat), np.degrees(lon), alt
+
+
+def _ned_basis(lat0, lon0):
+    lat0, lon0 = np.radians(lat0), np.radians(lon0)
+    sin_lat, cos_lat = np.sin(lat0), np.cos(lat0)
+    sin_lon, cos_lon = np.sin(lon0), np.cos(lon0)
+    north = np.array([-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat])
+    east = np.array([-sin_lon, cos_lon, 0.0])
+    down = np.array([-cos_lat * cos_lon, -cos_lat * sin_lon, -sin_lat])
+    return north, east, down
+
+
+def ned_to_geodetic(north, east, down, lat0, lon0, alt0=0.0):
+    """
+    (lat0, lon0, alt0) referanslı yerel NED ofsetlerini enlem, boylam ve
+    irtifaya çevirir (WGS-84, ECEF üzerinden tam dönüşüm).
+    """
+    north, east, down = _arrays(north, east, down)
+    x0, y0, z0 = geodetic_to_ecef(lat0, lon0, alt0)
+    n_axis, e_axis, d_axis = _ned_basis(float(lat0), float(lon0))
+    x = x0 + north * n_axis[0] + east * e_axis[0] + down * d_axis[0]
+    y = y0 + north * n_axis[1] + east * e_axis[1] + down * d_axis[1]
+    z = z0 + north * n_axis[2] + east * e_axis[2] + down * d_axis[2]
+    return ecef_to_geodetic(x, y, z)
+
+
+def geodetic_to_ned(lat, lon, alt, lat0, lon0, alt0=0.0):
+    """ned_to_geodetic'in tersi; (north, east, down) döner."""
+    x, y, z = geodetic_to_ecef(lat, lon, alt)
+    x0, y0, z0 = geodetic_to_ecef(lat0, lon0, alt0)
+    dx, dy, dz = x - x0, y - y0, z - z0
+    n_axis, e_axis, d_axis = _ned_basis(float(lat0), float(lon0))
+    return (
+        dx * n_axis[0] + dy * n_axis[1] + dz * n_axis[2],
+        dx * e_axis[0] + dy * e_axis[1] + dz * e_axis[2],
+        dx * d_axis[0] + dy * d_axis[1] + dz * d_axis[2],
+    )
+
+
+def body_to_ned(forward, right, heading):
+    """Gövde eksenli (ileri, sağ) vektörleri verilen yönle kuzey/doğuya döndürür."""
+    forward, right, heading = _arrays(forward, right, heading)
+    yaw = np.radians(heading)
+    cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+    return forward * cos_yaw - right * sin_yaw, forward * sin_yaw + right * cos_yaw
+
+
+def metres_per_degree(lat):
+    """
+    Verilen enlemde bir derecelik enlem ve boylam farkının metre karşılığı
+    (WGS-84 eğrilik yarıçaplarıyla). Birkaç km'lik bölgelerde yerel düzlem
+    izdüşümü için yeterlidir.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    w = 1 - WGS84_E2 * np.sin(lat) ** 2
+    meridian = WGS84_A * (1 - WGS84_E2) / w ** 1.5
+    normal = WGS84_A / np.sqrt(w)
+    return np.radians(1.0) * meridian, np.radians(1.0) * normal * np.cos(lat)
@@ -0,0 +1,380 @@
+import json
+import math
+from collections import namedtuple
+
+from .geodesy import metres_per_degree
+
+INCLUSION = "inclusion"
+EXCLUSION = "exclusion"
+
+FenceBreach = namedtuple("FenceBreach", ["zone", "kind", "lat", "lon", "alt"])
+
+
+def _point_in_ring(x, y, edges):
+    # Işın atma: (x, y)'den +x yönündeki ışının kestiği kenar sayısı.
+    inside = False
+    for x1, y1, x2, y2 in edges:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def _edge_hit(x1, y1, dx, dy, edge):
+    # Doğru parçasının (x1, y1) + t (dx, dy), 0 <= t <= 1, kenarı kestiği t.
+    ex1, ey1, ex2, ey2 = edge
+    ex = ex2 - ex1
+    ey = ey2 - ey1
+    denom = dx * ey - dy * ex
+    if denom == 0:
+        # Paralel kenar; değdiği durumda komşu kenarlar kesişimi yakalar.
+        return None
+    t = ((ex1 - x1) * ey - (ey1 - y1) * ex) / denom
+    u = ((ex1 - x1) * dy - (ey1 - y1) * dx) / denom
+    if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0:
+        return t
+    return None
+
+
+def _bbox_overlaps(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _ring_edges(points):
+    if points[0] == points[-1]:
+        points = points[:-1]
+    return tuple(
+        (x1, y1, x2, y2)
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])
+    )
+
+
+class PolygonZone:
+    """Yerel düzlemde (doğu, kuzey metre) dış halka ve isteğe bağlı delikler."""
+
+    __slots__ = ("name", "kind", "min_alt", "max_alt", "bbox", "_outer", "_holes")
+
+    def __init__(self, name, kind, outer, holes=(), min_alt=-math.inf, max_alt=math.inf):
+        if len(outer) < 3:
+            raise ValueError(f"Geçersiz poligon: {name}")
+        self.name = name
+        self.kind = kind
+        self.min_alt = min_alt
+        self.max_alt = max_alt
+        xs = [x for x, _ in outer]
+        ys = [y for _, y in outer]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self._outer = _ring_edges(list(outer))
+        self._holes = tuple(_ring_edges(list(hole)) for hole in holes)
+
+    def contains(self, x, y, alt):
+        if not self.min_alt <= alt <= self.max_alt:
+            return False
+        return self._contains_xy(x, y)
+
+    def _contains_xy(self, x, y):
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        if not _point_in_ring(x, y, self._outer):
+            return False
+        return not any(_point_in_ring(x, y, hole) for hole in self._holes)
+
+    def segment_hit(self, x1, y1, x2, y2):
+        """
+        Doğru parçasının bölgeye girdiği ilk t (0..1), girmiyorsa None.
+        Kenarlarla kesişim aranır; kesişim yoksa parça tek bir yüzdedir ve
+        başlangıç noktasının konumu sonucu belirler. İrtifaya bakılmaz.
+        """
+        if self._contains_xy(x1, y1):
+            return 0.0
+        dx = x2 - x1
+        dy = y2 - y1
+        hits = [
+            t
+            for ring in (self._outer,) + self._holes
+            for t in (_edge_hit(x1, y1, dx, dy, edge) for edge in ring)
+            if t is not None
+        ]
+        return min(hits) if hits else None
+
+
+class CylinderZone:
+    __slots__ = ("name", "kind", "min_alt", "max_alt", "bbox", "_x", "_y", "_r2")
+
+    def __init__(self, name, kind, center, radius, min_alt=-math.inf, max_alt=math.inf):
+        if radius <= 0:
+            raise ValueError(f"Geçersiz silindir yarıçapı: {name}")
+        self.name = name
+        self.kind = kind
+        self.min_alt = min_alt
+        self.max_alt = max_alt
+        self._x, self._y = center
+        self._r2 = radius * radius
+        self.bbox = (self._x - radius, self._y - radius, self._x + radius, self._y + radius)
+
+    def contains(self, x, y, alt):
+        if not self.min_alt <= alt <= self.max_alt:
+            return False
+        dx = x - self._x
+        dy = y - self._y
+        return dx * dx + dy * dy <= self._r2
+
+    def segment_hit(self, x1, y1, x2, y2):
+        """Doğru parçasının daireye girdiği ilk t (0..1), girmiyorsa None."""
+        fx = x1 - self._x
+        fy = y1 - self._y
+        c = fx * fx + fy * fy - self._r2
+        if c <= 0:
+            return 0.0
+        dx = x2 - x1
+        dy = y2 - y1
+        a = dx * dx + dy * dy
+        b = 2 * (fx * dx + fy * dy)
+        disc = b * b - 4 * a * c
+        if a == 0 or disc < 0:
+            return None
+        t = (-b - math.sqrt(disc)) / (2 * a)
+        return t if 0.0 <= t <= 1.0 else None
+
+
+class Geofence:
+    """
+    İzin verilen (inclusion) ve yasak (exclusion) bölgeler. Bölgeler yükleme
+    sırasında bir referans noktası etrafında yerel düzleme (metre) çevrilir ve
+    düzenli bir ızgaraya indekslenir. Bir nokta sorgusu yalnızca düştüğü
+    hücredeki bölgelere bakar; binlerce bölgede de mikro saniyeler sürer.
+
+    İnclusion bölgesi tanımlıysa nokta en az birinin içinde olmalıdır;
+    hiçbir exclusion bölgesinin içinde olmamalıdır.
+    """
+
+    # Bu kadar hücreyi kaplayan bölgeler ızgaraya değil her sorguda
+    # denetlenen listeye konur (ör. tüm sahayı saran inclusion bölgesi).
+    MAX_CELLS_PER_ZONE = 4096
+
+    def __init__(self, zones_lonlat=(), origin=None, cell_size=100.0):
+        """
+        zones_lonlat: (name, kind, geometry, min_alt, max_alt) demetleri;
+        geometry ("polygon", [halkalar]) ya da ("cylinder", (lon, lat), r).
+        """
+        zones_lonlat = list(zones_lonlat)
+        if origin is None:
+            origin = self._first_point(zones_lonlat) or (0.0, 0.0)
+        self.origin = origin
+        self.cell_size = float(cell_size)
+        north_scale, east_scale = metres_per_degree(origin[1])
+        self._north_scale = float(north_scale)
+        self._east_scale = float(east_scale)
+        self.zones = [self._build_zone(*zone) for zone in zones_lonlat]
+        self._grid = {}
+        self._always = []
+        self.has_inclusion = any(zone.kind == INCLUSION for zone in self.zones)
+        self._exclusions = [zone for zone in self.zones if zone.kind == EXCLUSION]
+        for zone in self.zones:
+            self._index(zone)
+
+    @staticmethod
+    def _first_point(zones):
+        for _, _, geometry, _, _ in zones:
+            if geometry[0] == "polygon":
+                return tuple(geometry[1][0][0])
+            return tuple(geometry[1])
+        return None
+
+    def _local(self, lon, lat):
+        return (
+            (lon - self.origin[0]) * self._east_scale,
+            (lat - self.origin[1]) * self._north_scale,
+        )
+
+    def _build_zone(self, name, kind, geometry, min_alt, max_alt):
+        if kind not in (INCLUSION, EXCLUSION):
+            raise ValueError(f"Bilinmeyen bölge türü: {kind}")
+        min_alt = -math.inf if min_alt is None else float(min_alt)
+        max_alt = math.inf if max_alt is None else float(max_alt)
+        if geometry[0] == "polygon":
+            rings = [[self._local(lon, lat) for lon, lat, *_ in ring] for ring in geometry[1]]
+            return PolygonZone(name, kind, rings[0], rings[1:], min_alt, max_alt)
+        if geometry[0] == "cylinder":
+            lon, lat = geometry[1][:2]
+            return CylinderZone(
+                name, kind, self._local(lon, lat), float(geometry[2]), min_alt, max_alt
+            )
+        raise ValueError(f"Bilinmeyen geometri: {geometry[0]}")
+
+    def _cell(self, value):
+        return int(math.floor(value / self.cell_size))
+
+    def _index(self, zone):
+        min_x, min_y, max_x, max_y = zone.bbox
+        cx0, cx1 = self._cell(min_x), self._cell(max_x)
+        cy0, cy1 = self._cell(min_y), self._cell(max_y)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.MAX_CELLS_PER_ZONE:
+            self._always.append(zone)
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._grid.setdefault((cx, cy), []).append(zone)
+
+    @classmethod
+    def from_geojson(cls, data, origin=None, cell_size=100.0):
+        """
+        GeoJSON FeatureCollection (dict, JSON metni ya da dosya yolu) yükler.
+        Polygon/MultiPolygon poligon, Point + "radius" özelliği silindir
+        bölgesidir. Özellikler: "fence" ("inclusion"/"exclusion", varsayılan
+        exclusion), "min_alt", "max_alt" (göreli irtifa, m), "name".
+        """
+        if isinstance(data, str):
+            if data.lstrip().startswith("{"):
+                data = json.loads(data)
+            else:
+                with open(data) as f:
+                    data = json.load(f)
+        if data.get("type") == "FeatureCollection":
+            features = data.get("features", [])
+        elif data.get("type") == "Feature":
+            features = [data]
+        else:
+            raise ValueError("GeoJSON Feature veya FeatureCollection bekleniyor")
+        zones = []
+        for i, feature in enumerate(features):
+            properties = feature.get("properties") or {}
+            geometry = feature.get("geometry") or {}
+            name = properties.get("name", str(feature.get("id", i)))
+            kind = properties.get("fence", EXCLUSION)
+            bounds = (properties.get("min_alt"), properties.get("max_alt"))
+            geometry_type = geometry.get("type")
+            if geometry_type == "Polygon":
+                zones.append((name, kind, ("polygon", geometry["coordinates"])) + bounds)
+            elif geometry_type == "MultiPolygon":
+                for polygon in geometry["coordinates"]:
+                    zones.append((name, kind, ("polygon", polygon)) + bounds)
+            elif geometry_type == "Point":
+                if "radius" not in properties:
+                    raise ValueError(f"Silindir bölgesi için radius gerekli: {name}")
+                zones.append(
+                    (name, kind, ("cylinder", geometry["coordinates"], properties["radius"]))
+                    + bounds
+                )
+            else:
+                raise ValueError(f"Desteklenmeyen geometri: {geometry_type}")
+        return cls(zones, origin=origin, cell_size=cell_size)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def check(self, lat, lon, alt):
+        """Nokta çitin dışındaysa FenceBreach, içindeyse None döner."""
+        x = (lon - self.origin[0]) * self._east_scale
+        y = (lat - self.origin[1]) * self._north_scale
+        candidates = self._grid.get((self._cell(x), self._cell(y)), ())
+        included = not self.has_inclusion
+        for zones in (candidates, self._always):
+            for zone in zones:
+                if zone.kind == EXCLUSION:
+                    if zone.contains(x, y, alt):
+                        return FenceBreach(zone.name, EXCLUSION, lat, lon, alt)
+                elif not included and zone.contains(x, y, alt):
+                    included = True
+        if not included:
+            return FenceBreach(None, INCLUSION, lat, lon, alt)
+        return None
+
+    def contains(self, lat, lon, alt):
+        return self.check(lat, lon, alt) is None
+
+    def offset(self, lat, lon, north, east):
+        """Yerel düzlemde (north, east) metre ötelenmiş noktanın (lat, lon)'u."""
+        return lat + north / self._north_scale, lon + east / self._east_scale
+
+    def check_path(self, points, step=None):
+        """
+        Ardışık (lat, lon, alt) noktaları arasındaki doğruları denetler; ilk
+        ihlali ya da None döndürür. Exclusion bölgeleri her doğru parçası için
+        kenar kesişimiyle kesin olarak denetlenir, ne kadar dar olursa olsun
+        atlanmaz. Inclusion bölgesinden çıkış step metre aralıklı örneklerle
+        aranır.
+        """
+        step = step or self.cell_size / 4
+        points = list(points)
+        if len(points) == 1:
+            return self.check(*points[0])
+        for (lat1, lon1, alt1), (lat2, lon2, alt2) in zip(points, points[1:]):
+            x1, y1 = self._local(lon1, lat1)
+            x2, y2 = self._local(lon2, lat2)
+            hit = self._segment_exclusion(x1, y1, alt1, x2, y2, alt2)
+            limit = hit[0] if hit is not None else 1.0
+            if self.has_inclusion:
+                samples = max(1, int(math.ceil(math.hypot(x2 - x1, y2 - y1) / step)))
+                for i in range(samples + 1):
+                    t = i / samples
+                    if t > limit:
+                        break
+                    breach = self.check(
+                        lat1 + (lat2 - lat1) * t,
+                        lon1 + (lon2 - lon1) * t,
+                        alt1 + (alt2 - alt1) * t,
+                    )
+                    if breach is not None:
+                        return breach
+            if hit is not None:
+                t, zone = hit
+                return FenceBreach(
+                    zone.name,
+                    EXCLUSION,
+                    lat1 + (lat2 - lat1) * t,
+                    lon1 + (lon2 - lon1) * t,
+                    alt1 + (alt2 - alt1) * t,
+                )
+        return None
+
+    def _segment_exclusion(self, x1, y1, alt1, x2, y2, alt2):
+        # Parçanın ilk girdiği exclusion bölgesi: (t, bölge) ya da None.
+        bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        cx0, cx1 = self._cell(bbox[0]), self._cell(bbox[2])
+        cy0, cy1 = self._cell(bbox[1]), self._cell(bbox[3])
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.MAX_CELLS_PER_ZONE:
+            candidates = self._exclusions
+        else:
+            found = {id(zone): zone for zone in self._always if zone.kind == EXCLUSION}
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    for zone in self._grid.get((cx, cy), ()):
+                        if zone.kind == EXCLUSION:
+                            found[id(zone)] = zone
+            candidates = found.values()
+        best = None
+        for zone in candidates:
+            if not _bbox_overlaps(bbox, zone.bbox):
+                continue
+            # Parçanın bölgenin irtifa bandında kalan kısmı [t0, t1].
+            if alt1 == alt2:
+                if not zone.min_alt <= alt1 <= zone.max_alt:
+                    continue
+                t0, t1 = 0.0, 1.0
+            else:
+                ta = (zone.min_alt - alt1) / (alt2 - alt1)
+                tb = (zone.max_alt - alt1) / (alt2 - alt1)
+                t0, t1 = max(0.0, min(ta, tb)), min(1.0, max(ta, tb))
+                if t0 > t1:
+                    continue
+            s = zone.segment_hit(
+                x1 + (x2 - x1) * t0, y1 + (y2 - y1) * t0,
+                x1 + (x2 - x1) * t1, y1 + (y2 - y1) * t1,
+            )
+            if s is None:
+                continue
+            t = t0 + s * (t1 - t0)
+            if best is None or t < best[0]:
+                best = (t, zone)
+        return best
+
+    def summary(self):
+        return {
+            "zones": len(self.zones),
+            "inclusion": sum(zone.kind == INCLUSION for zone in self.zones),
+            "exclusion": sum(zone.kind == EXCLUSION for zone in self.zones),
+            "origin": list(self.origin),
+            "cell_size": self.cell_size,
+            "cells": len(self._grid),
+        }
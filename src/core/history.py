@@ -0,0 +1,118 @@
+import threading
+import time
+
+import numpy as np
+
+# Alan adı -> (snapshot alanı, alt alan, dtype). Konum float64, diğerleri float32.
+HISTORY_FIELDS = {
+    "lat": ("gps", "lat", np.float64),
+    "lon": ("gps", "lon", np.float64),
+    "alt": ("gps", "alt", np.float32),
+    "voltage": ("battery", "voltage", np.float32),
+    "current": ("battery", "current", np.float32),
+    "level": ("battery", "level", np.float32),
+    "roll": ("attitude", "roll", np.float32),
+    "pitch": ("attitude", "pitch", np.float32),
+    "yaw": ("attitude", "yaw", np.float32),
+}
+
+
+class TelemetryHistory:
+    """
+    Sabit kapasiteli, sütun tabanlı telemetri geçmişi. Her alan ayrı bir NumPy
+    dizisinde tutulur; kayıt eklemek örnek başına Python nesnesi üretmez.
+    Varsayılan kapasite 10 Hz'de iki saatlik veriye karşılık gelir (~3.7 MB).
+    """
+
+    def __init__(self, capacity=72000, min_interval=0.1, clock=time.time):
+        self.capacity = capacity
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._columns = {
+            name: np.full(capacity, np.nan, dtype=dtype)
+            for name, (_, _, dtype) in HISTORY_FIELDS.items()
+        }
+        self._count = 0
+        self._last_t = -np.inf
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def nbytes(self):
+        return self._t.nbytes + sum(c.nbytes for c in self._columns.values())
+
+    def record(self, snapshot):
+        now = self._clock()
+        if now - self._last_t < self.min_interval:
+            return
+        with self._lock:
+            index = self._count % self.capacity
+            self._t[index] = now
+            for name, (group, attr, _) in HISTORY_FIELDS.items():
+                value = getattr(snapshot, group)
+                value = getattr(value, attr) if value is not None else None
+                self._columns[name][index] = np.nan if value is None else value
+            self._count += 1
+            self._last_t = now
+
+    def _ordered(self, fields):
+        # Halka tamponu zaman sırasına göre kopyalar.
+        with self._lock:
+            count = self._count
+            if count <= self.capacity:
+                t = self._t[:count].copy()
+                columns = {f: self._columns[f][:count].copy() for f in fields}
+            else:
+                head = count % self.capacity
+                t = np.concatenate((self._t[head:], self._t[:head]))
+                columns = {
+                    f: np.concatenate((self._columns[f][head:], self._columns[f][:head]))
+                    for f in fields
+                }
+        return t, columns
+
+    def query(self, since=None, fields=None, max_points=500):
+        """
+        since zamanından bu yana kayıtları en fazla max_points kovaya indirger
+        ve her alan için kova başına min/max/mean serisi döndürür.
+        """
+        fields = list(fields) if fields else list(HISTORY_FIELDS)
+        unknown = [f for f in fields if f not in HISTORY_FIELDS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen telemetri alanı: {', '.join(unknown)}")
+        max_points = max(1, int(max_points))
+        t, columns = self._ordered(fields)
+        if since is not None:
+            start = np.searchsorted(t, since, side="left")
+            t = t[start:]
+            columns = {f: c[start:] for f, c in columns.items()}
+        n = len(t)
+        result = {"count": int(n), "t": [], "fields": {}}
+        if n == 0:
+            result["fields"] = {f: {"min": [], "max": [], "mean": []} for f in fields}
+            return result
+        buckets = min(n, max_points)
+        starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+        sizes = np.diff(np.append(starts, n))
+        result["t"] = (np.add.reduceat(t, starts) / sizes).tolist()
+        for name, column in columns.items():
+            column = column.astype(np.float64)
+            valid = ~np.isnan(column)
+            counts = np.add.reduceat(valid.astype(np.int64), starts)
+            sums = np.add.reduceat(np.where(valid, column, 0.0), starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = sums / counts
+            result["fields"][name] = {
+                "min": _to_list(np.fmin.reduceat(column, starts)),
+                "max": _to_list(np.fmax.reduceat(column, starts)),
+                "mean": _to_list(mean),
+            }
+        return result
+
+
+def _to_list(values):
+    # JSON NaN desteklemediği için eksik değerler None olarak döner.
+    return np.where(np.isnan(values), None, values).tolist()
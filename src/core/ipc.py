@@ -0,0 +1,341 @@
+"""
+Bağlantı sahibi süreç ile API worker'ları arasındaki yerel çağrı kanalı.
+
+Araçlarla yalnızca bağlantı sahibi süreç konuşur. Worker'lar komutları ve
+sorguları multiprocessing.connection üzerinden (Unix soketi, authkey ile)
+gönderir; telemetri ise paylaşılan bellekten okunur ve kanala hiç uğramaz.
+
+Mesajlar:
+  istek  (çağrı no, hedef, metot yolu, args, kwargs)
+  yanıt  (çağrı no, başarılı mı, değer ya da istisna)
+Hedef ("vehicle", araç kimliği), ("fleet", None) ya da ("service", ad)
+olabilir. Metot future ya da coroutine döndürürse yanıt sonuç hazır
+olunca gönderilir; bu sürede aynı bağlantıdan başka çağrılar işlenmeye
+devam eder.
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import itertools
+import threading
+from multiprocessing.connection import Client, Listener
+
+CANCEL = "__cancel__"
+DEFAULT_TIMEOUT = 5.0
+
+
+class LinkOwner:
+    """
+    Filoyu barındıran süreçte worker çağrılarını karşılar. Çağrılar filonun
+    olay döngüsünde yürütülür; böylece tek süreçli çalışmadaki ile aynı
+    thread düzeni korunur.
+    """
+
+    def __init__(self, fleet, address, authkey, loop, services=None, log=print):
+        self.fleet = fleet
+        self.services = dict(services or {})
+        self.loop = loop
+        self.log = log
+        self._listener = Listener(address, family="AF_UNIX", authkey=authkey)
+        self.address = self._listener.address
+        self._connections = []
+        self._closed = False
+        self.calls = 0
+        self.errors = 0
+        threading.Thread(target=self._accept, name="link-owner", daemon=True).start()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            except Exception as e:
+                self.log(f"Worker bağlantısı reddedildi: {e}")
+                continue
+            self._connections.append(conn)
+            threading.Thread(
+                target=self._serve, args=(conn,), name="link-owner-conn", daemon=True
+            ).start()
+
+    def _serve(self, conn):
+        send_lock = threading.Lock()
+        pending = {}
+
+        def reply(call_id, ok, value):
+            try:
+                with send_lock:
+                    conn.send((call_id, ok, value))
+            except Exception as e:
+                if ok:
+                    # Sonuç gönderilemiyorsa (ör. pickle edilemiyor) hata döner.
+                    reply(call_id, False, RuntimeError(str(e)))
+
+        while True:
+            try:
+                call_id, target, method, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                break
+            self.calls += 1
+            asyncio.run_coroutine_threadsafe(
+                self._invoke(reply, pending, call_id, target, method, args, kwargs),
+                self.loop,
+            )
+        conn.close()
+
+    def _resolve(self, target, method):
+        kind, key = target
+        if kind == "vehicle":
+            obj = self.fleet.get(key)
+            if obj is None:
+                raise KeyError(f"Bilinmeyen araç: {key}")
+        elif kind == "fleet":
+            obj = self.fleet
+        elif kind == "service":
+            obj = self.services[key]
+        else:
+            raise ValueError(f"Geçersiz hedef: {kind}")
+        for part in method.split("."):
+            if part.startswith("_"):
+                raise AttributeError(f"Erişilemez öznitelik: {part}")
+            obj = getattr(obj, part)
+        return obj
+
+    async def _invoke(self, reply, pending, call_id, target, method, args, kwargs):
+        try:
+            if method == CANCEL:
+                reply(call_id, True, self._cancel(pending, target, args[0]))
+                return
+            result = self._resolve(target, method)(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = asyncio.ensure_future(result)
+            if isinstance(result, (asyncio.Future, concurrent.futures.Future)):
+                pending[call_id] = result
+                try:
+                    if isinstance(result, concurrent.futures.Future):
+                        result = await _wait_concurrent(result)
+                    else:
+                        result = await result
+                finally:
+                    pending.pop(call_id, None)
+        except BaseException as e:
+            self.errors += 1
+            if isinstance(e, asyncio.CancelledError):
+                e = concurrent.futures.CancelledError()
+            reply(call_id, False, e)
+            return
+        reply(call_id, True, result)
+
+    def _cancel(self, pending, target, call_id):
+        future = pending.get(call_id)
+        if future is None:
+            return False
+        if target[0] == "vehicle" and isinstance(future, concurrent.futures.Future):
+            # Komut kuyruğundaki işler kontrolcü üzerinden iptal edilir;
+            # çalışan manevrada araç sıfır hıza alınır.
+            return self.fleet.get(target[1]).cancel(future)
+        return future.cancel()
+
+    def stats(self):
+        return {"workers": len(self._connections), "calls": self.calls, "errors": self.errors}
+
+    def close(self):
+        self._closed = True
+        self._listener.close()
+        for conn in self._connections:
+            conn.close()
+
+
+async def _wait_concurrent(future):
+    # asyncio.wrap_future kullanılmaz: bekleyen görevin iptali komutu da iptal eder.
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+
+    def done(_):
+        loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+
+    future.add_done_callback(done)
+    await waiter
+    return future.result()
+
+
+class LinkClient:
+    """
+    Worker tarafı. call() bir concurrent.futures.Future döndürür; yanıtlar
+    ayrı bir thread'de okunup ilgili future'a aktarılır. request() yanıtı
+    bekleyen kısayoldur; olay döngüsünden çağrılmamalıdır, vekiller bunun
+    yerine awaitable döndürür.
+    """
+
+    def __init__(self, address, authkey, timeout=DEFAULT_TIMEOUT):
+        self._conn = Client(address, family="AF_UNIX", authkey=authkey)
+        self.timeout = timeout
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._calls = {}
+        threading.Thread(target=self._receive, name="link-client", daemon=True).start()
+
+    def call(self, target, method, *args, **kwargs):
+        call_id = next(self._ids)
+        future = concurrent.futures.Future()
+        self._pending[call_id] = future
+        self._calls[future] = (target, call_id)
+        future.add_done_callback(lambda f: self._calls.pop(f, None))
+        try:
+            with self._send_lock:
+                self._conn.send((call_id, target, method, args, kwargs))
+        except Exception as e:
+            self._pending.pop(call_id, None)
+            future.set_exception(ConnectionError(f"Bağlantı sahibi sürece ulaşılamıyor: {e}"))
+        return future
+
+    def request(self, target, method, *args, **kwargs):
+        return self.call(target, method, *args, **kwargs).result(self.timeout)
+
+    def cancel(self, future):
+        """call() ile başlatılmış işi bağlantı sahibi süreçte iptal eder."""
+        entry = self._calls.get(future)
+        if entry is None or future.done():
+            return False
+        target, call_id = entry
+        return self.request(target, CANCEL, call_id)
+
+    def _receive(self):
+        while True:
+            try:
+                call_id, ok, value = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(call_id, None)
+            if future is None or future.cancelled():
+                # Yerelde vazgeçilmiş bekleme (ör. kapanan SSE akışı).
+                continue
+            if ok:
+                future.set_result(value)
+            elif isinstance(value, concurrent.futures.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(value)
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Bağlantı sahibi süreç kapandı"))
+
+    def close(self):
+        self._conn.close()
+
+
+class _Remote:
+    """Öznitelik erişimlerini bağlantı sahibi süreçteki nesneye yönlendirir."""
+
+    def __init__(self, client, target, path):
+        self._client = client
+        self._target = target
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemoteMethod(self._client, self._target, f"{self._path}.{name}")
+
+
+class _RemoteMethod:
+    def __init__(self, client, target, path):
+        self._client = client
+        self._target = target
+        self._path = path
+
+    def __call__(self, *args, **kwargs):
+        # Olay döngüsünden çağrılır; yanıt beklenirken döngü bloklanmaz.
+        return asyncio.wrap_future(
+            self._client.call(self._target, self._path, *args, **kwargs)
+        )
+
+
+class RemoteController:
+    """
+    Worker'da aracın kontrolcüsü yerine geçen vekil. API'nin kullandığı
+    arayüzü sağlar: komutlar bağlantı sahibi sürece gider, telemetri
+    paylaşılan bellekten okunur. submit() dışındaki çağrılar olay
+    döngüsünde beklenecek awaitable döndürür.
+    """
+
+    def __init__(self, client, vehicle_id, telemetry):
+        self._client = client
+        self._target = ("vehicle", vehicle_id)
+        self.vehicle_id = vehicle_id
+        self.telemetry = telemetry
+        self.commands = _Remote(client, self._target, "commands")
+        self.setpoints = _Remote(client, self._target, "setpoints")
+        self.link = _Remote(client, self._target, "link")
+        self.mission = _Remote(client, self._target, "mission")
+        self.history = _Remote(client, self._target, "history")
+
+    def _call(self, method, *args, **kwargs):
+        return asyncio.wrap_future(self._client.call(self._target, method, *args, **kwargs))
+
+    def submit(self, name, *args, **kwargs):
+        return self._client.call(self._target, "submit", name, *args, **kwargs)
+
+    def cancel(self, future):
+        return self._client.cancel(future)
+
+    def start(self, loop=None):
+        # Bağlantı döngüsü bağlantı sahibi sürecin olay döngüsünde çalışır.
+        return self._call("start")
+
+    @property
+    def mavlink_sent(self):
+        return self._call("mavlink_sent.copy")
+
+    def load_geofence(self, geojson, cell_size=100.0):
+        return self._call("load_geofence", geojson, cell_size=cell_size)
+
+    def clear_geofence(self):
+        return self._call("clear_geofence")
+
+    def geofence_status(self):
+        return self._call("geofence_status")
+
+
+class RemoteFleet:
+    """Fleet'in API'nin kullandığı kısmı; araç kimlikleri başlangıçta sabitlenir."""
+
+    def __init__(self, client, vehicle_ids, telemetry, default_id=None):
+        self._client = client
+        self._controllers = {
+            vehicle_id: RemoteController(client, vehicle_id, telemetry.view(vehicle_id))
+            for vehicle_id in vehicle_ids
+        }
+        self.default_id = default_id if default_id is not None else next(iter(vehicle_ids), None)
+
+    def get(self, vehicle_id=None):
+        if vehicle_id is None:
+            vehicle_id = self.default_id
+        return self._controllers.get(vehicle_id)
+
+    @property
+    def default(self):
+        return self.get()
+
+    def ids(self):
+        return list(self._controllers)
+
+    def items(self):
+        return list(self._controllers.items())
+
+    def __len__(self):
+        return len(self._controllers)
+
+    def __contains__(self, vehicle_id):
+        return vehicle_id in self._controllers
+
+    def telemetry(self):
+        return {
+            vehicle_id: controller.telemetry.snapshot().to_dict()
+            for vehicle_id, controller in self._controllers.items()
+        }
+
+    def status(self):
+        return asyncio.wrap_future(self._client.call(("fleet", None), "status"))
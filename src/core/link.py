@@ -0,0 +1,176 @@
+import asyncio
+
+
+class LinkState:
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    READY = "ready"
+    DEGRADED = "degraded"
+    LOST = "lost"
+
+
+class VehicleLink:
+    """
+    Araç bağlantısını arka planda kuran ve izleyen asenkron bağlantı yöneticisi.
+    Bağlantı koparsa üstel geri çekilmeyle yeniden bağlanır ve her başarılı
+    bağlantıda on_ready ile listener'ların yeniden kurulmasını sağlar.
+    """
+
+    def __init__(
+        self,
+        connection_string,
+        connect_fn,
+        on_ready,
+        on_lost,
+        log=print,
+        connect_timeout=60,
+        heartbeat_degraded=2.0,
+        heartbeat_lost=5.0,
+        backoff_initial=1.0,
+        backoff_max=30.0,
+        poll_interval=0.5,
+        executor=None,
+        connect_executor=None,
+    ):
+        self.connection_string = connection_string
+        self._connect_fn = connect_fn
+        self._on_ready = on_ready
+        self._on_lost = on_lost
+        self.log = log
+        self.connect_timeout = connect_timeout
+        self.heartbeat_degraded = heartbeat_degraded
+        self.heartbeat_lost = heartbeat_lost
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self._executor = executor
+        # connect() heartbeat beklerken connect_timeout'a kadar bloklar; ayrı
+        # havuz verilirse kapatma gibi kısa işler bu beklemenin arkasında kalmaz.
+        self._connect_executor = connect_executor or executor
+        self.state = LinkState.DISCONNECTED
+        self.attempts = 0
+        self.vehicle = None
+        self._task = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self, loop=None):
+        """
+        Bağlantı döngüsünü verilen olay döngüsünde başlatır ve hemen döner.
+        Başka bir thread'den çağrılabilir; zaten çalışıyorsa bir şey yapmaz.
+        """
+        if self.running:
+            return
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._task = loop.create_task(self.run())
+        else:
+            loop.call_soon_threadsafe(self._start_on_loop, loop)
+
+    def _start_on_loop(self, loop):
+        if not self.running:
+            self._task = loop.create_task(self.run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._release()
+        self._set_state(LinkState.DISCONNECTED)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        delay = self.backoff_initial
+        while True:
+            self._set_state(LinkState.CONNECTING)
+            self.attempts += 1
+            connecting = loop.run_in_executor(self._connect_executor, self._connect)
+            try:
+                # shield: iptal bağlantı işini yarıda bırakmaz, sonucu kaybetmez.
+                vehicle = await asyncio.shield(connecting)
+            except asyncio.CancelledError:
+                # stop() bağlantı kurulurken geldi; geç gelen araç kapatılır.
+                connecting.add_done_callback(self._close_abandoned)
+                raise
+            except Exception as e:
+                self.log(f"Drone bağlantı hatası: {e}")
+                self._set_state(LinkState.LOST)
+                self.log(f"{delay:.0f} saniye sonra yeniden bağlanılacak...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.backoff_max)
+                continue
+            delay = self.backoff_initial
+            self.vehicle = vehicle
+            self._on_ready(vehicle)
+            self._set_state(LinkState.READY)
+            self.log("Drone bağlantısı başarılı.")
+            await self._monitor(vehicle)
+            self.log("Drone bağlantısı koptu, yeniden bağlanılıyor...")
+            await self._release()
+            self._set_state(LinkState.LOST)
+
+    def _connect(self):
+        return self._connect_fn(
+            self.connection_string, wait_ready=True, timeout=self.connect_timeout
+        )
+
+    async def _monitor(self, vehicle):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            silence = vehicle.last_heartbeat
+            if silence is None:
+                continue
+            if silence >= self.heartbeat_lost:
+                return
+            if silence >= self.heartbeat_degraded:
+                self._set_state(LinkState.DEGRADED)
+            else:
+                self._set_state(LinkState.READY)
+
+    def _close_abandoned(self, connecting):
+        if connecting.cancelled() or connecting.exception() is not None:
+            return
+        vehicle = connecting.result()
+        self.log("Kesilen bağlantı denemesinin aracı kapatılıyor.")
+        asyncio.get_running_loop().run_in_executor(self._executor, self._close_quietly, vehicle)
+
+    def _close_quietly(self, vehicle):
+        try:
+            vehicle.close()
+        except Exception as e:
+            self.log(f"Bağlantı kapatılırken hata: {e}")
+
+    async def _release(self):
+        vehicle, self.vehicle = self.vehicle, None
+        if vehicle is None:
+            return
+        self._on_lost(vehicle)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, vehicle.close
+            )
+        except Exception as e:
+            self.log(f"Bağlantı kapatılırken hata: {e}")
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.log(f"Bağlantı durumu: {state}")
+
+    def status(self):
+        return {
+            "state": self.state,
+            "connection_string": self.connection_string,
+            "attempts": self.attempts,
+        }
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .geodesy import destination
+
+MAV_FRAME_GLOBAL_RELATIVE_ALT = 3
+MAV_CMD_NAV_WAYPOINT = 16
+MAV_CMD_NAV_RETURN_TO_LAUNCH = 20
+MAV_CMD_NAV_LAND = 21
+MAV_CMD_NAV_TAKEOFF = 22
+
+Waypoint = namedtuple("Waypoint", ["lat", "lon", "alt"])
+
+# MAVLink MISSION_ITEM alanlarının kontrolcü tarafındaki karşılığı; arka uç
+# bunu kendi komut nesnesine (ör. dronekit.Command) çevirir.
+MissionItem = namedtuple(
+    "MissionItem",
+    ["command", "frame", "param1", "param2", "param3", "param4", "x", "y", "z"],
+)
+
+_FINISH_COMMANDS = {
+    None: None,
+    "RTL": MAV_CMD_NAV_RETURN_TO_LAUNCH,
+    "LAND": MAV_CMD_NAV_LAND,
+}
+
+
+def compile_mission(waypoints, takeoff_alt=None, acceptance_radius=2.0, finish=None):
+    """
+    Waypoint listesini yüklenecek görev öğelerine çevirir: bir kalkış öğesi,
+    her nokta için NAV_WAYPOINT ve isteğe bağlı olarak RTL ya da LAND.
+    """
+    if not waypoints:
+        raise ValueError("Görev en az bir waypoint içermeli")
+    if finish not in _FINISH_COMMANDS:
+        raise ValueError(f"Bilinmeyen görev sonu: {finish}")
+    waypoints = [Waypoint(*w) for w in waypoints]
+    if takeoff_alt is None:
+        takeoff_alt = waypoints[0].alt
+    items = [
+        MissionItem(
+            MAV_CMD_NAV_TAKEOFF, MAV_FRAME_GLOBAL_RELATIVE_ALT, 0, 0, 0, 0, 0, 0, takeoff_alt
+        )
+    ]
+    for waypoint in waypoints:
+        items.append(
+            MissionItem(
+                MAV_CMD_NAV_WAYPOINT,
+                MAV_FRAME_GLOBAL_RELATIVE_ALT,
+                0,
+                acceptance_radius,
+                0,
+                0,
+                waypoint.lat,
+                waypoint.lon,
+                waypoint.alt,
+            )
+        )
+    finish_command = _FINISH_COMMANDS[finish]
+    if finish_command is not None:
+        items.append(
+            MissionItem(finish_command, MAV_FRAME_GLOBAL_RELATIVE_ALT, 0, 0, 0, 0, 0, 0, 0)
+        )
+    return items
+
+
+def route_from_legs(lat, lon, heading, legs, alt):
+    """
+    (dönüş açısı, mesafe) adımlarını, başlangıç konumu ve yönünden itibaren
+    waypoint'lere çevirir. Otonom modun dönüş + ilerleme çiftleri böylece
+    tek bir görev olarak yüklenebilir.
+    """
+    waypoints = []
+    headings = (heading + np.cumsum([angle for angle, _ in legs])) % 360.0
+    for bearing, (_, distance) in zip(headings, legs):
+        lat, lon = (float(v) for v in destination(lat, lon, bearing, distance))
+        waypoints.append(Waypoint(lat, lon, alt))
+    return waypoints
+
+
+class MissionTracker:
+    """
+    MISSION_CURRENT ve MISSION_ITEM_REACHED mesajlarından görev ilerlemesini
+    izler. Sıra numaraları otopilotunkiyle aynıdır: 0 ev konumu, yüklenen
+    öğeler 1'den başlar.
+    """
+
+    MESSAGES = ("MISSION_CURRENT", "MISSION_ITEM_REACHED")
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._vehicle = None
+        self.items = []
+        self.current = None
+        self.reached = []
+        self.uploaded_at = None
+        self.started_at = None
+
+    def attach(self, vehicle):
+        self.detach()
+        self._vehicle = vehicle
+        for name in self.MESSAGES:
+            vehicle.add_message_listener(name, self._on_message)
+
+    def detach(self):
+        vehicle = self._vehicle
+        if vehicle is None:
+            return
+        for name in self.MESSAGES:
+            try:
+                vehicle.remove_message_listener(name, self._on_message)
+            except Exception:
+                pass
+        self._vehicle = None
+
+    @property
+    def last_seq(self):
+        return len(self.items)
+
+    def loaded(self, items):
+        with self._lock:
+            self.items = list(items)
+            self.current = None
+            self.reached = []
+            self.uploaded_at = self._clock()
+            self.started_at = None
+
+    def started(self):
+        self.started_at = self._clock()
+
+    def _on_message(self, vehicle, name, message):
+        with self._lock:
+            if name == "MISSION_CURRENT":
+                self.current = message.seq
+            elif name == "MISSION_ITEM_REACHED" and message.seq not in self.reached:
+                self.reached.append(message.seq)
+
+    def status(self):
+        total = len(self.items)
+        reached = [seq for seq in self.reached if 1 <= seq <= total]
+        return {
+            "items": total,
+            "current": self.current,
+            "reached": reached,
+            "progress": len(reached) / total if total else 0.0,
+            "complete": bool(total) and total in reached,
+            "uploaded_at": self.uploaded_at,
+            "started_at": self.started_at,
+        }
@@ -0,0 +1,265 @@
+import bisect
+import glob
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+# Uçuş kaydı biçimi (küçük endian):
+#   Segment başlığı (16 bayt): b"UAVLOG01" + uint64 kayıt sayısı
+#   Kayıt (88 bayt): float64 t, uint8 tür, uint8 kod, 6 bayt boşluk, 9 x float64
+# Telemetri kayıtlarında değerler TELEMETRY_VALUES sırasındadır; komut
+# kayıtlarında komut argümanları soldan yazılır, kalanlar NaN olur.
+MAGIC = b"UAVLOG01"
+HEADER_SIZE = 16
+RECORD_FORMAT = "<dBB6x9d"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+RECORD_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),
+        ("kind", "u1"),
+        ("code", "u1"),
+        ("_pad", "V6"),
+        ("values", "<f8", (9,)),
+    ]
+)
+
+KIND_TELEMETRY = 0
+KIND_COMMAND = 1
+
+TELEMETRY_VALUES = (
+    ("gps", "lat"),
+    ("gps", "lon"),
+    ("gps", "alt"),
+    ("battery", "voltage"),
+    ("battery", "current"),
+    ("battery", "level"),
+    ("attitude", "roll"),
+    ("attitude", "pitch"),
+    ("attitude", "yaw"),
+)
+
+COMMAND_CODES = {
+    "arm_and_takeoff": 1,
+    "move_3d": 2,
+    "turn_by_angle": 3,
+    "land": 4,
+    "move_distance": 5,
+    "stop": 6,
+    "start_mission": 7,
+    "fly_legs": 8,
+    "upload_mission": 9,
+    "disconnect": 10,
+}
+COMMAND_NAMES = {code: name for name, code in COMMAND_CODES.items()}
+
+_NAN_ARGS = (math.nan,) * 9
+
+
+class _Segment:
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self.buffer = mmap.mmap(self._file.fileno(), size)
+        self.buffer[: len(MAGIC)] = MAGIC
+        struct.pack_into("<Q", self.buffer, len(MAGIC), 0)
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def append(self, t, kind, code, values):
+        struct.pack_into(
+            RECORD_FORMAT,
+            self.buffer,
+            HEADER_SIZE + self.count * RECORD_SIZE,
+            t,
+            kind,
+            code,
+            *values,
+        )
+        self.count += 1
+        # Sayaç kaydın kendisinden sonra güncellenir; okuyucu yarım kayıt görmez.
+        struct.pack_into("<Q", self.buffer, len(MAGIC), self.count)
+
+    def close(self, keep=True):
+        self.buffer.flush()
+        self.buffer.close()
+        if keep:
+            self._file.truncate(HEADER_SIZE + self.count * RECORD_SIZE)
+        self._file.close()
+        if not keep:
+            os.remove(self.path)
+
+
+def _session_dir(directory):
+    # Aynı saniyede açılan oturum (ör. hızlı yeniden bağlanma) öncekinin
+    # segmentlerinin üzerine yazmaz; dizin adına sıra eki eklenir.
+    base = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S"))
+    path = base
+    suffix = 0
+    while True:
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            suffix += 1
+            path = f"{base}-{suffix}"
+
+
+class FlightRecorder:
+    """
+    Telemetri ve komutları sabit genişlikli kayıtlar halinde, bellek eşlemeli
+    segment dosyalarına ekleyen uçuş kaydedici. Yazma bir bellek kopyasından
+    ibarettir; bir sonraki segment arka planda önceden hazırlanır, böylece
+    kontrol yolu disk işlemi beklemez.
+    """
+
+    def __init__(self, directory, segment_records=65536, clock=time.time):
+        self.path = _session_dir(directory)
+        self.segment_records = segment_records
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = 0
+        self._segment = self._new_segment()
+        self._next = None
+        self._next_ready = threading.Event()
+        self._prepare_next()
+        self.closed = False
+
+    def _new_segment(self):
+        path = os.path.join(self.path, f"segment_{self._index:05d}.uavlog")
+        self._index += 1
+        return _Segment(path, self.segment_records)
+
+    def _prepare_next(self):
+        self._next_ready.clear()
+
+        def prepare():
+            self._next = self._new_segment()
+            self._next_ready.set()
+
+        threading.Thread(target=prepare, name="flight-recorder", daemon=True).start()
+
+    def record_telemetry(self, snapshot):
+        values = []
+        for group, attr in TELEMETRY_VALUES:
+            value = getattr(snapshot, group)
+            value = getattr(value, attr) if value is not None else None
+            values.append(math.nan if value is None else value)
+        self._append(KIND_TELEMETRY, 0, values)
+
+    def record_command(self, name, *args):
+        args = tuple(float(a) for a in args)
+        self._append(KIND_COMMAND, COMMAND_CODES[name], args + _NAN_ARGS[len(args):])
+
+    def _append(self, kind, code, values):
+        with self._lock:
+            if self.closed:
+                return
+            # Zaman kilit içinde alınır ki kayıtlar zamana göre sıralı kalsın.
+            t = self._clock()
+            if self._segment.full:
+                self._rotate()
+            self._segment.append(t, kind, code, values)
+
+    def _rotate(self):
+        # Hazırlık henüz bitmediyse (çok nadir) kısa süre beklenir.
+        self._next_ready.wait()
+        self._segment.close()
+        self._segment = self._next
+        self._prepare_next()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._segment.close()
+            self._next_ready.wait()
+            self._next.close(keep=False)
+
+
+class FlightLogReader:
+    """
+    Bir kayıt oturumunun segmentlerini salt okunur eşler. Zamana göre arama
+    önce segment başlangıçlarında, sonra segment içinde ikili arama yapar.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._maps = []
+        self._arrays = []
+        for segment_path in sorted(glob.glob(os.path.join(path, "segment_*.uavlog"))):
+            with open(segment_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                    continue
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if buffer[: len(MAGIC)] != MAGIC:
+                buffer.close()
+                raise ValueError(f"Geçersiz uçuş kaydı: {segment_path}")
+            (count,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+            if count == 0:
+                buffer.close()
+                continue
+            self._maps.append(buffer)
+            self._arrays.append(
+                np.frombuffer(buffer, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+            )
+        self._offsets = [0]
+        for array in self._arrays:
+            self._offsets.append(self._offsets[-1] + len(array))
+        self._first_t = [float(array["t"][0]) for array in self._arrays]
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def time_range(self):
+        if not self._arrays:
+            return None
+        return self._first_t[0], float(self._arrays[-1]["t"][-1])
+
+    def seek(self, t):
+        """t anında veya sonrasındaki ilk kaydın genel indeksini döndürür."""
+        segment = max(0, bisect.bisect_right(self._first_t, t) - 1)
+        for i in range(segment, len(self._arrays)):
+            local = int(np.searchsorted(self._arrays[i]["t"], t, side="left"))
+            if local < len(self._arrays[i]):
+                return self._offsets[i] + local
+        return len(self)
+
+    def chunks(self, start=0, stop=None):
+        """[start, stop) aralığını segment dilimleri (kopyasız görünümler) olarak verir."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i, array in enumerate(self._arrays):
+            lo = max(start - self._offsets[i], 0)
+            hi = min(stop - self._offsets[i], len(array))
+            if lo < hi:
+                yield array[lo:hi]
+
+    def read(self, t_start=None, t_end=None, kind=None):
+        start = 0 if t_start is None else self.seek(t_start)
+        stop = None if t_end is None else self.seek(t_end)
+        parts = list(self.chunks(start, stop))
+        records = np.concatenate(parts) if parts else np.empty(0, RECORD_DTYPE)
+        if kind is not None:
+            records = records[records["kind"] == kind]
+        return records
+
+    def close(self):
+        self._arrays = []
+        for buffer in self._maps:
+            try:
+                buffer.close()
+            except BufferError:
+                # Dışarıya verilmiş görünümler varsa eşleme GC ile kapanır.
+                pass
+        self._maps = []
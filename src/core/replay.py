@@ -0,0 +1,219 @@
+import math
+import threading
+import time
+
+from .commands import CommandQueue
+from .geofence import Geofence
+from .history import TelemetryHistory
+from .mission import MissionTracker
+from .recorder import (
+    COMMAND_NAMES,
+    KIND_COMMAND,
+    KIND_TELEMETRY,
+    FlightLogReader,
+)
+from .telemetry import AttitudeState, BatteryState, GpsFix, TelemetryCache
+
+
+def _optional(value):
+    return None if math.isnan(value) else float(value)
+
+
+class FlightReplayer(threading.Thread):
+    """
+    Kayıtlı bir uçuşu, kayıt zamanlamasını speed katıyla ölçekleyerek bir
+    TelemetryCache'e yeniden besler. Komut kayıtları log fonksiyonuna yazılır.
+    """
+
+    MIN_SPEED = 1.0
+    MAX_SPEED = 100.0
+
+    def __init__(self, reader, telemetry, speed=1.0, start_time=None, log=print):
+        super().__init__(name="flight-replayer", daemon=True)
+        self.reader = reader
+        self.telemetry = telemetry
+        self.speed = min(max(speed, self.MIN_SPEED), self.MAX_SPEED)
+        self.start_time = start_time
+        self.log = log
+        self.position = None
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    @property
+    def finished(self):
+        return not self.is_alive() and self.position is not None
+
+    def run(self):
+        time_range = self.reader.time_range()
+        if time_range is None:
+            return
+        start_time = time_range[0] if self.start_time is None else self.start_time
+        start = self.reader.seek(start_time)
+        wall_start = time.monotonic()
+        for chunk in self.reader.chunks(start):
+            for record in chunk:
+                t = float(record["t"])
+                delay = wall_start + (t - start_time) / self.speed - time.monotonic()
+                if delay > 0 and self._stopped.wait(delay):
+                    return
+                if self._stopped.is_set():
+                    return
+                self.position = t
+                self._apply(record)
+        self.log("Uçuş kaydının yeniden oynatımı tamamlandı.")
+
+    def _apply(self, record):
+        values = record["values"]
+        if record["kind"] == KIND_TELEMETRY:
+            fields = {}
+            lat, lon, alt = (_optional(v) for v in values[0:3])
+            if lat is not None or alt is not None:
+                fields["gps"] = GpsFix(lat, lon, alt)
+            if not math.isnan(values[3]):
+                fields["battery"] = BatteryState(*(_optional(v) for v in values[3:6]))
+            if not math.isnan(values[6]):
+                fields["attitude"] = AttitudeState(*(float(v) for v in values[6:9]))
+            if fields:
+                self.telemetry.update(**fields)
+        elif record["kind"] == KIND_COMMAND:
+            name = COMMAND_NAMES.get(int(record["code"]), "bilinmeyen")
+            args = ", ".join(f"{v:g}" for v in values if not math.isnan(v))
+            self.log(f"Kayıtlı komut: {name}({args})")
+
+
+class ReplayLink:
+    state = "replay"
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    @property
+    def running(self):
+        return self._controller.replayer.is_alive()
+
+    def start(self, loop=None):
+        if self._controller.replayer.ident is None:
+            self._controller.replayer.start()
+
+    async def stop(self):
+        self._controller.replayer.stop()
+
+    def status(self):
+        replayer = self._controller.replayer
+        return {
+            "state": self.state,
+            "log": self._controller.reader.path,
+            "speed": replayer.speed,
+            "position": replayer.position,
+            "finished": replayer.finished,
+        }
+
+
+class _NoSetpoints:
+    def stats(self):
+        return {}
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplayController:
+    """
+    Kayıtlı bir uçuşu canlı bir araç gibi sunan salt okunur kontrolcü. API ve
+    GUI aynı telemetri arayüzlerini kullanır; uçuş komutları yok sayılır.
+    """
+
+    def __init__(self, log_path, speed=1.0, start_time=None, vehicle_id=None):
+        self.vehicle_id = vehicle_id
+        self.vehicle = None
+        self.telemetry = TelemetryCache()
+        self.history = TelemetryHistory()
+        self.telemetry.subscribe(self.history.record)
+        self.setpoints = _NoSetpoints()
+        self.mission = MissionTracker()
+        self.geofence = None
+        self.reader = FlightLogReader(log_path)
+        self.replayer = FlightReplayer(
+            self.reader, self.telemetry, speed=speed, start_time=start_time, log=self.log
+        )
+        self.link = ReplayLink(self)
+        self.commands = CommandQueue(log=self.log)
+
+    def log(self, message):
+        if self.vehicle_id is not None:
+            message = f"[{self.vehicle_id}] {message}"
+        print(message)
+
+    @property
+    def connected(self):
+        return True
+
+    def start(self, loop=None):
+        self.link.start(loop)
+        self.commands.start(loop)
+
+    def submit(self, name, *args, **kwargs):
+        return self.commands.submit(name, lambda: getattr(self, name)(*args, **kwargs))
+
+    def cancel(self, future):
+        return self.commands.cancel(future) is not None
+
+    def load_geofence(self, geojson, cell_size=100.0):
+        # Komut gönderilmediği için çit yalnızca durum sorgularında görünür.
+        self.geofence = Geofence.from_geojson(geojson, cell_size=cell_size)
+        return self.geofence.summary()
+
+    def clear_geofence(self):
+        self.geofence = None
+
+    def geofence_status(self):
+        return {
+            "fence": self.geofence.summary() if self.geofence is not None else None,
+            "breaches": 0,
+            "last_breach": None,
+        }
+
+    async def _ignored(self, name):
+        self.log(f"Yeniden oynatma modunda {name} komutu yok sayıldı.")
+        return False
+
+    async def arm_and_takeoff(self, target_altitude, timeout=60):
+        return await self._ignored("arm_and_takeoff")
+
+    async def move_3d(self, velocity_x, velocity_y, velocity_z, duration=1):
+        return await self._ignored("move_3d")
+
+    async def send_ned_velocity(self, velocity_x, velocity_y, velocity_z, duration=1):
+        return await self._ignored("send_ned_velocity")
+
+    async def turn_by_angle(self, angle, timeout=30, tolerance=3.0):
+        return await self._ignored("turn_by_angle")
+
+    async def move_distance(self, distance):
+        return await self._ignored("move_distance")
+
+    async def turn_and_move(self, angle, distance):
+        return await self._ignored("turn_and_move")
+
+    async def stop(self):
+        return await self._ignored("stop")
+
+    async def land(self, timeout=120):
+        return await self._ignored("land")
+
+    async def upload_mission(self, waypoints, takeoff_alt=None, finish=None, timeout=30):
+        return await self._ignored("upload_mission")
+
+    async def start_mission(self, wait=True, timeout=600):
+        return await self._ignored("start_mission")
+
+    async def fly_legs(self, legs, altitude=None, wait=True):
+        return await self._ignored("fly_legs")
+
+    async def disconnect(self):
+        self.replayer.stop()
@@ -0,0 +1,176 @@
+import math
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+SetpointTarget = namedtuple("SetpointTarget", ["vx", "vy", "vz", "deadline", "future"])
+
+
+class JitterStats:
+    """Tick gecikmelerinin (planlanan ana göre sapma) çevrimiçi istatistiği."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.max = 0.0
+
+    def record(self, lateness):
+        self.ticks += 1
+        delta = lateness - self._mean
+        self._mean += delta / self.ticks
+        self._m2 += delta * (lateness - self._mean)
+        if lateness > self.max:
+            self.max = lateness
+
+    def as_dict(self):
+        stddev = math.sqrt(self._m2 / self.ticks) if self.ticks > 1 else 0.0
+        return {
+            "ticks": self.ticks,
+            "mean_jitter_ms": self._mean * 1000.0,
+            "stddev_jitter_ms": stddev * 1000.0,
+            "max_jitter_ms": self.max * 1000.0,
+        }
+
+
+class SetpointChannel:
+    """
+    Tek bir aracın güncel hız hedefi. Hedef tek bir referansta tutulur; yeni
+    bir komut eskisinin yerini bir sonraki tick'te alır ve eski komutun
+    future'ı False ile tamamlanır.
+    """
+
+    def __init__(self, streamer, send):
+        self._streamer = streamer
+        self._send = send
+        self._lock = threading.Lock()
+        self._target = None
+
+    def set_target(self, velocity_x, velocity_y, velocity_z, duration, replaces=None):
+        """
+        replaces verilirse hedef yalnızca kanaldaki hedef hâlâ o future'a
+        aitse değiştirilir; aksi halde bir şey yapılmaz ve None döner.
+        """
+        future = Future()
+        target = SetpointTarget(
+            velocity_x,
+            velocity_y,
+            velocity_z,
+            self._streamer.clock() + duration,
+            future,
+        )
+        with self._lock:
+            if replaces is not None and (
+                self._target is None or self._target.future is not replaces
+            ):
+                return None
+            previous, self._target = self._target, target
+        if previous is not None:
+            _resolve(previous, False)
+        return future
+
+    def clear(self):
+        with self._lock:
+            previous, self._target = self._target, None
+        if previous is not None:
+            _resolve(previous, False)
+
+    @property
+    def target(self):
+        return self._target
+
+    def stats(self):
+        return self._streamer.stats()
+
+    def close(self):
+        self.clear()
+        self._streamer.remove(self)
+
+    def tick(self, now):
+        target = self._target
+        if target is None:
+            return
+        if now >= target.deadline:
+            with self._lock:
+                expired = self._target is target
+                if expired:
+                    self._target = None
+            if expired:
+                # Süre doldu: aracı sürüklenmeye bırakmadan sıfır hızla tut.
+                self._safe_send(0, 0, 0)
+                _resolve(target, True)
+            return
+        self._safe_send(target.vx, target.vy, target.vz)
+
+    def _safe_send(self, velocity_x, velocity_y, velocity_z):
+        try:
+            self._send(velocity_x, velocity_y, velocity_z)
+        except Exception as e:
+            print(f"Setpoint gönderilemedi: {e}")
+
+
+class SetpointStreamer(threading.Thread):
+    """
+    Sabit frekanslı hız setpoint akışı. Tek bir thread kendisine bağlı tüm
+    kanalları (araçları) aynı tick'te işler; filo büyüdükçe thread sayısı
+    artmaz.
+    """
+
+    MIN_RATE_HZ = 10
+    MAX_RATE_HZ = 50
+
+    def __init__(self, rate_hz=10, clock=time.monotonic):
+        super().__init__(name="setpoint-streamer", daemon=True)
+        # Komut süreleri clock ile (simülatörde hızlandırılmış olabilir),
+        # tick ritmi ise her zaman gerçek zamanla ölçülür.
+        self.clock = clock
+        self.rate_hz = min(max(rate_hz, self.MIN_RATE_HZ), self.MAX_RATE_HZ)
+        self._lock = threading.Lock()
+        self._channels = ()
+        self._stopped = threading.Event()
+        self.jitter = JitterStats()
+
+    def channel(self, send):
+        channel = SetpointChannel(self, send)
+        with self._lock:
+            self._channels = self._channels + (channel,)
+        return channel
+
+    def remove(self, channel):
+        with self._lock:
+            self._channels = tuple(c for c in self._channels if c is not channel)
+
+    def close(self):
+        for channel in self._channels:
+            channel.clear()
+        self._stopped.set()
+
+    def stats(self):
+        stats = self.jitter.as_dict()
+        stats["rate_hz"] = self.rate_hz
+        stats["channels"] = len(self._channels)
+        return stats
+
+    def run(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.monotonic()
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            self.jitter.record(max(0.0, now - next_tick))
+            command_time = self.clock()
+            for channel in self._channels:
+                channel.tick(command_time)
+            next_tick += period
+            if next_tick <= now:
+                # Kaçırılan tick'leri telafi etmeye çalışma, ritmi yeniden kur.
+                next_tick = now + period
+            self._stopped.wait(max(0.0, next_tick - time.monotonic()))
+
+
+def _resolve(target, completed):
+    if not target.future.done():
+        target.future.set_result(completed)
@@ -0,0 +1,369 @@
+"""
+Süreçler arası paylaşılan bellek: telemetri snapshot'ları, kare halkası ve
+sayaç. API birden çok worker süreciyle çalıştığında bağlantı sahibi süreç
+yazar, worker'lar okur.
+
+Her kayıt yuvası bir seqlock ile korunur: yazan sıra sayacını tek sayıya
+çıkarır, veriyi yazar, sonra çift sayıya getirir. Okuyan kilit almaz; sayaç
+okuma başında ve sonunda aynı çift değerdeyse kopyası tutarlıdır, değilse
+tekrar dener. Okuyucu sayısı yazanı hiç yavaşlatmaz.
+"""
+import math
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from .telemetry import (
+    EMPTY_SNAPSHOT,
+    AttitudeState,
+    BatteryState,
+    FieldTimestamps,
+    GpsFix,
+    TelemetrySnapshot,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows; paylaşılan kare halkasına yazılamaz.
+    fcntl = None
+
+_SEQ = struct.Struct("<Q")
+_NAN = float("nan")
+READ_RETRIES = 1000
+
+
+# Bu süreçte (ya da fork edildiği üst süreçte) oluşturulan segmentler.
+_created = set()
+
+
+def create_segment(size, name=None):
+    segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _created.add(segment._name)
+    return segment
+
+
+def attach_segment(name):
+    """
+    Başka sürecin oluşturduğu segmente bağlanır. Bağlanan süreç segmentin
+    sahibi değildir; çıkarken segmenti silmemesi için resource_tracker'dan
+    düşülür (Python 3.13 öncesinde bağlanmak da kayıt ettirir). Segment bu
+    süreçte oluşturulduysa kayıt sahibine aittir ve dokunulmaz.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+
+        segment = shared_memory.SharedMemory(name=name)
+        if segment._name not in _created:
+            resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+class SeqlockSlots:
+    """
+    Sabit boyutlu yuvalar: [sıra sayacı u64][başlık][veri uzunluğu u32][veri].
+    Bir yuvaya aynı anda tek süreç yazmalıdır; bunu sağlamak çağıranın işidir.
+    """
+
+    def __init__(self, buf, offset, count, header, payload_size=0):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+        self.header = header
+        self.payload_size = payload_size
+        self._length_at = _SEQ.size + header.size
+        self._data_at = self._length_at + 4
+        # 8 bayt hizalı yuvalar; sayaç okuma/yazması tek bellek erişimidir.
+        self.slot_size = (self._data_at + payload_size + 7) & ~7
+
+    @classmethod
+    def size_for(cls, count, header, payload_size=0):
+        return cls(None, 0, count, header, payload_size).slot_size * count
+
+    def sequence(self, index):
+        return _SEQ.unpack_from(self.buf, self.offset + index * self.slot_size)[0]
+
+    def write(self, index, values, payload=b""):
+        if len(payload) > self.payload_size:
+            raise ValueError(
+                f"Kayıt yuvaya sığmıyor: {len(payload)} > {self.payload_size} bayt"
+            )
+        base = self.offset + index * self.slot_size
+        seq = _SEQ.unpack_from(self.buf, base)[0]
+        _SEQ.pack_into(self.buf, base, seq + 1)
+        self.header.pack_into(self.buf, base + _SEQ.size, *values)
+        struct.pack_into("<I", self.buf, base + self._length_at, len(payload))
+        if payload:
+            start = base + self._data_at
+            self.buf[start:start + len(payload)] = payload
+        _SEQ.pack_into(self.buf, base, seq + 2)
+        return seq + 2
+
+    def read(self, index):
+        """
+        (sıra sayacı, başlık değerleri, veri) üçlüsü; yuvaya hiç yazılmadıysa
+        None. Yazan çok uzun süre yarım kalırsa RuntimeError.
+        """
+        base = self.offset + index * self.slot_size
+        buf = self.buf
+        for attempt in range(READ_RETRIES):
+            before = _SEQ.unpack_from(buf, base)[0]
+            if before == 0:
+                return None
+            if before & 1:
+                if attempt > 10:
+                    time.sleep(0)
+                continue
+            values = self.header.unpack_from(buf, base + _SEQ.size)
+            length = struct.unpack_from("<I", buf, base + self._length_at)[0]
+            payload = b""
+            if 0 < length <= self.payload_size:
+                start = base + self._data_at
+                payload = bytes(buf[start:start + length])
+            if _SEQ.unpack_from(buf, base)[0] == before:
+                return before, values, payload
+        raise RuntimeError("Paylaşılan kayıt okunamadı: yazma tamamlanmıyor")
+
+
+class FileLock:
+    """
+    Süreçler arası yazma kilidi (flock). Aynı süreçteki thread'ler için
+    ayrıca bir threading.Lock tutulur; flock dosya tanıtıcısı başınadır.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError("Süreçler arası kilit bu platformda desteklenmiyor")
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def close(self):
+        os.close(self._fd)
+
+
+# Telemetri yuvası: sürüm, mevcut gruplar bit maskesi, 9 değer ve 3 zaman
+# damgası. Eksik değerler NaN olarak yazılır.
+_TELEMETRY = struct.Struct("<QB3d" + "6d" + "3d")
+_GROUPS = (("gps", GpsFix), ("battery", BatteryState), ("attitude", AttitudeState))
+
+
+def _pack_snapshot(snapshot):
+    mask = 0
+    values = []
+    for bit, (group, _) in enumerate(_GROUPS):
+        fields = getattr(snapshot, group)
+        if fields is None:
+            values.extend((_NAN, _NAN, _NAN))
+        else:
+            mask |= 1 << bit
+            values.extend(_NAN if v is None else v for v in fields)
+    values.extend(_NAN if v is None else v for v in snapshot.timestamps)
+    return (snapshot.version, mask, *values)
+
+
+def _optional(value):
+    return None if math.isnan(value) else value
+
+
+def _unpack_snapshot(values):
+    version, mask = values[0], values[1]
+    groups = {}
+    for bit, (group, cls) in enumerate(_GROUPS):
+        start = 2 + bit * 3
+        if mask & (1 << bit):
+            groups[group] = cls(*(_optional(v) for v in values[start:start + 3]))
+        else:
+            groups[group] = None
+    timestamps = FieldTimestamps(*(_optional(v) for v in values[11:14]))
+    return TelemetrySnapshot(version=version, timestamps=timestamps, **groups)
+
+
+class SharedTelemetry:
+    """
+    Araç başına bir telemetri yuvası. Bağlantı sahibi süreç publisher()
+    geri çağrısını TelemetryCache'e abone eder; worker'lar view() ile
+    TelemetryCache'in snapshot() arayüzünü görür.
+    """
+
+    def __init__(self, vehicle_ids, name=None, create=False):
+        self.vehicle_ids = list(vehicle_ids)
+        size = SeqlockSlots.size_for(len(self.vehicle_ids), _TELEMETRY)
+        self.segment = create_segment(size, name) if create else attach_segment(name)
+        self.owner = create
+        self.slots = SeqlockSlots(self.segment.buf, 0, len(self.vehicle_ids), _TELEMETRY)
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    def publisher(self, vehicle_id):
+        index = self.vehicle_ids.index(vehicle_id)
+
+        def publish(snapshot):
+            self.slots.write(index, _pack_snapshot(snapshot))
+
+        return publish
+
+    def view(self, vehicle_id):
+        return SharedTelemetryView(self, self.vehicle_ids.index(vehicle_id))
+
+    def close(self):
+        self.slots.buf = None
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+
+
+class SharedTelemetryView:
+    """
+    snapshot() yuvanın sıra sayacı değişmedikçe aynı nesneyi döndürür; bu
+    sayede sürüm başına önbellekler (kodlayıcı, düz alanlar) worker'da da
+    çalışır. Değişmemiş yuvayı okumak tek bir 8 baytlık okumadır.
+    """
+
+    def __init__(self, shared, index):
+        # Segment görünüm yaşadıkça açık kalsın diye SharedTelemetry tutulur.
+        self._shared = shared
+        self._slots = shared.slots
+        self._index = index
+        self._seq = 0
+        self._snapshot = EMPTY_SNAPSHOT
+
+    def snapshot(self):
+        if self._slots.sequence(self._index) == self._seq:
+            return self._snapshot
+        record = self._slots.read(self._index)
+        if record is not None:
+            self._seq, values, _ = record
+            self._snapshot = _unpack_snapshot(values)
+        return self._snapshot
+
+
+# Kare halkası: segment başında son yayımlanan sıra numarası, ardından
+# kapasite kadar yuva. Kare başlığı: sıra, alım zamanı, çekim zamanı,
+# kaynak sıra numarası (yoksa NaN / -1).
+_FRAME = struct.Struct("<Qddq")
+_RING_HEADER = 8
+
+
+class SharedFrameStore:
+    """
+    Tüm worker'ların ortak kare halkası. Yazma kısa bir dosya kilidi altında
+    sıra numarası alıp kareyi yuvaya kopyalamaktır; okuma kilitsizdir.
+    Yuvalar sabit boyutludur, max_frame_bytes'tan büyük kare reddedilir.
+    """
+
+    def __init__(
+        self, name=None, capacity=50, max_frame_bytes=1 << 20, lock_path=None, create=False
+    ):
+        self.capacity = capacity
+        self.max_frame_bytes = max_frame_bytes
+        size = _RING_HEADER + SeqlockSlots.size_for(capacity, _FRAME, max_frame_bytes)
+        self.segment = create_segment(size, name) if create else attach_segment(name)
+        self.owner = create
+        self.slots = SeqlockSlots(
+            self.segment.buf, _RING_HEADER, capacity, _FRAME, max_frame_bytes
+        )
+        self.lock_path = lock_path or f"/tmp/{self.segment.name}.lock"
+        self._lock = FileLock(self.lock_path)
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    def latest_seq(self):
+        return _SEQ.unpack_from(self.segment.buf, 0)[0]
+
+    def write(self, data, timestamp, captured_at=None, source_seq=None):
+        """Kareyi halkaya yazar ve tüm worker'larda geçerli sıra numarasını döndürür."""
+        if len(data) > self.max_frame_bytes:
+            raise ValueError(
+                f"Kare çok büyük: {len(data)} > {self.max_frame_bytes} bayt"
+            )
+        with self._lock:
+            seq = self.latest_seq() + 1
+            self.slots.write(
+                seq % self.capacity,
+                (
+                    seq,
+                    timestamp,
+                    _NAN if captured_at is None else captured_at,
+                    -1 if source_seq is None else source_seq,
+                ),
+                data,
+            )
+            _SEQ.pack_into(self.segment.buf, 0, seq)
+        return seq
+
+    def read(self, seq):
+        """(seq, data, timestamp, captured_at, source_seq); kare halkadan düştüyse None."""
+        record = self.slots.read(seq % self.capacity)
+        if record is None:
+            return None
+        _, (stored, timestamp, captured_at, source_seq), data = record
+        if stored != seq:
+            return None
+        return (
+            seq,
+            data,
+            timestamp,
+            _optional(captured_at),
+            None if source_seq < 0 else source_seq,
+        )
+
+    def close(self):
+        self.slots.buf = None
+        self._lock.close()
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+            try:
+                os.unlink(self.lock_path)
+            except OSError:
+                pass
+
+
+class SharedCounter:
+    """Tüm worker'larda ortak tamsayı sayaç; artırma dosya kilidi altında yapılır."""
+
+    def __init__(self, name=None, lock_path=None, create=False):
+        self.segment = create_segment(_SEQ.size, name) if create else attach_segment(name)
+        self.owner = create
+        self.lock_path = lock_path or f"/tmp/{self.segment.name}.lock"
+        self._lock = FileLock(self.lock_path)
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    def value(self):
+        return _SEQ.unpack_from(self.segment.buf, 0)[0]
+
+    def increment(self):
+        with self._lock:
+            value = self.value() + 1
+            _SEQ.pack_into(self.segment.buf, 0, value)
+        return value
+
+    def close(self):
+        self._lock.close()
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+            try:
+                os.unlink(self.lock_path)
+            except OSError:
+                pass
@@ -0,0 +1,603 @@
+import math
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .backend import VehicleBackend
+
+EARTH_RADIUS = 6378137.0
+
+MAV_FRAME_LOCAL_NED = 1
+MAV_FRAME_BODY_NED = 8
+MAV_FRAME_BODY_OFFSET_NED = 9
+MAV_CMD_NAV_WAYPOINT = 16
+MAV_CMD_NAV_RETURN_TO_LAUNCH = 20
+MAV_CMD_NAV_LAND = 21
+MAV_CMD_NAV_TAKEOFF = 22
+MAV_CMD_CONDITION_YAW = 115
+MAV_CMD_COMPONENT_ARM_DISARM = 400
+MAV_RESULT_ACCEPTED = 0
+MAV_RESULT_FAILED = 4
+MAV_RESULT_UNSUPPORTED = 3
+MAV_LANDED_STATE_ON_GROUND = 1
+MAV_LANDED_STATE_IN_AIR = 2
+
+SimLocation = namedtuple("SimLocation", ["lat", "lon", "alt"])
+SimBattery = namedtuple("SimBattery", ["voltage", "current", "level"])
+SimAttitude = namedtuple("SimAttitude", ["roll", "pitch", "yaw"])
+SimMode = namedtuple("SimMode", ["name"])
+
+
+class SimMessage:
+    """pymavlink mesajlarının simülatörde kullanılan basit karşılığı."""
+
+    def __init__(self, message_type, **fields):
+        self._type = message_type
+        self.__dict__.update(fields)
+
+    def get_type(self):
+        return self._type
+
+    def __repr__(self):
+        fields = {k: v for k, v in self.__dict__.items() if k != "_type"}
+        return f"{self._type} {fields}"
+
+
+class SimMessageFactory:
+    def set_position_target_local_ned_encode(
+        self,
+        time_boot_ms,
+        target_system,
+        target_component,
+        coordinate_frame,
+        type_mask,
+        x,
+        y,
+        z,
+        vx,
+        vy,
+        vz,
+        afx,
+        afy,
+        afz,
+        yaw,
+        yaw_rate,
+    ):
+        return SimMessage(
+            "SET_POSITION_TARGET_LOCAL_NED",
+            coordinate_frame=coordinate_frame,
+            type_mask=type_mask,
+            vx=vx,
+            vy=vy,
+            vz=vz,
+        )
+
+    def command_long_encode(
+        self,
+        target_system,
+        target_component,
+        command,
+        confirmation,
+        param1,
+        param2,
+        param3,
+        param4,
+        param5,
+        param6,
+        param7,
+    ):
+        return SimMessage(
+            "COMMAND_LONG",
+            command=command,
+            param1=param1,
+            param2=param2,
+            param3=param3,
+            param4=param4,
+            param5=param5,
+            param6=param6,
+            param7=param7,
+        )
+
+
+class SimClock:
+    """time_scale katı hızlandırılmış simülasyon saati (saniye)."""
+
+    def __init__(self, time_scale=1.0):
+        self.time_scale = time_scale
+        self._origin = time.monotonic()
+
+    def __call__(self):
+        return (time.monotonic() - self._origin) * self.time_scale
+
+
+class _SimLocations:
+    def __init__(self, vehicle):
+        self._vehicle = vehicle
+
+    @property
+    def global_frame(self):
+        lat, lon, alt = self._vehicle._geodetic()
+        return SimLocation(lat, lon, alt + self._vehicle.home_alt)
+
+    @property
+    def global_relative_frame(self):
+        return SimLocation(*self._vehicle._geodetic())
+
+
+class _SimCommands:
+    """DroneKit CommandSequence karşılığı: clear/add ile biriktirip upload eder."""
+
+    def __init__(self, vehicle):
+        self._vehicle = vehicle
+        self._pending = []
+
+    def clear(self):
+        self._pending = []
+
+    def add(self, command):
+        self._pending.append(command)
+
+    def upload(self, timeout=None):
+        self._vehicle._load_mission(self._pending)
+
+    @property
+    def count(self):
+        return len(self._vehicle._mission)
+
+    @property
+    def next(self):
+        return self._vehicle._mission_seq
+
+    @next.setter
+    def next(self, seq):
+        self._vehicle._set_mission_seq(seq)
+
+
+class SimulatedVehicle:
+    """
+    Nokta kütle modeliyle uçan süreç içi araç. Arm, kalkış, NED/gövde
+    eksenli hız setpoint'leri, yaw komutları, AUTO modda görev öğeleri, iniş
+    ve batarya tüketimini modeller; DroneKit Vehicle ile aynı listener
+    arayüzünü sunar.
+    """
+
+    def __init__(
+        self,
+        clock=None,
+        home=(41.0, 29.0),
+        home_alt=0.0,
+        step=0.05,
+        armable_delay=0.0,
+        climb_rate=2.5,
+        land_rate=1.0,
+        max_accel=3.0,
+        yaw_rate=30.0,
+        wp_speed=5.0,
+        setpoint_timeout=3.0,
+        battery_capacity_mah=5000.0,
+        hover_current=15.0,
+    ):
+        self._clock = clock or SimClock()
+        self.home = home
+        self.home_alt = home_alt
+        self.step = step
+        self.armable_delay = armable_delay
+        self.climb_rate = climb_rate
+        self.land_rate = land_rate
+        self.max_accel = max_accel
+        self.yaw_rate = yaw_rate
+        self.wp_speed = wp_speed
+        self.setpoint_timeout = setpoint_timeout
+        self.battery_capacity_mah = battery_capacity_mah
+        self.hover_current = hover_current
+
+        self._lock = threading.RLock()
+        self._position = np.zeros(3)  # Kuzey, Doğu, Aşağı (m)
+        self._velocity = np.zeros(3)
+        self._yaw = 0.0
+        self._yaw_target = None
+        self._yaw_speed = yaw_rate
+        self._armed = False
+        self._mode = SimMode("STABILIZE")
+        self._takeoff_alt = None
+        self._velocity_target = None
+        self._velocity_deadline = 0.0
+        self._used_mah = 0.0
+        self._mission = []
+        self._mission_seq = 0
+        self._mission_events = []
+        self._current = 0.0
+        self._armable_notified = False
+        self._boot_time = self._clock()
+        self._closed_at = None
+        self.sent_messages = 0
+
+        self._attribute_listeners = {}
+        self._message_listeners = {}
+        self.location = _SimLocations(self)
+        self.commands = _SimCommands(self)
+        self.message_factory = SimMessageFactory()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sim-vehicle", daemon=True
+        )
+
+    # ------------------------------------------------------------------
+    # DroneKit Vehicle arayüzü
+    # ------------------------------------------------------------------
+    @property
+    def armed(self):
+        return self._armed
+
+    @armed.setter
+    def armed(self, value):
+        with self._lock:
+            if value and not self._armed:
+                accepted = self.is_armable
+                if accepted:
+                    self._armed = True
+            elif not value and self._armed:
+                accepted = self._on_ground()
+                if accepted:
+                    self._armed = False
+            else:
+                accepted = True
+        self._ack(MAV_CMD_COMPONENT_ARM_DISARM, accepted)
+        if accepted:
+            self._notify("armed", self._armed)
+
+    @property
+    def is_armable(self):
+        return self._clock() - self._boot_time >= self.armable_delay
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        name = getattr(value, "name", value)
+        with self._lock:
+            self._mode = SimMode(name)
+            if name != "GUIDED":
+                self._velocity_target = None
+            if name == "AUTO":
+                self._takeoff_alt = None
+                self._mission_events.append(self._mission_current())
+        self._notify("mode", self._mode)
+        self._flush_mission_events()
+
+    @property
+    def heading(self):
+        return int(round(self._yaw)) % 360
+
+    @property
+    def attitude(self):
+        yaw = math.radians((self._yaw + 180.0) % 360.0 - 180.0)
+        return SimAttitude(0.0, 0.0, yaw)
+
+    @property
+    def battery(self):
+        level = max(0.0, 100.0 * (1.0 - self._used_mah / self.battery_capacity_mah))
+        voltage = 12.6 - 2.4 * (1.0 - level / 100.0) - 0.01 * self._current
+        return SimBattery(round(voltage, 3), round(self._current, 2), int(level))
+
+    @property
+    def groundspeed(self):
+        return float(np.hypot(self._velocity[0], self._velocity[1]))
+
+    @property
+    def velocity(self):
+        return self._velocity.tolist()
+
+    @property
+    def last_heartbeat(self):
+        if self._closed_at is None:
+            return 0.0
+        return (self._clock() - self._closed_at) / self._clock_scale()
+
+    def simple_takeoff(self, altitude):
+        with self._lock:
+            accepted = self._armed and self._mode.name == "GUIDED"
+            if accepted:
+                self._takeoff_alt = float(altitude)
+                self._velocity_target = None
+        self._ack(MAV_CMD_NAV_TAKEOFF, accepted)
+
+    def send_mavlink(self, message):
+        self.sent_messages += 1
+        message_type = message.get_type()
+        if message_type == "SET_POSITION_TARGET_LOCAL_NED":
+            self._handle_velocity(message)
+        elif message_type == "COMMAND_LONG":
+            self._handle_command(message)
+
+    def add_attribute_listener(self, name, fn):
+        self._attribute_listeners.setdefault(name, []).append(fn)
+
+    def remove_attribute_listener(self, name, fn):
+        listeners = self._attribute_listeners.get(name, [])
+        if fn in listeners:
+            listeners.remove(fn)
+
+    def add_message_listener(self, name, fn):
+        self._message_listeners.setdefault(name, []).append(fn)
+
+    def remove_message_listener(self, name, fn):
+        listeners = self._message_listeners.get(name, [])
+        if fn in listeners:
+            listeners.remove(fn)
+
+    def close(self):
+        self._stopped.set()
+        if self._closed_at is None:
+            self._closed_at = self._clock()
+
+    # ------------------------------------------------------------------
+    # Simülasyon
+    # ------------------------------------------------------------------
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _clock_scale(self):
+        return getattr(self._clock, "time_scale", 1.0)
+
+    def _run(self):
+        last = self._clock()
+        wall_step = self.step / self._clock_scale()
+        while not self._stopped.wait(wall_step):
+            now = self._clock()
+            # Thread gecikirse simülasyon adımı sınırlanır; model kararlı kalır.
+            self.advance(min(now - last, self.step * 5), now)
+            last = now
+
+    def advance(self, dt, now=None):
+        now = self._clock() if now is None else now
+        with self._lock:
+            mode = self._mode
+            disarmed = self._integrate(dt, now)
+            landed_state = (
+                MAV_LANDED_STATE_ON_GROUND if self._on_ground() else MAV_LANDED_STATE_IN_AIR
+            )
+        if self._mode != mode:
+            self._notify("mode", self._mode)
+        self._flush_mission_events()
+        if not self._armable_notified and self.is_armable:
+            self._armable_notified = True
+            self._notify("ekf_ok", True)
+        if disarmed:
+            self._notify("armed", False)
+        self._notify("location.global_frame", self.location.global_frame)
+        self._notify("location.global_relative_frame", self.location.global_relative_frame)
+        self._notify("attitude", self.attitude)
+        self._notify("heading", self.heading)
+        self._notify("battery", self.battery)
+        self._notify_message(
+            "EXTENDED_SYS_STATE", SimMessage("EXTENDED_SYS_STATE", landed_state=landed_state)
+        )
+
+    def _integrate(self, dt, now):
+        mode = self._mode.name
+        altitude = -self._position[2]
+        desired = np.zeros(3)
+        if self._armed:
+            if mode == "AUTO":
+                desired = self._mission_velocity(altitude)
+            elif mode == "RTL":
+                desired = self._return_velocity()
+            elif mode == "LAND":
+                desired[2] = self.land_rate
+                self._takeoff_alt = None
+            elif self._takeoff_alt is not None:
+                remaining = self._takeoff_alt - altitude
+                if remaining > 0.01:
+                    # Hedefte aşmadan durabilecek en yüksek tırmanma hızı.
+                    braking = math.sqrt(2.0 * self.max_accel * remaining)
+                    desired[2] = -min(self.climb_rate, braking)
+                else:
+                    self._takeoff_alt = None
+            elif self._velocity_target is not None and now < self._velocity_deadline:
+                if not self._on_ground() or self._velocity_target[2] < 0:
+                    desired = self._velocity_target
+        delta = desired - self._velocity
+        limit = self.max_accel * dt
+        norm = float(np.linalg.norm(delta))
+        if norm > limit > 0:
+            delta *= limit / norm
+        self._velocity += delta
+        self._position += self._velocity * dt
+        if self._position[2] >= 0:
+            self._position[2] = 0.0
+            if desired[2] >= 0:
+                # Yerdeyken tırmanma isteği yoksa araç hareketsizdir.
+                self._velocity[:] = 0.0
+
+        if self._yaw_target is not None:
+            error = (self._yaw_target - self._yaw + 180.0) % 360.0 - 180.0
+            turn = self._yaw_speed * dt
+            if abs(error) <= turn:
+                self._yaw = self._yaw_target % 360.0
+                self._yaw_target = None
+            else:
+                self._yaw = (self._yaw + math.copysign(turn, error)) % 360.0
+
+        if self._armed:
+            self._current = self.hover_current if not self._on_ground() else 1.0
+        else:
+            self._current = 0.5
+        self._used_mah += self._current * dt * 1000.0 / 3600.0
+
+        # İniş tamamlandığında ArduCopter gibi otomatik disarm.
+        if self._armed and mode in ("LAND", "RTL") and self._on_ground():
+            self._armed = False
+            return True
+        return False
+
+    def _load_mission(self, items):
+        with self._lock:
+            self._mission = list(items)
+            self._mission_seq = 1 if self._mission else 0
+
+    def _set_mission_seq(self, seq):
+        with self._lock:
+            self._mission_seq = max(0, min(int(seq), len(self._mission)))
+            self._mission_events.append(self._mission_current())
+        self._flush_mission_events()
+
+    def _mission_current(self):
+        return SimMessage("MISSION_CURRENT", seq=min(self._mission_seq, len(self._mission)))
+
+    def _mission_reached(self):
+        self._mission_events.append(
+            SimMessage("MISSION_ITEM_REACHED", seq=self._mission_seq)
+        )
+        self._mission_seq += 1
+        if self._mission_seq <= len(self._mission):
+            self._mission_events.append(self._mission_current())
+
+    def _flush_mission_events(self):
+        with self._lock:
+            events, self._mission_events = self._mission_events, []
+        for message in events:
+            self._notify_message(message.get_type(), message)
+
+    def _mission_velocity(self, altitude):
+        # Öğeler tamamlandıkça sıradakine geçilir; görev bitince araç
+        # ArduCopter gibi son noktada asılı kalır.
+        desired = np.zeros(3)
+        while 1 <= self._mission_seq <= len(self._mission):
+            item = self._mission[self._mission_seq - 1]
+            if item.command == MAV_CMD_NAV_TAKEOFF:
+                remaining = item.z - altitude
+                if remaining > 0.1:
+                    braking = math.sqrt(2.0 * self.max_accel * remaining)
+                    desired[2] = -min(self.climb_rate, braking)
+                    return desired
+            elif item.command == MAV_CMD_NAV_WAYPOINT:
+                offset = self._local(item.x, item.y, item.z) - self._position
+                distance = float(np.linalg.norm(offset))
+                if distance > max(item.param2, 0.5):
+                    speed = min(self.wp_speed, math.sqrt(2.0 * self.max_accel * distance))
+                    if np.hypot(offset[0], offset[1]) > 1.0:
+                        self._yaw_target = math.degrees(math.atan2(offset[1], offset[0])) % 360.0
+                    return offset / distance * speed
+            elif item.command == MAV_CMD_NAV_RETURN_TO_LAUNCH:
+                self._mission_reached()
+                self._mode = SimMode("RTL")
+                return self._return_velocity()
+            elif item.command == MAV_CMD_NAV_LAND:
+                self._mission_reached()
+                self._mode = SimMode("LAND")
+                desired[2] = self.land_rate
+                return desired
+            self._mission_reached()
+        return desired
+
+    def _return_velocity(self):
+        desired = np.zeros(3)
+        offset = -self._position[:2]
+        distance = float(np.hypot(offset[0], offset[1]))
+        if distance > 1.0:
+            speed = min(self.wp_speed, math.sqrt(2.0 * self.max_accel * distance))
+            desired[:2] = offset / distance * speed
+        else:
+            desired[2] = self.land_rate
+        return desired
+
+    def _local(self, lat, lon, alt):
+        lat0, lon0 = self.home
+        north = math.radians(lat - lat0) * EARTH_RADIUS
+        east = math.radians(lon - lon0) * EARTH_RADIUS * math.cos(math.radians(lat0))
+        return np.array([north, east, -alt])
+
+    def _on_ground(self):
+        return -self._position[2] <= 0.05
+
+    def _geodetic(self):
+        north, east, down = self._position
+        lat0, lon0 = self.home
+        lat = lat0 + math.degrees(north / EARTH_RADIUS)
+        lon = lon0 + math.degrees(east / (EARTH_RADIUS * math.cos(math.radians(lat0))))
+        return lat, lon, float(-down)
+
+    def _handle_velocity(self, message):
+        velocity = np.array([message.vx, message.vy, message.vz], dtype=float)
+        if message.coordinate_frame in (MAV_FRAME_BODY_NED, MAV_FRAME_BODY_OFFSET_NED):
+            yaw = math.radians(self._yaw)
+            c, s = math.cos(yaw), math.sin(yaw)
+            velocity[0], velocity[1] = c * velocity[0] - s * velocity[1], s * velocity[0] + c * velocity[1]
+        with self._lock:
+            if self._mode.name != "GUIDED" or not self._armed:
+                return
+            self._velocity_target = velocity
+            self._velocity_deadline = self._clock() + self.setpoint_timeout
+            self._takeoff_alt = None if velocity.any() else self._takeoff_alt
+
+    def _handle_command(self, message):
+        if message.command == MAV_CMD_CONDITION_YAW:
+            angle, speed, direction, relative = (
+                message.param1,
+                message.param2,
+                message.param3,
+                message.param4,
+            )
+            with self._lock:
+                if relative:
+                    delta = -abs(angle) if direction == -1 else angle
+                    self._yaw_target = (self._yaw + delta) % 360.0
+                else:
+                    self._yaw_target = angle % 360.0
+                self._yaw_speed = speed if speed > 0 else self.yaw_rate
+            self._ack(MAV_CMD_CONDITION_YAW, True)
+        else:
+            self._ack(message.command, None)
+
+    def _ack(self, command, accepted):
+        if accepted is None:
+            result = MAV_RESULT_UNSUPPORTED
+        else:
+            result = MAV_RESULT_ACCEPTED if accepted else MAV_RESULT_FAILED
+        self._notify_message(
+            "COMMAND_ACK", SimMessage("COMMAND_ACK", command=command, result=result)
+        )
+
+    def _notify(self, name, value):
+        for fn in tuple(self._attribute_listeners.get(name, ())):
+            try:
+                fn(self, name, value)
+            except Exception as e:
+                print(f"Simülatör listener hatası ({name}): {e}")
+
+    def _notify_message(self, name, message):
+        for fn in tuple(self._message_listeners.get(name, ())):
+            try:
+                fn(self, name, message)
+            except Exception as e:
+                print(f"Simülatör listener hatası ({name}): {e}")
+
+
+class SimulatorBackend(VehicleBackend):
+    """
+    Ağ veya harici süreç gerektirmeyen simülatör arka ucu. Her connect()
+    çağrısı yeni bir SimulatedVehicle başlatır; time_scale > 1 saati hızlandırır.
+    """
+
+    def __init__(self, time_scale=1.0, home=(41.0, 29.0), **vehicle_kwargs):
+        self.clock = SimClock(time_scale)
+        self.home = home
+        self.vehicle_kwargs = vehicle_kwargs
+        self.vehicles = []
+
+    def connect(self, connection_string=None, wait_ready=True, timeout=60):
+        vehicle = SimulatedVehicle(clock=self.clock, home=self.home, **self.vehicle_kwargs)
+        self.vehicles.append(vehicle)
+        return vehicle.start()
+
+    def mode(self, name):
+        return SimMode(name)
+
+    def mission_command(self, item):
+        return item
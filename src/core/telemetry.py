@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import namedtuple
+
+GpsFix = namedtuple("GpsFix", ["lat", "lon", "alt"])
+BatteryState = namedtuple("BatteryState", ["voltage", "current", "level"])
+AttitudeState = namedtuple("AttitudeState", ["roll", "pitch", "yaw"])
+FieldTimestamps = namedtuple("FieldTimestamps", ["gps", "battery", "attitude"])
+
+
+# Okuyucuların gördüğü değişmez telemetri görüntüsü. Her güncelleme yeni bir
+# nesne üretir; okuyucular tek bir referans okumasıyla tutarlı bir kopya alır.
+class TelemetrySnapshot(
+    namedtuple(
+        "TelemetrySnapshot", ["version", "gps", "battery", "attitude", "timestamps"]
+    )
+):
+    __slots__ = ()
+
+    def flat(self):
+        """Alan adı "grup.alan" olan düz sözlük; eksik gruplar None değer alır."""
+        out = {}
+        for group, fields in FLAT_GROUPS:
+            values = getattr(self, group)
+            for i, field in enumerate(fields):
+                out[f"{group}.{field}"] = values[i] if values is not None else None
+        return out
+
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "gps": self.gps._asdict() if self.gps else {},
+            "battery": self.battery._asdict() if self.battery else {},
+            "attitude": self.attitude._asdict() if self.attitude else {},
+            "timestamps": self.timestamps._asdict(),
+        }
+
+
+FLAT_GROUPS = (
+    ("gps", GpsFix._fields),
+    ("battery", BatteryState._fields),
+    ("attitude", AttitudeState._fields),
+    ("timestamps", FieldTimestamps._fields),
+)
+FLAT_FIELDS = tuple(f"{group}.{field}" for group, fields in FLAT_GROUPS for field in fields)
+
+EMPTY_SNAPSHOT = TelemetrySnapshot(
+    version=0,
+    gps=None,
+    battery=None,
+    attitude=None,
+    timestamps=FieldTimestamps(None, None, None),
+)
+
+
+class TelemetryCache:
+    """
+    DroneKit attribute listener'ları ile beslenen telemetri önbelleği.
+    Yazma işlemleri yalnızca DroneKit'in mesaj thread'inden gelir; okuyucular
+    hiçbir kilit tutmadan snapshot() ile son görüntüyü alır.
+    """
+
+    _LISTENED_ATTRIBUTES = (
+        "location.global_frame",
+        "location.global_relative_frame",
+        "battery",
+        "attitude",
+    )
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._write_lock = threading.Lock()
+        self._snapshot = EMPTY_SNAPSHOT
+        self._vehicle = None
+        self._subscribers = ()
+
+    def snapshot(self):
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """callback(snapshot) her yeni snapshot yayınlandığında çağrılır."""
+        self._subscribers = self._subscribers + (callback,)
+
+    def unsubscribe(self, callback):
+        # Bağlı metotlar her erişimde yeni nesnedir; eşitlikle karşılaştırılır.
+        self._subscribers = tuple(c for c in self._subscribers if c != callback)
+
+    def attach(self, vehicle):
+        self.detach()
+        self._vehicle = vehicle
+        # Bağlantı anındaki değerlerle başla, sonrası listener'lardan gelir.
+        try:
+            self._on_global_frame(vehicle, None, vehicle.location.global_frame)
+            self._on_relative_frame(
+                vehicle, None, vehicle.location.global_relative_frame
+            )
+            self._on_battery(vehicle, None, vehicle.battery)
+            self._on_attitude(vehicle, None, vehicle.attitude)
+        except Exception:
+            pass
+        for name, callback in self._listeners():
+            vehicle.add_attribute_listener(name, callback)
+
+    def detach(self):
+        vehicle = self._vehicle
+        if vehicle is None:
+            return
+        for name, callback in self._listeners():
+            try:
+                vehicle.remove_attribute_listener(name, callback)
+            except Exception:
+                pass
+        self._vehicle = None
+
+    def _listeners(self):
+        return zip(
+            self._LISTENED_ATTRIBUTES,
+            (
+                self._on_global_frame,
+                self._on_relative_frame,
+                self._on_battery,
+                self._on_attitude,
+            ),
+        )
+
+    def update(self, **fields):
+        with self._write_lock:
+            snapshot = self._publish(self._snapshot, fields)
+        self._notify(snapshot)
+
+    def update_position(self, lat=None, lon=None, alt=None):
+        with self._write_lock:
+            old = self._snapshot
+            gps = old.gps or GpsFix(None, None, None)
+            if lat is not None:
+                gps = gps._replace(lat=lat)
+            if lon is not None:
+                gps = gps._replace(lon=lon)
+            if alt is not None:
+                gps = gps._replace(alt=alt)
+            snapshot = self._publish(old, {"gps": gps})
+        self._notify(snapshot)
+
+    def _publish(self, old, fields):
+        now = self._clock()
+        timestamps = old.timestamps._replace(**{name: now for name in fields})
+        snapshot = old._replace(
+            version=old.version + 1, timestamps=timestamps, **fields
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    def _notify(self, snapshot):
+        # Aboneler kilit bırakıldıktan sonra çağrılır; yavaş bir abone (ör.
+        # disk, soket) diğer alanların yazılmasını bekletmez.
+        for callback in self._subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Telemetri abonesi hatası: {e}")
+
+    # DroneKit listener imzası: (vehicle, attr_name, value)
+    def _on_global_frame(self, vehicle, name, value):
+        if value is not None:
+            self.update_position(lat=value.lat, lon=value.lon)
+
+    def _on_relative_frame(self, vehicle, name, value):
+        if value is not None:
+            self.update_position(alt=value.alt)
+
+    def _on_battery(self, vehicle, name, value):
+        if value is not None:
+            self.update(
+                battery=BatteryState(value.voltage, value.current, value.level)
+            )
+
+    def _on_attitude(self, vehicle, name, value):
+        if value is not None:
+            self.update(attitude=AttitudeState(value.roll, value.pitch, value.yaw))
+
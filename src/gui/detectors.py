@@ -0,0 +1,256 @@
+"""
+Otonom modda algılama servislerinin (kavşak, görüntü analizi, yol,
+kalabalık, trafik) sorgulanması.
+
+Tüm servisler GUI'nin olay döngüsünde, bağlantı havuzu olan tek bir
+httpx.AsyncClient ile sorgulanır; her servisin kendi görevi vardır, böylece
+yavaş bir servis diğerlerini bekletmez. Sonuçlar değiştiğinde komutlar
+doğrudan kontrolcüye gönderilir; Tk thread'ine yalnızca log mesajları
+geçer (messages kuyruğu).
+
+Sorgu aralığı servisin sonuçlarının değişme hızına uyar: sonuç değişince
+taban aralığa döner, değişmedikçe en fazla max_interval'a kadar uzar.
+Servis ETag verirse sonraki istekler If-None-Match ile gider ve 304
+"değişmedi" sayılır. long_poll parametresi tanımlı servislerde istek sonuç
+değişene kadar sunucuda bekler (204: zaman aşımı) ve araya bekleme konmaz.
+
+repeat=True olan servislerin işleyicisi sonuç değişmese de her sorguda
+çağrılır: yol ve kalabalık sonuçları araca göreli komut ürettiği için araç
+aynı sonucu izlemeyi sürdürür. Tekrarlanan çağrıların logları yazılmaz.
+"""
+import asyncio
+import contextvars
+import queue
+
+import httpx
+
+INTERSECTION_URL = "http://10.225.217.213:8000/intersection"
+SERVICE_URL = "http://localhost:5000"
+
+# Değişmemiş sonuçla yeniden çağrılan işleyicinin logları susturulur; her
+# servis kendi görevinde çalıştığı için bayrak yalnızca o servisi etkiler.
+_repeating = contextvars.ContextVar("repeating", default=False)
+
+
+class Detector:
+    """Tek bir algılama servisi; handle(poller, data) değişen sonuçla çağrılır."""
+
+    def __init__(
+        self, name, url, handle, interval, max_interval=None, timeout=1.0, long_poll=None,
+        repeat=False,
+    ):
+        self.name = name
+        self.url = url
+        self.handle = handle
+        self.interval = interval
+        self.max_interval = max(max_interval or interval, interval)
+        self.timeout = timeout
+        self.long_poll = long_poll
+        self.repeat = repeat
+
+
+async def on_intersection(poller, data):
+    if not data.get("is_intersection", False):
+        return
+    poller.log("4’lü kavşak tespit edildi! Drone durduruluyor...")
+    poller.submit("stop")
+    response = await poller.client.get(f"{SERVICE_URL}/intersection_details", timeout=1)
+    if response.status_code != 200:
+        poller.log("Intersection details API hatalı.")
+        return
+    details = response.json()
+    angle = details.get("angle")
+    distance = details.get("distance")
+    poller.log(f"Kavşak detayları: Açısı = {angle:.2f}, Mesafe = {distance:.2f}")
+    poller.fly(angle, distance)
+
+
+async def on_image_analysis(poller, data):
+    poller.log(f"Görüntü Analizi: {data.get('analysis')}, Sayım: {data.get('count')}")
+
+
+async def on_crowd(poller, data):
+    if not data.get("crowd_found", False):
+        return
+    angle = data.get("angle")
+    distance = data.get("distance")
+    poller.log(f"Kalabalık alan tespit edildi: Açısı = {angle:.2f}, Mesafe = {distance:.2f}")
+    poller.fly(angle, distance)
+
+
+async def on_path(poller, data):
+    angle = data.get("angle")
+    distance = data.get("distance")
+    poller.log(f"Yol tespiti: Açısı = {angle:.2f}, Mesafe = {distance:.2f}")
+    poller.fly(angle, distance)
+
+
+async def on_traffic(poller, data):
+    poller.log(
+        f"Trafik Analizi: En kalabalık yol = {data.get('busiest_road')}, "
+        f"Araç = {data.get('vehicle_count')}, Yaya = {data.get('pedestrian_count')}"
+    )
+    response = await poller.client.get(f"{SERVICE_URL}/optimize_traffic_lights", timeout=2)
+    if response.status_code != 200:
+        poller.log("Trafik analizi API hatalı.")
+        return
+    poller.log(f"Akıllı Trafik Işığı: {response.json().get('status')}")
+
+
+def default_detectors():
+    # Kavşak ve yol sonuçları manevrayı etkilediği için aralıkları kısa tutulur.
+    return [
+        Detector("Intersection API", INTERSECTION_URL, on_intersection, 1.0, 2.0),
+        Detector("Görüntü analiz API", f"{SERVICE_URL}/image_analysis", on_image_analysis, 1.0, 5.0),
+        Detector("Path API", f"{SERVICE_URL}/path_direction", on_path, 1.0, 2.0, repeat=True),
+        Detector(
+            "Crowd API", f"{SERVICE_URL}/crowd_details", on_crowd, 2.0, 6.0, repeat=True
+        ),
+        Detector(
+            "Trafik analizi API", f"{SERVICE_URL}/analyze_traffic", on_traffic,
+            30.0, 120.0, timeout=2.0,
+        ),
+    ]
+
+
+class _State:
+    __slots__ = ("interval", "etag", "data", "status", "polls", "changes", "unchanged", "errors")
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.etag = None
+        self.data = None
+        self.status = None
+        self.polls = 0
+        self.changes = 0
+        self.unchanged = 0
+        self.errors = 0
+
+
+class DetectorPoller:
+    """
+    Algılama servislerini loop üzerinde sorgular. set_active() ve stop()
+    herhangi bir thread'den çağrılabilir; pasifken hiç istek gönderilmez.
+    """
+
+    def __init__(self, controller, loop, detectors=None, backoff=1.5, client=None):
+        self.controller = controller
+        self.loop = loop
+        self.detectors = list(default_detectors() if detectors is None else detectors)
+        self.backoff = backoff
+        self.client = client
+        self.messages = queue.SimpleQueue()
+        self._states = {d.name: _State(d.interval) for d in self.detectors}
+        self._active = asyncio.Event()
+        self._tasks = []
+
+    def start(self):
+        return asyncio.run_coroutine_threadsafe(self._start(), self.loop)
+
+    def stop(self):
+        return asyncio.run_coroutine_threadsafe(self._stop(), self.loop)
+
+    def set_active(self, active):
+        self.loop.call_soon_threadsafe(self._active.set if active else self._active.clear)
+
+    async def _start(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+            )
+        self._tasks = [asyncio.ensure_future(self._run(d)) for d in self.detectors]
+
+    async def _stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.client is not None:
+            await self.client.aclose()
+
+    def log(self, message):
+        if not _repeating.get():
+            self.messages.put(message)
+
+    def submit(self, name, *args, **kwargs):
+        # Kontrolcü kuyruğu thread güvenlidir; komut Tk thread'ine uğramaz.
+        return self.controller.submit(name, *args, **kwargs)
+
+    def fly(self, angle, distance):
+        # Dönüş + ilerleme adımı otopilota tek görev olarak yüklenir; adımlar
+        # bağlantı üzerinden tek tek komut gönderilerek uçulmaz. fly_legs
+        # hareket komutudur: yeni algılama uçulan rotanın yerini alır.
+        return self.submit("fly_legs", [(angle, distance)])
+
+    def _report(self, state, status):
+        # Aynı hata her sorguda tekrar loglanmaz.
+        if status != state.status:
+            state.status = status
+            if status is not None:
+                self.log(status)
+
+    async def _run(self, detector):
+        while True:
+            await self._active.wait()
+            await asyncio.sleep(await self.poll(detector))
+
+    async def poll(self, detector):
+        """Tek bir sorgu; sonraki sorgudan önce beklenecek süreyi döndürür."""
+        state = self._states[detector.name]
+        state.polls += 1
+        headers = {"If-None-Match": state.etag} if state.etag else None
+        params = None
+        timeout = detector.timeout
+        if detector.long_poll and state.data is not None:
+            params = {detector.long_poll: detector.max_interval}
+            timeout += detector.max_interval
+        try:
+            response = await self.client.get(
+                detector.url, headers=headers, params=params, timeout=timeout
+            )
+            if response.status_code in (204, 304):
+                return await self._unchanged(detector, state)
+            if response.status_code != 200:
+                state.errors += 1
+                self._report(state, f"{detector.name} hatası: {response.status_code}")
+                return detector.max_interval
+            data = response.json()
+            state.etag = response.headers.get("ETag")
+            if data == state.data:
+                return await self._unchanged(detector, state)
+            state.data = data
+            state.changes += 1
+            state.interval = detector.interval
+            self._report(state, None)
+            await detector.handle(self, data)
+        except Exception as e:
+            state.errors += 1
+            self._report(state, f"{detector.name} hatası: {e}")
+            return detector.max_interval
+        return 0 if detector.long_poll else state.interval
+
+    async def _unchanged(self, detector, state):
+        state.unchanged += 1
+        self._report(state, None)
+        if detector.repeat and state.data is not None:
+            token = _repeating.set(True)
+            try:
+                await detector.handle(self, state.data)
+            finally:
+                _repeating.reset(token)
+        if detector.long_poll:
+            return 0
+        state.interval = min(state.interval * self.backoff, detector.max_interval)
+        return state.interval
+
+    def stats(self):
+        return {
+            name: {
+                "interval": state.interval,
+                "polls": state.polls,
+                "changes": state.changes,
+                "unchanged": state.unchanged,
+                "errors": state.errors,
+            }
+            for name, state in self._states.items()
+        }
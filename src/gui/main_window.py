@@ -1,10 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
-import requests
-import asyncio
-import threading
-from io import BytesIO
+from PIL import ImageTk
+import queue
+
+from .detectors import DetectorPoller
+from .video import VideoConsumer
+
+# Gösterim döngüsünün aralığı: kare geldikçe kısa, kare gelmedikçe
+# VIDEO_IDLE_MS'e kadar iki katına çıkar; akış yokken Tk sık uyanmaz.
+VIDEO_REFRESH_MS = 15
+VIDEO_IDLE_MS = 120
+# Algılama servislerinden gelen log mesajlarının gösterim aralığı.
+DETECTOR_LOG_MS = 200
 
 # ------------------------------------------------- 
 # Stil / Tema Ayarları (Modern Arayüz)
@@ -28,7 +35,7 @@ def setup_style():
 
 
 class DroneGUI:
-    def __init__(self, root, controller, async_loop):
+    def __init__(self, root, controller, async_loop, frames=None):
         self.root = root
         self.controller = controller
         self.async_loop = async_loop
@@ -97,6 +104,11 @@ class DroneGUI:
         self.video_frame.grid_propagate(False)
         self.video_label = ttk.Label(self.video_frame)
         self.video_label.pack(fill="none", expand=True)
+        self.video_size = (640, 480)
+        # API aynı süreçteyse kareler HTTP yerine doğrudan kare halkasından alınır.
+        self.frames = frames
+        self.video = None
+        self.video_photo = None
 
         self.manual_frame = ttk.Frame(self.main_frame)
         self._build_manual_panel()
@@ -121,27 +133,19 @@ class DroneGUI:
         self.telemetry_label.pack(anchor="w")
 
         self.root.bind("<Configure>", self.on_resize)
-        self.root.after(1000, self.check_intersection_api)
-        self.root.after(1000, self.check_image_analysis_api)
-        self.root.after(1000, self.check_path_api)
-        self.root.after(2000, self.check_crowd_api)
-        self.root.after(30000, self.check_traffic_analysis_api)
+        # Algılama servisleri olay döngüsünde sorgulanır; yalnızca bağlı ve
+        # otonom moddayken etkindir.
+        self.detectors = DetectorPoller(controller, async_loop)
+        self.detectors.start()
+        self._show_detector_messages()
         self.update_telemetry()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def on_resize(self, event):
-        try:
-            imgtk = getattr(self.video_label, "imgtk", None)
-            if imgtk:
-                image = ImageTk.getimage(imgtk)
-                resized_image = image.resize(
-                    (event.width - 20, event.height - 20), Image.ANTIALIAS
-                )
-                new_imgtk = ImageTk.PhotoImage(resized_image)
-                self.video_label.config(image=new_imgtk)
-                self.video_label.imgtk = new_imgtk
-        except Exception:
-            pass
+        # Yeniden boyutlandırma görüntüyü burada ölçeklemez; bir sonraki kare
+        # sunucudan yeni boyuta uygun kopya olarak istenir.
+        if event.widget is self.root:
+            self.video_size = (max(event.width - 20, 1), max(event.height - 20, 1))
 
     def log(self, message):
         self.info_text.insert(tk.END, message + "\n")
@@ -182,20 +186,26 @@ class DroneGUI:
             self.auto_button.config(state="normal")
             self.land_button.config(state="normal")
             self.disconnect_button.config(state="normal")
+            self._update_detectors()
         else:
-            self.log("Drone bağlantısı yapılamadı.")
+            # Bağlantı yöneticisi arka planda denemeye devam eder.
+            self.controller.start(self.async_loop)
+            self.log(
+                f"Drone bağlantısı henüz hazır değil (durum: {self.controller.link.state})."
+            )
 
     def disconnect_drone(self):
         if not self.connected:
             self.log("Drone zaten bağlantısız.")
             return
         self.log("Drone bağlantısı kesiliyor...")
-        asyncio.run_coroutine_threadsafe(self.controller.disconnect(), self.async_loop)
+        self.controller.submit("disconnect")
         self.connected = False
         self.manual_button.config(state="disabled")
         self.auto_button.config(state="disabled")
         self.land_button.config(state="disabled")
         self.disconnect_button.config(state="disabled")
+        self._update_detectors()
         self.log("Drone bağlantısı kesildi.")
 
     def start_manual(self):
@@ -203,15 +213,17 @@ class DroneGUI:
             self.log("Lütfen önce drone bağlantısını kurun.")
             return
         self.mode = "manual"
+        self._update_detectors()
         self.log("Manuel mod aktif.")
         self.manual_frame.grid(row=2, column=3, sticky="nsew", padx=10, pady=10)
-        asyncio.run_coroutine_threadsafe(self.controller.arm_and_takeoff(5), self.async_loop)
+        self.controller.submit("arm_and_takeoff", 5)
 
     def start_autonomous(self):
         if not self.connected:
             self.log("Lütfen önce drone bağlantısını kurun.")
             return
         self.mode = "autonomous"
+        self._update_detectors()
         self.log("Otonom mod aktif.")
         self.manual_frame.grid_forget()
 
@@ -234,9 +246,8 @@ class DroneGUI:
         }
         if direction in mapping:
             vx, vy, vz = mapping.get(direction)
-            asyncio.run_coroutine_threadsafe(
-                self.controller.move_3d(vx, vy, vz, duration=1), self.async_loop
-            )
+            # Hızlı tıklamalarda bekleyen hareket en sonuncusuyla değiştirilir.
+            self.controller.submit("move_3d", vx, vy, vz, duration=1)
         else:
             self.log(f"Bilinmeyen yön: {direction}")
 
@@ -245,58 +256,75 @@ class DroneGUI:
             self.log("Lütfen önce drone bağlantısını kurun.")
             return
         self.log("İniş komutu gönderildi.")
-        asyncio.run_coroutine_threadsafe(self.controller.land(), self.async_loop)
+        self.controller.submit("land")
 
     def on_closing(self):
-        asyncio.run_coroutine_threadsafe(self.controller.disconnect(), self.async_loop)
+        self.detectors.stop()
+        if self.video is not None:
+            self.video.stop()
+            self.video = None
+        self.controller.submit("disconnect")
         self.root.destroy()
 
     def update_video(self):
-        def fetch_and_update():
+        """
+        Video akışını başlatır. Kareler tek bir arka plan thread'inde alınıp
+        çözülür; Tk thread'i yalnızca en yeni kareyi gösterir.
+        """
+        if self.video is not None:
+            return
+        self.video = VideoConsumer(size=self.video_size, frames=self.frames)
+        self.video.start()
+        self._show_video(VIDEO_REFRESH_MS)
+
+    def _show_video(self, delay):
+        # Tek tekrarlayan Tk geri çağrısı: diğer thread'ler Tk'ye hiç dokunmaz.
+        video = self.video
+        if video is None:
+            return
+        while True:
             try:
-                response = requests.get(
-                    "http://localhost:5000/camera_feed", timeout=0.5
-                )
-                if response.status_code == 200:
-                    img = Image.open(BytesIO(response.content))
-                    img = img.resize((640, 480), Image.LANCZOS)
-                    imgtk = ImageTk.PhotoImage(img)
-                    self.video_label.after(
-                        0, lambda: self.video_label.configure(image=imgtk)
-                    )
-                    self.video_label.imgtk = imgtk
-                elif response.status_code == 503:
-                    self.log("Kamera akışı bekleniyor...")
-                else:
-                    self.log(f"Kamera hatası: {response.status_code}")
-            except Exception as e:
-                self.log(f"Görüntü alınamadı: {str(e)}")
-
-        threading.Thread(target=fetch_and_update, daemon=True).start()
-        self.root.after(50, self.update_video)
+                self.log(video.messages.get_nowait())
+            except queue.Empty:
+                break
+        video.size = self.video_size
+        frame = video.take() if video.ready() else None
+        if frame is not None:
+            _, image = frame
+            photo = self.video_photo
+            if photo is not None and (photo.width(), photo.height()) == image.size:
+                # Aynı boyutta kare: mevcut Tk görüntüsünün pikselleri değiştirilir.
+                photo.paste(image)
+            else:
+                self.video_photo = ImageTk.PhotoImage(image)
+                self.video_label.configure(image=self.video_photo)
+            delay = VIDEO_REFRESH_MS
+        else:
+            delay = min(delay * 2, VIDEO_IDLE_MS)
+        self.root.after(delay, self._show_video, delay)
 
     def update_telemetry(self):
         if not self.controller.connected:
-            self.telemetry_label.config(text="Telemetri: Drone bağlı değil...")
+            self.telemetry_label.config(
+                text=f"Telemetri: Drone bağlı değil... (bağlantı: {self.controller.link.state})"
+            )
             self.root.after(1000, self.update_telemetry)
             return
-        try:
-            loc = self.controller.vehicle.location.global_frame
-            alt = self.controller.vehicle.location.global_relative_frame.alt
-            gps = f"Lat: {loc.lat:.6f}, Lon: {loc.lon:.6f}, Alt: {alt:.2f} m"
-        except Exception:
+        snapshot = self.controller.telemetry.snapshot()
+        gps, bat, att = snapshot.gps, snapshot.battery, snapshot.attitude
+        if gps and gps.lat is not None and gps.alt is not None:
+            gps = f"Lat: {gps.lat:.6f}, Lon: {gps.lon:.6f}, Alt: {gps.alt:.2f} m"
+        else:
             gps = "GPS bilgisi alınamadı."
-        try:
-            bat = self.controller.vehicle.battery
+        if bat:
             battery = f"Voltage: {bat.voltage} V, Current: {bat.current} A, Level: {bat.level} %"
-        except Exception:
+        else:
             battery = "Batarya bilgisi alınamadı."
-        try:
-            att = self.controller.vehicle.attitude
+        if att:
             attitude = (
                 f"Roll: {att.roll:.2f}, Pitch: {att.pitch:.2f}, Yaw: {att.yaw:.2f}"
             )
-        except Exception:
+        else:
             attitude = "Attitude bilgisi alınamadı."
         telemetry_str = (
             f"Control Mode: {self.mode}\n"
@@ -307,185 +335,13 @@ class DroneGUI:
         self.telemetry_label.config(text=telemetry_str)
         self.root.after(1000, self.update_telemetry)
 
-    def check_intersection_api(self):
-        if not self.connected or self.mode != "autonomous":
-            self.root.after(1000, self.check_intersection_api)
-            return
-
-        def fetch():
-            try:
-                response = requests.get(
-                    "http://10.225.217.213:8000/intersection", timeout=1
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("is_intersection", False):
-                        self.root.after(
-                            0,
-                            lambda:
-                            self.log(
-                                "4’lü kavşak tespit edildi! Drone durduruluyor..."
-                            ),
-                        )
-                        asyncio.run_coroutine_threadsafe(
-                            self.controller.stop(), self.async_loop
-                        )
-                        details_response = requests.get(
-                            "http://localhost:5000/intersection_details", timeout=1
-                        )
-                        if details_response.status_code == 200:
-                            details = details_response.json()
-                            angle = details.get("angle")
-                            distance = details.get("distance")
-                            self.root.after(
-                                0,
-                                lambda:
-                                self.log(
-                                    f"Kavşak detayları: Açısı = {angle:.2f}, Mesafe = {distance:.2f}"
-                                ),
-                            )
-                            asyncio.run_coroutine_threadsafe(
-                                self.controller.turn_by_angle(angle), self.async_loop
-                            )
-                            asyncio.run_coroutine_threadsafe(
-                                self.controller.move_distance(distance), self.async_loop
-                            )
-                        else:
-                            self.root.after(
-                                0, lambda: self.log("Intersection details API hatalı.")
-                            )
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Intersection API hatası: {e}"))
-
-        threading.Thread(target=fetch, daemon=True).start()
-        self.root.after(1000, self.check_intersection_api)
-
-    def check_image_analysis_api(self):
-        if not self.connected or self.mode != "autonomous":
-            self.root.after(1000, self.check_image_analysis_api)
-            return
+    def _update_detectors(self):
+        self.detectors.set_active(self.connected and self.mode == "autonomous")
 
-        def fetch():
+    def _show_detector_messages(self):
+        while True:
             try:
-                response = requests.get(
-                    "http://localhost:5000/image_analysis", timeout=1
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    analysis_info = f"Görüntü Analizi: {data.get('analysis')}, Sayım: {data.get('count')}"
-                    self.root.after(0, lambda: self.log(analysis_info))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Görüntü analiz API hatası: {e}"))
-
-        threading.Thread(target=fetch, daemon=True).start()
-        self.root.after(1000, self.check_image_analysis_api)
-
-    def check_crowd_api(self):
-        if not self.connected or self.mode != "autonomous":
-            self.root.after(2000, self.check_crowd_api)
-            return
-
-        def fetch():
-            try:
-                response = requests.get(
-                    "http://localhost:5000/crowd_details", timeout=1
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("crowd_found", False):
-                        angle = data.get("angle")
-                        distance = data.get("distance")
-                        self.root.after(
-                            0,
-                            lambda:
-                            self.log(
-                                f"Kalabalık alan tespit edildi: Açısı = {angle:.2f}, Mesafe = {distance:.2f}"
-                            ),
-                        )
-                        asyncio.run_coroutine_threadsafe(
-                            self.controller.turn_by_angle(angle), self.async_loop
-                        )
-                        asyncio.run_coroutine_threadsafe(
-                            self.controller.move_distance(distance), self.async_loop
-                        )
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Crowd API hatası: {e}"))
-
-        threading.Thread(target=fetch, daemon=True).start()
-        self.root.after(2000, self.check_crowd_api)
-
-    def check_path_api(self):
-        if not self.connected or self.mode != "autonomous":
-            self.root.after(1000, self.check_path_api)
-            return
-
-        def fetch():
-            try:
-                response = requests.get(
-                    "http://localhost:5000/path_direction", timeout=1
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    angle = data.get("angle")
-                    distance = data.get("distance")
-                    self.root.after(
-                        0,
-                        lambda:
-                        self.log(
-                            f"Yol tespiti: Açısı = {angle:.2f}, Mesafe = {distance:.2f}"
-                        ),
-                    )
-                    asyncio.run_coroutine_threadsafe(
-                        self.controller.turn_by_angle(angle), self.async_loop
-                    )
-                    asyncio.run_coroutine_threadsafe(
-                        self.controller.move_distance(distance), self.async_loop
-                    )
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Path API hatası: {e}"))
-
-        threading.Thread(target=fetch, daemon=True).start()
-        self.root.after(1000, self.check_path_api)
-
-    def check_traffic_analysis_api(self):
-        if not self.connected or self.mode != "autonomous":
-            self.root.after(30000, self.check_traffic_analysis_api)
-            return
-
-        def fetch():
-            try:
-                response = requests.get(
-                    "http://localhost:5000/analyze_traffic", timeout=2
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    busiest_road = data.get("busiest_road")
-                    vehicle_count = data.get("vehicle_count")
-                    pedestrian_count = data.get("pedestrian_count")
-                    self.root.after(
-                        0,
-                        lambda:
-                        self.log(
-                            f"Trafik Analizi: En kalabalık yol = {busiest_road}, Araç = {vehicle_count}, Yaya = {pedestrian_count}"
-                        ),
-                    )
-                    opt_response = requests.get(
-                        "http://localhost:5000/optimize_traffic_lights", timeout=2
-                    )
-                    if opt_response.status_code == 200:
-                        opt_data = opt_response.json()
-                        self.root.after(
-                            0,
-                            lambda: self.log(
-                                f"Akıllı Trafik Işığı: {opt_data.get('status')}"
-                            ),
-                        )
-                    else:
-                        self.root.after(
-                            0, lambda: self.log("Trafik analizi API hatalı.")
-                        )
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Trafik analizi API hatası: {e}"))
-
-        threading.Thread(target=fetch, daemon=True).start()
-        self.root.after(30000, self.check_traffic_analysis_api)
+                self.log(self.detectors.messages.get_nowait())
+            except queue.Empty:
+                break
+        self.root.after(DETECTOR_LOG_MS, self._show_detector_messages)
@@ -0,0 +1,193 @@
+import queue
+import threading
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+
+def decode_frame(data, size):
+    """
+    JPEG'i size kutusuna sığacak şekilde çözer. Kare kutudan büyükse taslak
+    (draft) kipi DCT ölçeklemesiyle doğrudan küçük boyutta açar. Çözme
+    burada tamamlanır; Tk thread'ine yalnızca hazır piksel verisi geçer.
+    bytes verilirse BytesIO aynı arabelleği paylaşır, kopya yapılmaz.
+    """
+    image = Image.open(BytesIO(data))
+    width, height = size
+    if image.width > width or image.height > height:
+        image.draft("RGB", (width, height))
+        image = image.convert("RGB")
+        image.thumbnail((width, height), Image.BILINEAR)
+    else:
+        image = image.convert("RGB")
+    return image
+
+
+class VideoConsumer(threading.Thread):
+    """
+    Kamera karelerini tek bir uzun ömürlü thread'de alır. /camera_feed
+    long-poll ile (after=son sıra numarası) çağrılır; sunucu her yanıtta
+    en yeni kareyi verdiği için istemci yavaşladığında ara kareler sunucuda
+    atlanır, gecikme birikmez. Bağlantı oturum boyunca yeniden kullanılır
+    ve aynı anda en fazla bir istek vardır.
+
+    frames verilirse (süreç içi FrameBuffer) HTTP hiç kullanılmaz: thread
+    kare veriyoluna abone olur, yayımlanan karenin baytlarını kopyalamadan
+    alır ve yalnızca en yenisini çözer. API ile GUI aynı süreçteyken
+    kullanılır; HTTP uzak izleyiciler içindir.
+
+    Çözülen kare tek bir yuvada tutulur; Tk thread'i take() ile alır.
+    Yuvadaki kare alınmadan yeni kare istenmez, böylece çözme işi gösterim
+    hızını aşmaz. Gösterilmeden üzerine yazılan kareler "dropped" sayılır.
+    ready() yuvada alınmamış kare olup olmadığını kilitsiz söyler; Tk
+    thread'i boşta kaldıkça yoklamayı seyreltmek için kullanır.
+    """
+
+    def __init__(
+        self,
+        url="http://localhost:5000/camera_feed",
+        size=(640, 480),
+        poll_timeout=5.0,
+        retry_delay=0.5,
+        session=None,
+        frames=None,
+    ):
+        super().__init__(name="video-consumer", daemon=True)
+        self.url = url
+        # Tk thread'i pencere boyutu değiştikçe günceller; tek referans ataması.
+        self.size = size
+        self.poll_timeout = poll_timeout
+        self.retry_delay = retry_delay
+        self.frames = frames
+        self.session = session or (requests.Session() if frames is None else None)
+        self.messages = queue.SimpleQueue()
+        self._slot = None
+        self._slot_lock = threading.Lock()
+        self._taken = threading.Event()
+        self._incoming = None
+        self._arrived = threading.Event()
+        self._stopped = threading.Event()
+        self._status = None
+        self.seq = None
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def stop(self):
+        self._stopped.set()
+        self._arrived.set()
+
+    def ready(self):
+        # Tek referans okuması; take() öncesi ucuz denetim.
+        return self._slot is not None
+
+    def take(self):
+        """En yeni çözülmüş kare (seq, Image); yeni kare yoksa None."""
+        with self._slot_lock:
+            frame, self._slot = self._slot, None
+            self._taken.set()
+        return frame
+
+    def _report(self, status):
+        # Aynı durum tekrar tekrar loglanmaz.
+        if status != self._status:
+            self._status = status
+            if status is not None:
+                self.messages.put(status)
+
+    def run(self):
+        if self.frames is not None:
+            self._run_local()
+            return
+        try:
+            while not self._stopped.is_set():
+                delay = self.poll()
+                if delay:
+                    self._stopped.wait(delay)
+                self._wait_taken()
+        finally:
+            self.session.close()
+
+    def _on_frame(self, frame):
+        # Yayımlayan thread'de çalışır: yalnızca referans ataması ve uyandırma.
+        self._incoming = frame
+        self._arrived.set()
+
+    def _run_local(self):
+        self.frames.subscribe(self._on_frame)
+        try:
+            latest = self.frames.latest()
+            if latest is not None:
+                self._on_frame(latest)
+            while not self._stopped.is_set():
+                self._arrived.wait()
+                self._arrived.clear()
+                frame, self._incoming = self._incoming, None
+                if frame is None or (self.seq is not None and frame.seq <= self.seq):
+                    continue
+                self._deliver(frame.seq, frame.data, self.size)
+                self._wait_taken()
+        finally:
+            self.frames.unsubscribe(self._on_frame)
+
+    def _wait_taken(self):
+        while not self._stopped.is_set():
+            with self._slot_lock:
+                if self._slot is None:
+                    return
+                self._taken.clear()
+            self._taken.wait(0.1)
+
+    def poll(self):
+        """Tek bir istek; sonraki istekten önce beklenecek süreyi döndürür."""
+        width, height = self.size
+        params = {"w": width, "h": height}
+        if self.seq is not None:
+            params["after"] = self.seq
+            params["timeout"] = self.poll_timeout
+        try:
+            response = self.session.get(
+                self.url, params=params, timeout=(1.0, self.poll_timeout + 2.0)
+            )
+        except requests.RequestException as e:
+            self.errors += 1
+            # Sunucu yeniden başlamış olabilir; sıra numaraları baştan başlar.
+            self.seq = None
+            self._report(f"Görüntü alınamadı: {e}")
+            return self.retry_delay
+        if response.status_code == 204:
+            return 0  # Zaman aşımı: yeni kare yok, tekrar beklenir.
+        if response.status_code == 503:
+            self._report("Kamera akışı bekleniyor...")
+            return self.retry_delay
+        if response.status_code != 200:
+            self.errors += 1
+            self._report(f"Kamera hatası: {response.status_code}")
+            return self.retry_delay
+        seq = int(response.headers.get("X-Frame-Seq", 0))
+        self._deliver(seq, response.content, (width, height))
+        return 0
+
+    def _deliver(self, seq, data, size):
+        try:
+            image = decode_frame(data, size)
+        except Exception as e:
+            self.errors += 1
+            self._report(f"Kare çözülemedi: {e}")
+            return
+        self.seq = seq
+        self.received += 1
+        with self._slot_lock:
+            if self._slot is not None:
+                self.dropped += 1
+            self._slot = (seq, image)
+        self._report(None)
+
+    def stats(self):
+        return {
+            "seq": self.seq,
+            "received": self.received,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
@@ -1,11 +1,14 @@
+import argparse
 import asyncio
 import threading
 import tkinter as tk
 import uvicorn
 
-from core.drone_controller import RealDroneController
+from core.executor import CountingExecutor
+from core.fleet import Fleet
 from gui.main_window import DroneGUI
-from api.endpoints import setup_api_endpoints
+from api.endpoints import frame_buffer, setup_api_endpoints
+from workers import serve
 
 
 def run_api(app):
@@ -13,27 +16,64 @@ def run_api(app):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    # 1'den fazlaysa API ayrı worker süreçlerinde çalışır; araçla yine
+    # yalnızca bu süreç konuşur.
+    parser.add_argument("--workers", type=int, default=1)
+    # Araç yerine kaydedilmiş bir uçuş oturumu oynatılır.
+    parser.add_argument("--replay", metavar="SESSION_DIR")
+    parser.add_argument("--replay-speed", type=float, default=1.0)
+    args = parser.parse_args()
+
     # Asenkron olay döngüsünü ayarla ve ayrı bir thread'de çalıştır
     async_loop = asyncio.new_event_loop()
     threading.Thread(target=async_loop.run_forever, daemon=True).start()
 
-    # Drone kontrolcüsünü başlat
+    # Drone filosunu başlat
     # Bağlantı dizesini simülasyon için güncelleyin
     # Mission Planner SITL için: "udp:127.0.0.1:14550"
-    drone_controller = RealDroneController(connection_string="udp:127.0.0.1:14550")
+    # Ek araçlar için: fleet.add("iha2", "udp:127.0.0.1:14560")
+    fleet = Fleet()
+    # Uçuş kayıtları flight_logs/<araç>/<oturum>/ altına yazılır.
+    if args.replay:
+        drone_controller = fleet.add_replay(
+            "iha1", args.replay, speed=args.replay_speed
+        )
+    else:
+        drone_controller = fleet.add(
+            "iha1", "udp:127.0.0.1:14550", flight_log_dir="flight_logs"
+        )
+    # Bağlantılar arka planda kurulur; API ve GUI aracı beklemeden açılır.
+    fleet.start(async_loop)
 
-    # FastAPI uygulamasını ve endpoint'lerini ayarla
-    app = setup_api_endpoints(drone_controller)
+    # GUI kameraya süreç içinden abone olur; worker'larla çalışırken
+    # kareler worker süreçlerine geldiği için HTTP ile alınır.
+    local_frames = None
+    if args.workers > 1:
+        shared_state, api_process = serve(fleet, async_loop, args.workers)
+    else:
+        local_frames = frame_buffer
+        # FastAPI uygulamasını ve endpoint'lerini ayarla
+        app = setup_api_endpoints(
+            drone_controller,
+            fleet=fleet,
+            executor=CountingExecutor(thread_name_prefix="api"),
+        )
 
-    # API sunucusunu ayrı bir thread'de başlat
-    api_thread = threading.Thread(target=run_api, args=(app,), daemon=True)
-    api_thread.start()
+        # API sunucusunu ayrı bir thread'de başlat
+        api_thread = threading.Thread(target=run_api, args=(app,), daemon=True)
+        api_thread.start()
 
     # Tkinter tabanlı GUI'yi başlat
     root = tk.Tk()
-    app_gui = DroneGUI(root, drone_controller, async_loop)
+    app_gui = DroneGUI(root, drone_controller, async_loop, frames=local_frames)
     
     # Video akışını başlatmak için bu satırın yorumunu kaldırabilirsiniz
     # app_gui.update_video() 
     
     root.mainloop()
+
+    if args.workers > 1:
+        api_process.terminate()
+        api_process.wait()
+        shared_state.close()
@@ -0,0 +1,129 @@
+"""
+API'yi uvicorn --workers ile birden çok süreçte çalıştırma.
+
+Bu modülü çağıran süreç bağlantı sahibidir: filoyu barındırır, MAVLink ile
+yalnızca o konuşur. serve() paylaşılan bellek segmentlerini (telemetri,
+kare halkası, sayaç) ve yerel çağrı kanalını kurar, ardından uvicorn'u ayrı
+bir süreç olarak başlatır. Her worker create_app() ile bu duruma bağlanır:
+okumalar paylaşılan bellekten, komutlar çağrı kanalından gider.
+
+Worker'lar arası paylaşılmayanlar: istek sınırlama kovaları (sınırlar worker
+başınadır), ölçekli kare kopyaları önbelleği ve rota gecikme ölçümleri.
+Araç kimlikleri başlangıçta sabitlenir: paylaşılan telemetri segmenti
+araç sayısına göre açılır. Bu yüzden SharedState kurulduktan sonra filoya
+araç eklemek ya da çıkarmak RuntimeError verir.
+"""
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from api import endpoints
+from api.jobs import JobManager, JobService, RemoteJobs
+from core.executor import CountingExecutor
+from core.ipc import LinkClient, LinkOwner, RemoteFleet
+from core.shm import SharedCounter, SharedFrameStore, SharedTelemetry
+
+STATE_ENV = "UAV_SHARED_STATE"
+
+
+class SharedState:
+    """Bağlantı sahibi süreçte worker'larla paylaşılan her şey."""
+
+    def __init__(self, fleet, loop, frame_capacity=50, max_frame_bytes=1 << 20, log=print):
+        fleet.freeze("API birden çok worker ile çalışıyor")
+        self._dir = tempfile.mkdtemp(prefix="uav-api-")
+        self.telemetry = SharedTelemetry(fleet.ids(), create=True)
+        self._publishers = []
+        for vehicle_id, controller in fleet.items():
+            publish = self.telemetry.publisher(vehicle_id)
+            publish(controller.telemetry.snapshot())
+            controller.telemetry.subscribe(publish)
+            self._publishers.append((controller.telemetry, publish))
+        self.frames = SharedFrameStore(
+            capacity=frame_capacity,
+            max_frame_bytes=max_frame_bytes,
+            lock_path=os.path.join(self._dir, "frames.lock"),
+            create=True,
+        )
+        self.counter = SharedCounter(
+            lock_path=os.path.join(self._dir, "counter.lock"), create=True
+        )
+        self.authkey = secrets.token_bytes(32)
+        self.owner = LinkOwner(
+            fleet,
+            os.path.join(self._dir, "link.sock"),
+            self.authkey,
+            loop,
+            services={"jobs": JobService(JobManager(), fleet)},
+            log=log,
+        )
+        self.spec = {
+            "address": self.owner.address,
+            "authkey": self.authkey.hex(),
+            "vehicles": fleet.ids(),
+            "default": fleet.default_id,
+            "telemetry": self.telemetry.name,
+            "frames": self.frames.name,
+            "frame_capacity": frame_capacity,
+            "max_frame_bytes": max_frame_bytes,
+            "frames_lock": self.frames.lock_path,
+            "counter": self.counter.name,
+            "counter_lock": self.counter.lock_path,
+        }
+
+    def environ(self):
+        # Ortam değişkenleri yalnızca aynı kullanıcının süreçlerince okunabilir.
+        return {STATE_ENV: json.dumps(self.spec)}
+
+    def close(self):
+        for telemetry, publish in self._publishers:
+            telemetry.unsubscribe(publish)
+        self.owner.close()
+        self.telemetry.close()
+        self.frames.close()
+        self.counter.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def create_app():
+    """uvicorn fabrikası: her worker sürecinde bir kez çağrılır."""
+    spec = json.loads(os.environ[STATE_ENV])
+    client = LinkClient(spec["address"], bytes.fromhex(spec["authkey"]))
+    telemetry = SharedTelemetry(spec["vehicles"], name=spec["telemetry"])
+    fleet = RemoteFleet(client, spec["vehicles"], telemetry, spec["default"])
+    endpoints.share_state(
+        frame_store=SharedFrameStore(
+            spec["frames"],
+            capacity=spec["frame_capacity"],
+            max_frame_bytes=spec["max_frame_bytes"],
+            lock_path=spec["frames_lock"],
+        ),
+        counter_store=SharedCounter(spec["counter"], lock_path=spec["counter_lock"]),
+        job_manager=RemoteJobs(
+            lambda method, *args: client.call(("service", "jobs"), method, *args)
+        ),
+    )
+    return endpoints.setup_api_endpoints(
+        fleet.default, fleet=fleet, executor=CountingExecutor(thread_name_prefix="api")
+    )
+
+
+def serve(fleet, loop, workers, host="0.0.0.0", port=5000, **state_options):
+    """
+    Paylaşılan durumu kurar ve uvicorn'u workers süreçle başlatır. Dönen
+    (SharedState, Popen) çifti kapanışta kapatılmalıdır.
+    """
+    state = SharedState(fleet, loop, **state_options)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "workers:create_app", "--factory",
+            "--workers", str(workers), "--host", host, "--port", str(port),
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=dict(os.environ, **state.environ()),
+    )
+    return state, process
@@ -0,0 +1,107 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.api.admission import (
+    COMMAND,
+    MOTION,
+    SAFETY,
+    AdmissionControl,
+    LaneLimit,
+    TokenBucket,
+    retry_after_header,
+)
+from src.core.commands import CommandQueue
+from src.core.telemetry import TelemetryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeController:
+    def __init__(self):
+        self.telemetry = TelemetryCache()
+        self.commands = CommandQueue(log=lambda message: None)
+
+    def submit(self, name, *args):
+        return self.commands.submit(name, lambda: getattr(self, name)(*args))
+
+    async def move_3d(self, *args):
+        return True
+
+    async def stop(self):
+        return True
+
+
+class TestAdmissionControl(unittest.TestCase):
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=2.0, capacity=2.0, now=0.0)
+        self.assertEqual(bucket.take(0.0), 0.0)
+        self.assertEqual(bucket.take(0.0), 0.0)
+        self.assertAlmostEqual(bucket.take(0.0), 0.5)
+        self.assertEqual(bucket.take(0.5), 0.0)
+
+    def test_rate_limit_is_per_client(self):
+        clock = FakeClock()
+        control = AdmissionControl({MOTION: LaneLimit(1.0, 2.0, None)}, clock=clock)
+        for _ in range(2):
+            self.assertIsNone(control.admit("a", MOTION))
+            control.release(MOTION)
+        reason, retry = control.admit("a", MOTION)
+        self.assertEqual(reason, "rate")
+        self.assertAlmostEqual(retry, 1.0)
+        self.assertIsNone(control.admit("b", MOTION))
+        control.release(MOTION)
+        clock.now = 1.0
+        self.assertIsNone(control.admit("a", MOTION))
+        self.assertEqual(control.stats()["rejected"]["motion.rate"], 1)
+
+    def test_inflight_bound_and_safety_lane(self):
+        control = AdmissionControl({COMMAND: LaneLimit(None, None, 1)})
+        self.assertIsNone(control.admit("a", COMMAND))
+        self.assertEqual(control.admit("b", COMMAND)[0], "busy")
+        control.release(COMMAND)
+        self.assertIsNone(control.admit("b", COMMAND))
+        for _ in range(1000):
+            self.assertIsNone(control.admit("a", SAFETY))
+        self.assertEqual(retry_after_header(0.2), "1")
+        self.assertEqual(retry_after_header(2.1), "3")
+
+    def test_prune_keeps_client_table_bounded(self):
+        clock = FakeClock()
+        control = AdmissionControl(max_clients=10, clock=clock)
+        for i in range(10):
+            control.admit(f"client{i}", MOTION)
+            control.release(MOTION)
+        clock.now = 100.0
+        control.admit("late", MOTION)
+        self.assertEqual(control.stats()["clients"], 1)
+
+
+class TestAdmissionEndpoints(unittest.TestCase):
+
+    def test_flood_gets_429_but_stop_passes(self):
+        endpoints.admission_control = AdmissionControl({MOTION: LaneLimit(1.0, 3.0, None)})
+        with TestClient(endpoints.setup_api_endpoints(FakeController())) as client:
+            codes = [
+                client.get("/move3d?velocity_x=1&velocity_y=0&velocity_z=0").status_code
+                for _ in range(5)
+            ]
+            self.assertEqual(codes, [200, 200, 200, 429, 429])
+            response = client.get("/move3d?velocity_x=1&velocity_y=0&velocity_z=0")
+            self.assertEqual(response.headers["Retry-After"], "1")
+            self.assertEqual(client.get("/stop").status_code, 200)
+            stats = client.get("/admission").json()
+        self.assertEqual(stats["rejected"]["motion.rate"], 3)
+        self.assertEqual(stats["inflight"], {"safety": 0, "motion": 0, "command": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
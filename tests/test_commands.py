@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import unittest
+
+from src.core.commands import CommandQueue
+
+
+class TestCommandQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = CommandQueue(log=lambda message: None)
+        self.started = []
+
+    def command(self, name, duration=0.0, result=True):
+        async def run():
+            self.started.append(name)
+            await asyncio.sleep(duration)
+            return result
+
+        return run
+
+    def run_async(self, scenario):
+        async def wrapper():
+            self.queue.start()
+            try:
+                await scenario()
+            finally:
+                await self.queue.close()
+
+        asyncio.run(wrapper())
+
+    def test_runs_commands_and_returns_results(self):
+        async def scenario():
+            future = self.queue.submit("arm_and_takeoff", self.command("takeoff", result=7))
+            self.assertEqual(await asyncio.wrap_future(future), 7)
+            self.assertEqual(self.queue.stats()["executed"], 1)
+
+        self.run_async(scenario)
+
+    def test_pending_motion_is_replaced(self):
+        async def scenario():
+            first = self.queue.submit("arm_and_takeoff", self.command("takeoff", 0.05))
+            moves = [
+                self.queue.submit("move_3d", self.command(f"move{i}")) for i in range(20)
+            ]
+            self.assertEqual(self.queue.stats()["depth"], 2)
+            self.assertTrue(await asyncio.wrap_future(first))
+            results = [await asyncio.wrap_future(f) for f in moves]
+            self.assertEqual(results, [False] * 19 + [True])
+            self.assertEqual(self.started, ["takeoff", "move19"])
+            self.assertEqual(self.queue.stats()["dropped"], 19)
+
+        self.run_async(scenario)
+
+    def test_new_motion_interrupts_running_motion(self):
+        async def scenario():
+            slow = self.queue.submit("move_distance", self.command("slow", 60))
+            await asyncio.sleep(0.01)
+            fast = self.queue.submit("turn_by_angle", self.command("turn"))
+            self.assertTrue(await asyncio.wait_for(asyncio.wrap_future(fast), 1))
+            self.assertFalse(await asyncio.wrap_future(slow))
+            self.assertEqual(self.queue.stats()["cancelled"], 1)
+
+        self.run_async(scenario)
+
+    def test_stop_preempts_everything(self):
+        async def scenario():
+            running = self.queue.submit("move_3d", self.command("move", 60))
+            await asyncio.sleep(0.01)
+            queued = self.queue.submit("arm_and_takeoff", self.command("takeoff"))
+            stop = self.queue.submit("stop", self.command("stop"))
+            self.assertTrue(await asyncio.wait_for(asyncio.wrap_future(stop), 1))
+            self.assertFalse(await asyncio.wrap_future(running))
+            self.assertFalse(await asyncio.wrap_future(queued))
+            self.assertEqual(self.started, ["move", "stop"])
+
+        self.run_async(scenario)
+
+    def test_repeated_stop_shares_result(self):
+        async def scenario():
+            running = self.queue.submit("arm_and_takeoff", self.command("takeoff", 60))
+            await asyncio.sleep(0.01)
+            first = self.queue.submit("stop", self.command("stop", 0.05))
+            await asyncio.sleep(0.01)
+            pending = self.queue.submit("stop", self.command("stop again"))
+            repeated = self.queue.submit("stop", self.command("stop once more"))
+            results = await asyncio.gather(
+                *(asyncio.wrap_future(f) for f in (first, pending, repeated))
+            )
+            self.assertEqual(results, [True, True, True])
+            self.assertFalse(await asyncio.wrap_future(running))
+            self.assertEqual(self.started, ["takeoff", "stop", "stop again"])
+            self.assertEqual(self.queue.stats()["dropped"], 0)
+
+        self.run_async(scenario)
+
+    def test_motion_does_not_interrupt_land(self):
+        async def scenario():
+            land = self.queue.submit("land", self.command("land", 0.05))
+            await asyncio.sleep(0.01)
+            move = self.queue.submit("move_3d", self.command("move"))
+            self.assertTrue(await asyncio.wrap_future(land))
+            self.assertTrue(await asyncio.wrap_future(move))
+            self.assertEqual(self.started, ["land", "move"])
+
+        self.run_async(scenario)
+
+    def test_cancel_pending_and_running(self):
+        async def scenario():
+            running = self.queue.submit("arm_and_takeoff", self.command("takeoff", 60))
+            queued = self.queue.submit("arm_and_takeoff", self.command("again"))
+            await asyncio.sleep(0.01)
+            self.assertEqual(self.queue.cancel(queued), "pending")
+            self.assertFalse(await asyncio.wrap_future(queued))
+            self.assertEqual(self.queue.cancel(running), "running")
+            self.assertFalse(await asyncio.wait_for(asyncio.wrap_future(running), 1))
+            self.assertIsNone(self.queue.cancel(running))
+            land = self.queue.submit("land", self.command("land", 0.05))
+            await asyncio.sleep(0.01)
+            # Çalışan iniş kesilemez.
+            self.assertIsNone(self.queue.cancel(land))
+            self.assertTrue(await asyncio.wrap_future(land))
+            self.assertEqual(self.started, ["takeoff", "land"])
+
+        self.run_async(scenario)
+
+    def test_submit_from_other_thread(self):
+        async def scenario():
+            futures = []
+            thread = threading.Thread(
+                target=lambda: futures.append(
+                    self.queue.submit("move_3d", self.command("move"))
+                )
+            )
+            thread.start()
+            thread.join()
+            self.assertTrue(await asyncio.wrap_future(futures[0]))
+
+        self.run_async(scenario)
+
+    def test_exception_propagates(self):
+        async def failing():
+            raise RuntimeError("bağlantı yok")
+
+        async def scenario():
+            future = self.queue.submit("arm_and_takeoff", failing)
+            with self.assertRaises(RuntimeError):
+                await asyncio.wrap_future(future)
+
+        self.run_async(scenario)
+
+    def test_submit_without_loop_fails_fast(self):
+        future = self.queue.submit("move_3d", self.command("move"))
+        self.assertFalse(future.result(timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.core.conditions import VehicleConditions
+
+
+class TestVehicleConditions(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_vehicle = MagicMock()
+        self.mock_vehicle.armed = False
+        self.conditions = VehicleConditions()
+        self.conditions.attach(self.mock_vehicle)
+
+    def test_attach_registers_listeners_once(self):
+        attrs = [c.args[0] for c in self.mock_vehicle.add_attribute_listener.call_args_list]
+        msgs = [c.args[0] for c in self.mock_vehicle.add_message_listener.call_args_list]
+        self.assertEqual(tuple(attrs), VehicleConditions.ATTRIBUTES)
+        self.assertEqual(tuple(msgs), VehicleConditions.MESSAGES)
+
+    def test_resolves_on_matching_event(self):
+        future = self.conditions.wait_for(lambda v, n, x: v.armed, ("armed",))
+        self.assertFalse(future.done())
+        self.mock_vehicle.armed = True
+        self.conditions._on_event(self.mock_vehicle, "mode", None)
+        self.assertFalse(future.done())
+        self.conditions._on_event(self.mock_vehicle, "armed", True)
+        self.assertEqual(future.result(timeout=0).name, "armed")
+        self.assertEqual(self.conditions._waiters, ())
+
+    def test_resolves_immediately_when_already_true(self):
+        self.mock_vehicle.armed = True
+        future = self.conditions.wait_for(lambda v, n, x: v.armed, ("armed",))
+        self.assertTrue(future.done())
+        self.assertIsNone(future.result().name)
+
+    def test_message_value_is_passed(self):
+        ack = MagicMock(command=400, result=4)
+        future = self.conditions.wait_for(
+            lambda v, n, x: n == "COMMAND_ACK" and x.command == 400, ("COMMAND_ACK",)
+        )
+        self.conditions._on_event(self.mock_vehicle, "COMMAND_ACK", ack)
+        self.assertIs(future.result(timeout=0).value, ack)
+
+    def test_cancel_removes_waiter(self):
+        future = self.conditions.wait_for(lambda v, n, x: False, ("armed",))
+        future.cancel()
+        self.assertEqual(self.conditions._waiters, ())
+        self.conditions._on_event(self.mock_vehicle, "armed", True)
+
+    def test_predicate_errors_are_ignored(self):
+        future = self.conditions.wait_for(lambda v, n, x: 1 / 0, ("heading",))
+        self.conditions._on_event(self.mock_vehicle, "heading", 10)
+        self.assertFalse(future.done())
+
+
+if __name__ == '__main__':
+    unittest.main()
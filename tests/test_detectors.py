@@ -0,0 +1,190 @@
+import asyncio
+import unittest
+
+import httpx
+
+from src.gui.detectors import Detector, DetectorPoller, on_intersection, on_path
+
+
+class FakeController:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, name, *args, **kwargs):
+        self.submitted.append((name,) + args)
+
+
+class FakeService:
+    """Yolu URL'ye göre yanıtlayan sahte servis; gelen istekleri kaydeder."""
+
+    def __init__(self, routes):
+        self.routes = {path: list(responses) for path, responses in routes.items()}
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        response = self.routes[request.url.path].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_poller(service, detectors):
+    controller = FakeController()
+    poller = DetectorPoller(
+        controller,
+        asyncio.get_running_loop(),
+        detectors=detectors,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(service)),
+    )
+    return poller, controller
+
+
+async def record(poller, data):
+    poller.log(data["value"])
+
+
+class TestDetectorPoller(unittest.TestCase):
+
+    def test_interval_adapts_to_changes(self):
+        service = FakeService(
+            {
+                "/path": [
+                    httpx.Response(200, json={"value": "a"}),
+                    httpx.Response(200, json={"value": "a"}),
+                    httpx.Response(200, json={"value": "a"}),
+                    httpx.Response(200, json={"value": "b"}),
+                ]
+            }
+        )
+        detector = Detector("Path API", "http://svc/path", record, 1.0, 2.0)
+
+        async def scenario():
+            poller, _ = make_poller(service, [detector])
+            delays = [await poller.poll(detector) for _ in range(4)]
+            return poller, delays
+
+        poller, delays = asyncio.run(scenario())
+        self.assertEqual(delays, [1.0, 1.5, 2.0, 1.0])
+        # Değişmeyen sonuç işlenmez.
+        self.assertEqual(poller.messages.get_nowait(), "a")
+        self.assertEqual(poller.messages.get_nowait(), "b")
+        self.assertTrue(poller.messages.empty())
+        self.assertEqual(poller.stats()["Path API"]["unchanged"], 2)
+
+    def test_etag_and_errors(self):
+        service = FakeService(
+            {
+                "/image": [
+                    httpx.Response(200, json={"value": "a"}, headers={"ETag": '"1"'}),
+                    httpx.Response(304),
+                    httpx.ConnectError("kapalı"),
+                    httpx.ConnectError("kapalı"),
+                    httpx.Response(200, json={"value": "b"}),
+                ]
+            }
+        )
+        detector = Detector("Görüntü analiz API", "http://svc/image", record, 1.0, 5.0)
+
+        async def scenario():
+            poller, _ = make_poller(service, [detector])
+            delays = [await poller.poll(detector) for _ in range(5)]
+            return poller, delays
+
+        poller, delays = asyncio.run(scenario())
+        self.assertEqual(delays, [1.0, 1.5, 5.0, 5.0, 1.0])
+        self.assertEqual(service.requests[1].headers["If-None-Match"], '"1"')
+        messages = []
+        while not poller.messages.empty():
+            messages.append(poller.messages.get_nowait())
+        # Aynı hata bir kez loglanır.
+        self.assertEqual(messages, ["a", "Görüntü analiz API hatası: kapalı", "b"])
+
+    def test_long_poll(self):
+        service = FakeService(
+            {
+                "/crowd": [
+                    httpx.Response(200, json={"value": "a"}),
+                    httpx.Response(204),
+                ]
+            }
+        )
+        detector = Detector("Crowd API", "http://svc/crowd", record, 2.0, 6.0, long_poll="wait")
+
+        async def scenario():
+            poller, _ = make_poller(service, [detector])
+            return [await poller.poll(detector) for _ in range(2)]
+
+        self.assertEqual(asyncio.run(scenario()), [0, 0])
+        self.assertNotIn("wait", service.requests[0].url.params)
+        self.assertEqual(service.requests[1].url.params["wait"], "6.0")
+
+    def test_intersection_commands_go_to_controller(self):
+        service = FakeService(
+            {
+                "/intersection": [httpx.Response(200, json={"is_intersection": True})],
+                "/intersection_details": [
+                    httpx.Response(200, json={"angle": 90.0, "distance": 5.0})
+                ],
+            }
+        )
+        detector = Detector("Intersection API", "http://svc/intersection", on_intersection, 1.0)
+
+        async def scenario():
+            poller, controller = make_poller(service, [detector])
+            await poller.poll(detector)
+            return controller
+
+        controller = asyncio.run(scenario())
+        self.assertEqual(controller.submitted, [("stop",), ("fly_legs", [(90.0, 5.0)])])
+
+    def test_repeat_detector_keeps_following_steady_result(self):
+        steady = {"angle": 0.0, "distance": 3.0}
+        service = FakeService(
+            {
+                "/path": [
+                    httpx.Response(200, json=steady, headers={"ETag": '"1"'}),
+                    httpx.Response(200, json=steady),
+                    httpx.Response(304),
+                ]
+            }
+        )
+        detector = Detector("Path API", "http://svc/path", on_path, 1.0, 2.0, repeat=True)
+
+        async def scenario():
+            poller, controller = make_poller(service, [detector])
+            delays = [await poller.poll(detector) for _ in range(3)]
+            return poller, controller, delays
+
+        poller, controller, delays = asyncio.run(scenario())
+        # Değişmeyen sonuç aralığı uzatır ama komut her sorguda yinelenir.
+        self.assertEqual(delays, [1.0, 1.5, 2.0])
+        self.assertEqual(controller.submitted, [("fly_legs", [(0.0, 3.0)])] * 3)
+        self.assertEqual(poller.messages.get_nowait(), "Yol tespiti: Açısı = 0.00, Mesafe = 3.00")
+        self.assertTrue(poller.messages.empty())
+
+    def test_polls_only_while_active(self):
+        service = FakeService({"/path": [httpx.Response(200, json={"value": "a"})] * 20})
+        detector = Detector("Path API", "http://svc/path", record, 0.01)
+
+        async def scenario():
+            poller, _ = make_poller(service, [detector])
+            await poller._start()
+            await asyncio.sleep(0.05)
+            self.assertEqual(service.requests, [])
+            poller.set_active(True)
+            await asyncio.sleep(0.05)
+            poller.set_active(False)
+            await asyncio.sleep(0.02)
+            count = len(service.requests)
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(service.requests), count)
+            self.assertGreater(count, 0)
+            await poller._stop()
+            self.assertTrue(poller.client.is_closed)
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
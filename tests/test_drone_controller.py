@@ -1,90 +1,312 @@
+import asyncio
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
-import time
 
-# Assuming drone_controller.py is in src/core/
-from src.core.drone_controller import DroneController
+from src.core.drone_controller import RealDroneController
+from src.core.link import LinkState
+from src.core.recorder import COMMAND_CODES, KIND_COMMAND, FlightLogReader
+from src.core.simulator import SimulatorBackend
 
-class TestDroneController(unittest.TestCase):
 
-    @patch('src.core.drone_controller.connect')
-    def setUp(self, mock_connect):
-        # Mock the drone connection object
-        self.mock_vehicle = MagicMock()
-        mock_connect.return_value = self.mock_vehicle
-        self.controller = DroneController()
-        self.connection_string = "tcp:127.0.0.1:5760"
+class TestRealDroneController(unittest.TestCase):
+
+    def setUp(self):
+        # 20 kat hızlandırılmış simülatör: kalkış ve iniş saniyenin altında biter.
+        self.backend = SimulatorBackend(time_scale=20)
+        self.controller = RealDroneController(
+            "sim://", backend=self.backend, setpoint_rate_hz=50
+        )
+        self.controller.log = lambda message: None
+
+    def run_flight(self, scenario):
+        async def wrapper():
+            self.controller.start()
+            for _ in range(100):
+                if self.controller.connected:
+                    break
+                await asyncio.sleep(0.01)
+            try:
+                await scenario()
+            finally:
+                await self.controller.disconnect()
+
+        asyncio.run(wrapper())
+
+    @property
+    def vehicle(self):
+        return self.backend.vehicles[-1]
 
     def test_connect(self):
-        self.controller.connect(self.connection_string)
-        self.mock_vehicle.wait_ready.assert_called_once_with(True, timeout=60)
-        self.assertTrue(self.controller.is_connected)
-
-    def test_arm(self):
-        self.controller.connect(self.connection_string)
-        self.controller.arm()
-        self.mock_vehicle.armed = True
-        self.assertTrue(self.mock_vehicle.armed)
-
-    def test_takeoff(self):
-        self.controller.connect(self.connection_string)
-        self.controller.arm()
-        altitude = 10
-        self.controller.takeoff(altitude)
-        self.mock_vehicle.simple_takeoff.assert_called_once_with(altitude)
-        # Simulate reaching target altitude
-        self.mock_vehicle.location.global_relative_frame.alt = altitude
-        self.mock_vehicle.mode.name = 'GUIDED'
+        async def scenario():
+            self.assertTrue(self.controller.connected)
+            self.assertEqual(self.controller.link.state, LinkState.READY)
+
+        self.run_flight(scenario)
+        self.assertFalse(self.controller.connected)
+        self.assertEqual(self.controller.link.state, LinkState.DISCONNECTED)
+
+    def test_restart_reuses_first_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 1)
+        self.addCleanup(loop.call_soon_threadsafe, loop.stop)
+        self.controller.start(loop)
+        asyncio.run_coroutine_threadsafe(self.controller.disconnect(), loop).result(2)
+
+        async def reconnect():
+            # /connect gibi başka bir döngüden, döngü verilmeden çağrılır.
+            self.controller.start()
+            for _ in range(100):
+                if self.controller.link.running:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(reconnect())
+        self.assertIs(self.controller.link._task.get_loop(), loop)
+        asyncio.run_coroutine_threadsafe(self.controller.disconnect(), loop).result(2)
+
+    def test_disconnect_closes_flight_log(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.controller = RealDroneController(
+            "sim://", backend=self.backend, flight_log_dir=tmp.name, vehicle_id="iha1"
+        )
+        self.controller.log = lambda message: None
+        first = self.controller.recorder
+
+        async def scenario():
+            self.controller.start()
+            self.assertIn(first.record_telemetry, self.controller.telemetry._subscribers)
+            await self.controller.disconnect()
+            self.assertTrue(first.closed)
+            reader = FlightLogReader(first.path)
+            records = reader.read()
+            codes = records["code"][records["kind"] == KIND_COMMAND]
+            self.assertEqual(list(codes), [COMMAND_CODES["disconnect"]])
+            reader.close()
+            self.assertNotIn(first.record_telemetry, self.controller.telemetry._subscribers)
+            # Yeniden bağlanma yeni bir kayıt oturumu açar.
+            self.controller.start()
+            second = self.controller.recorder
+            self.assertNotEqual(second.path, first.path)
+            self.assertIn(second.record_telemetry, self.controller.telemetry._subscribers)
+            await self.controller.disconnect()
+            self.assertTrue(second.closed)
+
+        asyncio.run(scenario())
+
+    def test_arm_and_takeoff(self):
+        async def scenario():
+            self.assertTrue(await self.controller.arm_and_takeoff(10))
+            self.assertTrue(self.vehicle.armed)
+            self.assertEqual(self.vehicle.mode.name, "GUIDED")
+            self.assertGreaterEqual(self.vehicle.location.global_relative_frame.alt, 9.5)
+
+        self.run_flight(scenario)
+
+    def test_takeoff_times_out_when_not_armable(self):
+        self.backend.vehicle_kwargs["armable_delay"] = 1e6
+
+        async def scenario():
+            self.assertFalse(await self.controller.arm_and_takeoff(10, timeout=0.1))
+            self.assertFalse(self.vehicle.armed)
+
+        self.run_flight(scenario)
+
+    def test_move_3d(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            start = self.vehicle.location.global_relative_frame
+            self.assertTrue(await self.controller.move_3d(2, 0, 0, duration=5))
+            end = self.vehicle.location.global_relative_frame
+            self.assertGreater(end.lat, start.lat)
+            self.assertGreater(self.controller.mavlink_sent["SET_POSITION_TARGET_LOCAL_NED"], 0)
+
+        self.run_flight(scenario)
+
+    def test_new_move_preempts_previous(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            first = asyncio.ensure_future(self.controller.move_3d(1, 0, 0, duration=60))
+            await asyncio.sleep(0.05)
+            self.assertTrue(await self.controller.stop())
+            self.assertFalse(await first)
+
+        self.run_flight(scenario)
+
+    def test_preempted_move_releases_setpoint(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            move = self.controller.submit("move_distance", 20)
+            await asyncio.sleep(0.05)
+            turn = self.controller.submit("turn_by_angle", 90)
+            self.assertFalse(await asyncio.wrap_future(move))
+            target = self.controller.setpoints.target
+            self.assertTrue(target is None or (target.vx, target.vy, target.vz) == (0, 0, 0))
+            self.assertTrue(await asyncio.wrap_future(turn))
+
+        self.run_flight(scenario)
+
+    def test_stop_takes_fast_lane(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            self.controller.submit("move_3d", 1, 0, 0, duration=60)
+            await asyncio.sleep(0.05)
+            future = self.controller.submit("stop")
+            # Sıfır hız hedefi kuyruk çalışmadan, submit dönerken verilmiş olmalı.
+            target = self.controller.setpoints.target
+            self.assertEqual((target.vx, target.vy, target.vz), (0, 0, 0))
+            self.assertTrue(await asyncio.wrap_future(future))
+
+        self.run_flight(scenario)
+
+    def test_turn_by_angle(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            sent = self.controller.mavlink_sent
+            # Arm ve kalkış DroneKit setter'larıyla gider, yine de sayılır.
+            self.assertEqual((sent["SET_MODE"], sent["COMMAND_LONG"]), (1, 2))
+            self.assertTrue(await self.controller.turn_by_angle(90))
+            self.assertAlmostEqual(self.vehicle.heading, 90, delta=3)
+            self.assertEqual(sent["COMMAND_LONG"], 3)
+
+        self.run_flight(scenario)
 
     def test_land(self):
-        self.controller.connect(self.connection_string)
-        self.controller.land()
-        self.mock_vehicle.mode.name = 'LAND'
-        self.assertEqual(self.mock_vehicle.mode.name, 'LAND')
-
-    def test_goto(self):
-        self.controller.connect(self.connection_string)
-        self.controller.arm()
-        self.mock_vehicle.mode.name = 'GUIDED'
-        target_location = MagicMock()
-        target_location.lat = 34.0
-        target_location.lon = -118.0
-        target_location.alt = 50
-        self.controller.goto(target_location.lat, target_location.lon, target_location.alt)
-        self.mock_vehicle.simple_goto.assert_called_once()
-
-    def test_set_mode(self):
-        self.controller.connect(self.connection_string)
-        mode = 'RTL'
-        self.controller.set_mode(mode)
-        self.mock_vehicle.mode = MagicMock(name=mode)
-        self.assertEqual(self.mock_vehicle.mode.name, mode)
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            self.assertTrue(await self.controller.land())
+            self.assertFalse(self.vehicle.armed)
+            self.assertLess(self.vehicle.location.global_relative_frame.alt, 0.1)
+
+        self.run_flight(scenario)
+
+    def test_mission_in_auto_mode(self):
+        async def scenario():
+            waypoints = [(41.0002, 29.0, 10), (41.0002, 29.0003, 12)]
+            self.assertTrue(await self.controller.upload_mission(waypoints))
+            self.assertEqual(self.vehicle.commands.count, 3)
+            self.assertEqual(self.controller.mavlink_sent["MISSION_ITEM"], 3)
+            self.assertTrue(await self.controller.start_mission(timeout=120))
+            self.assertEqual(self.vehicle.mode.name, "AUTO")
+            status = self.controller.mission.status()
+            self.assertTrue(status["complete"])
+            self.assertEqual(status["reached"], [1, 2, 3])
+            location = self.vehicle.location.global_relative_frame
+            self.assertAlmostEqual(location.lat, 41.0002, places=4)
+            self.assertAlmostEqual(location.lon, 29.0003, places=4)
+
+        self.run_flight(scenario)
+
+    def test_fly_legs_on_ground_needs_altitude(self):
+        async def scenario():
+            self.assertFalse(await self.controller.fly_legs([(0, 5)]))
+            self.assertFalse(self.vehicle.armed)
+            self.assertEqual(self.vehicle.commands.count, 0)
+
+        self.run_flight(scenario)
+
+    def test_stop_cancels_queued_mission(self):
+        async def scenario():
+            waypoints = [(41.002, 29.0, 10)]
+            self.assertTrue(
+                await asyncio.wrap_future(self.controller.submit("upload_mission", waypoints))
+            )
+            mission = self.controller.submit("start_mission", timeout=120)
+            for _ in range(200):
+                if self.vehicle.mode.name == "AUTO":
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.vehicle.mode.name, "AUTO")
+            self.assertTrue(await asyncio.wrap_future(self.controller.submit("stop")))
+            # Görev komutu kesilir ve araç AUTO'dan çıkarılır.
+            self.assertFalse(await asyncio.wrap_future(mission))
+            self.assertEqual(self.vehicle.mode.name, "GUIDED")
+            self.assertFalse(self.controller.mission.status()["complete"])
+
+        self.run_flight(scenario)
+
+    def test_mission_requires_upload(self):
+        async def scenario():
+            self.assertFalse(await self.controller.start_mission())
+
+        self.run_flight(scenario)
+
+    def no_fly_zone_ahead(self, distance=20, radius=10):
+        # Aracın 20 m kuzeyinde 10 m yarıçaplı yasak bölge.
+        lat = 41.0 + distance / 111000.0
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [29.0, lat]},
+                    "properties": {"radius": radius, "name": "yasak"},
+                }
+            ],
+        }
+
+    def test_geofence_rejects_motion_into_zone(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            self.controller.load_geofence(self.no_fly_zone_ahead())
+            self.assertFalse(await self.controller.move_3d(2, 0, 0, duration=15))
+            self.assertEqual(self.controller.fence_breaches, 1)
+            self.assertEqual(self.controller.last_fence_breach.zone, "yasak")
+            # Bölgeden uzaklaşan hareket serbesttir.
+            self.assertTrue(await self.controller.move_3d(-2, 0, 0, duration=2))
+
+        self.run_flight(scenario)
+
+    def test_geofence_stops_setpoint_stream(self):
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            move = asyncio.ensure_future(self.controller.move_3d(3, 0, 0, duration=60))
+            await asyncio.sleep(0.02)
+            # Komut başladıktan sonra yüklenen çit her setpoint'te denetlenir.
+            self.controller.load_geofence(self.no_fly_zone_ahead(distance=30))
+            self.assertFalse(await asyncio.wait_for(move, 5))
+            self.assertGreaterEqual(self.controller.fence_breaches, 1)
+            north = self.vehicle._position[0]
+            self.assertLess(north, 20)
+
+        self.run_flight(scenario)
+
+    def test_geofence_rejects_mission(self):
+        async def scenario():
+            self.controller.load_geofence(self.no_fly_zone_ahead())
+            self.assertFalse(
+                await self.controller.upload_mission([(41.0004, 29.0, 10)])
+            )
+            self.assertTrue(
+                await self.controller.upload_mission([(40.9996, 29.0, 10)])
+            )
+
+        self.run_flight(scenario)
 
     def test_get_telemetry(self):
-        self.controller.connect(self.connection_string)
-        # Set mock telemetry data
-        self.mock_vehicle.location.global_relative_frame.lat = 34.0
-        self.mock_vehicle.location.global_relative_frame.lon = -118.0
-        self.mock_vehicle.location.global_relative_frame.alt = 50.0
-        self.mock_vehicle.groundspeed = 5.0
-        self.mock_vehicle.airspeed = 5.0
-        self.mock_vehicle.heading = 90
-        self.mock_vehicle.battery.voltage = 12.5
-        self.mock_vehicle.battery.current = 10.0
-        self.mock_vehicle.battery.level = 80
-
-        telemetry = self.controller.get_telemetry()
-
-        self.assertIsNotNone(telemetry)
-        self.assertEqual(telemetry['latitude'], 34.0)
-        self.assertEqual(telemetry['longitude'], -118.0)
-        self.assertEqual(telemetry['altitude'], 50.0)
-        self.assertEqual(telemetry['groundspeed'], 5.0)
-        self.assertEqual(telemetry['airspeed'], 5.0)
-        self.assertEqual(telemetry['heading'], 90)
-        self.assertEqual(telemetry['battery_voltage'], 12.5)
-        self.assertEqual(telemetry['battery_current'], 10.0)
-        self.assertEqual(telemetry['battery_level'], 80)
+        async def scenario():
+            await self.controller.arm_and_takeoff(5)
+            snapshot = self.controller.telemetry.snapshot()
+            self.assertGreater(snapshot.version, 0)
+            self.assertAlmostEqual(snapshot.gps.lat, 41.0, places=3)
+            self.assertGreater(snapshot.gps.alt, 4.5)
+            self.assertLessEqual(snapshot.battery.level, 100)
+            self.assertIsNotNone(snapshot.attitude)
+            self.assertGreater(len(self.controller.history), 0)
+
+        self.run_flight(scenario)
+
+    def test_commands_require_connection(self):
+        async def scenario():
+            self.assertFalse(await self.controller.arm_and_takeoff(10))
+            self.assertFalse(await self.controller.land())
+            self.assertFalse(await self.controller.turn_by_angle(30))
+
+        asyncio.run(scenario())
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
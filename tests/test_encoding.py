@@ -0,0 +1,101 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import encoding
+from src.api.encoding import (
+    BINARY,
+    BINARY_STRUCT,
+    JSON,
+    MSGPACK,
+    SnapshotEncoder,
+    binary_spec,
+    negotiate,
+    pack_snapshot,
+    unpack_snapshot,
+)
+from src.api.endpoints import setup_api_endpoints
+from src.core.telemetry import BatteryState, GpsFix, TelemetryCache
+
+
+class FakeController:
+    def __init__(self):
+        self.telemetry = TelemetryCache(clock=lambda: 100.0)
+        self.telemetry.update(
+            gps=GpsFix(41.0, 29.0, 10.0), battery=BatteryState(12.5, 1.0, 90)
+        )
+
+
+class TestEncoding(unittest.TestCase):
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate(), JSON)
+        self.assertEqual(negotiate("*/*"), JSON)
+        self.assertEqual(negotiate(f"{JSON};q=0.5, {BINARY}"), BINARY)
+        self.assertEqual(negotiate("text/html, */*;q=0.1"), JSON)
+        self.assertIsNone(negotiate("text/html"))
+        self.assertEqual(negotiate(JSON, format_name="binary"), BINARY)
+        self.assertIsNone(negotiate(format_name="binary", allowed=(JSON,)))
+        if encoding.msgpack is None:
+            self.assertIsNone(negotiate(MSGPACK))
+        else:
+            self.assertEqual(negotiate("application/x-msgpack"), MSGPACK)
+
+    def test_binary_roundtrip(self):
+        snapshot = FakeController().telemetry.snapshot()
+        data = pack_snapshot(snapshot)
+        self.assertEqual(len(data), BINARY_STRUCT.size)
+        flat = unpack_snapshot(data)
+        self.assertEqual(flat["version"], snapshot.version)
+        self.assertEqual(flat["gps.lat"], 41.0)
+        self.assertAlmostEqual(flat["battery.voltage"], 12.5, places=5)
+        self.assertIsNone(flat["attitude.yaw"])
+        self.assertIsNone(flat["timestamps.attitude"])
+        self.assertEqual(flat["timestamps.gps"], 100.0)
+
+    def test_spec_matches_struct(self):
+        spec = binary_spec()
+        last = spec["fields"][-1]
+        self.assertEqual(last["offset"] + last["size"], spec["size"])
+
+    def test_encoded_once_per_snapshot(self):
+        controller = FakeController()
+        encoder = SnapshotEncoder()
+        _, first = encoder.encode(controller, JSON)
+        _, second = encoder.encode(controller, JSON)
+        self.assertIs(first, second)
+        controller.telemetry.update(gps=GpsFix(41.0, 29.0, 11.0))
+        _, third = encoder.encode(controller, JSON)
+        self.assertIsNot(first, third)
+        self.assertEqual(json.loads(third)["gps"]["alt"], 11.0)
+
+
+class TestTelemetryNegotiation(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = FakeController()
+        self.client = TestClient(setup_api_endpoints(self.controller))
+
+    def test_telemetry_formats(self):
+        response = self.client.get("/telemetry")
+        self.assertEqual(response.headers["content-type"], JSON)
+        self.assertEqual(response.json()["gps"]["lat"], 41.0)
+        response = self.client.get("/telemetry", headers={"Accept": BINARY})
+        self.assertEqual(response.headers["content-type"], BINARY)
+        self.assertEqual(unpack_snapshot(response.content)["gps.alt"], 10.0)
+        self.assertEqual(response.headers["X-Telemetry-Version"], "1")
+        self.assertEqual(
+            self.client.get("/telemetry", headers={"Accept": "text/html"}).status_code, 406
+        )
+        response = self.client.get("/telemetry/history?format=binary")
+        self.assertEqual(response.status_code, 406)
+
+    def test_binary_websocket(self):
+        with self.client.websocket_connect("/ws/telemetry?format=binary") as ws:
+            message = ws.receive_bytes()
+        self.assertEqual(unpack_snapshot(message)["battery.level"], 90.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import threading
+import unittest
+
+from src.core.executor import CountingExecutor
+
+
+class TestCountingExecutor(unittest.TestCase):
+
+    def test_counts_jobs_and_threads(self):
+        executor = CountingExecutor(max_workers=1, thread_name_prefix="test")
+        self.addCleanup(executor.shutdown)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            return release.wait(2)
+
+        running = executor.submit(block)
+        started.wait(1)
+        queued = executor.submit(lambda: "ok")
+        dropped = executor.submit(lambda: "iptal")
+        self.assertTrue(dropped.cancel())
+        stats = executor.stats()
+        self.assertEqual(stats["queued"], 1)
+        self.assertEqual(stats["threads"], 1)
+        release.set()
+        self.assertTrue(running.result(1))
+        self.assertEqual(queued.result(1), "ok")
+        executor.shutdown()
+        stats = executor.stats()
+        self.assertEqual((stats["queued"], stats["running"]), (0, 0))
+        self.assertEqual((stats["submitted"], stats["completed"]), (3, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
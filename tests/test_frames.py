@@ -0,0 +1,215 @@
+import asyncio
+import io
+import threading
+import unittest
+
+from PIL import Image
+
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.api.frames import (
+    FrameBuffer,
+    choose_rendition,
+    mjpeg_stream,
+    pack_frames,
+    unpack_frames,
+)
+
+
+def make_jpeg(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(output, "JPEG")
+    return output.getvalue()
+
+
+class TestFrameBuffer(unittest.TestCase):
+
+    def test_sequence_and_ring(self):
+        buffer = FrameBuffer(capacity=3)
+        self.assertIsNone(buffer.latest())
+        seqs = [buffer.publish(bytes([i])) for i in range(5)]
+        self.assertEqual(seqs, [1, 2, 3, 4, 5])
+        self.assertEqual(buffer.latest().data, b"\x04")
+        self.assertIsNone(buffer.get(2))
+        self.assertEqual(buffer.get(4).data, b"\x03")
+        self.assertEqual(buffer.stats()["stored_bytes"], 3)
+
+    def test_viewers_do_not_consume_frames(self):
+        buffer = FrameBuffer()
+        data = b"jpeg"
+        buffer.publish(data)
+        first = buffer.after(0)
+        second = buffer.after(0)
+        # Aynı bayt nesnesi tüm izleyicilere verilir.
+        self.assertIs(first.data, data)
+        self.assertIs(second.data, data)
+        self.assertIsNone(buffer.after(first.seq))
+
+    def test_source_gaps(self):
+        buffer = FrameBuffer()
+        for source_seq in (10, 11, 14):
+            buffer.publish(b"x", captured_at=1.5, source_seq=source_seq)
+        self.assertEqual(buffer.latest().source_seq, 14)
+        self.assertEqual(buffer.latest().captured_at, 1.5)
+        self.assertEqual(buffer.stats()["source_gaps"], 2)
+
+    def test_subscribers_get_new_frames(self):
+        buffer = FrameBuffer()
+        received = []
+        buffer.subscribe(received.append)
+        data = b"a"
+        buffer.publish(data)
+        self.assertIs(received[0], buffer.latest())
+        self.assertIs(received[0].data, data)
+        self.assertEqual(buffer.stats()["subscribers"], 1)
+        # Bağlı metotlar her erişimde yeni nesnedir; eşitlikle çıkarılır.
+        buffer.unsubscribe(received.append)
+        buffer.publish(b"b")
+        self.assertEqual(len(received), 1)
+
+    def test_pack_roundtrip(self):
+        frames = [(b"first", 1.25, 7), (b"second", 1.5, 8)]
+        self.assertEqual(unpack_frames(pack_frames(frames)), frames)
+        with self.assertRaises(ValueError):
+            unpack_frames(pack_frames(frames)[:-1])
+        with self.assertRaises(ValueError):
+            unpack_frames(b"\x00\x00")
+
+    def test_choose_rendition(self):
+        self.assertEqual(choose_rendition(), "original")
+        self.assertEqual(choose_rendition(100, None), "thumb")
+        self.assertEqual(choose_rendition(640, 480), "vga")
+        self.assertEqual(choose_rendition(641, 100), "original")
+
+    def test_rendition_rendered_once(self):
+        buffer = FrameBuffer()
+        buffer.publish(make_jpeg(1280, 720))
+        frame = buffer.latest()
+
+        async def scenario():
+            return await asyncio.gather(*(buffer.rendition(frame, "vga") for _ in range(5)))
+
+        results = asyncio.run(scenario())
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(buffer.stats()["renders"], 1)
+        self.assertEqual(Image.open(io.BytesIO(results[0])).size, (640, 360))
+        self.assertIs(asyncio.run(buffer.rendition(frame, "original")), frame.data)
+
+    def test_cancelled_owner_does_not_strand_viewers(self):
+        buffer = FrameBuffer()
+        buffer.publish(make_jpeg(1280, 720))
+        frame = buffer.latest()
+
+        async def scenario():
+            owner = asyncio.ensure_future(buffer.rendition(frame, "vga"))
+            await asyncio.sleep(0)
+            viewer = asyncio.ensure_future(buffer.rendition(frame, "vga"))
+            await asyncio.sleep(0)
+            # İsteği başlatan izleyici ayrılır (ör. istemci bağlantıyı keser).
+            owner.cancel()
+            return await asyncio.wait_for(viewer, 2)
+
+        data = asyncio.run(scenario())
+        self.assertEqual(Image.open(io.BytesIO(data)).size, (640, 360))
+        self.assertEqual(buffer.stats()["renders"], 1)
+
+    def test_wait_after(self):
+        buffer = FrameBuffer()
+
+        async def scenario():
+            self.assertIsNone(await buffer.wait_after(0, timeout=0.01))
+            waiters = [asyncio.ensure_future(buffer.wait_after(0, timeout=1)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            # Üretici başka bir thread'den yayınlayabilir.
+            threading.Thread(target=buffer.publish, args=(b"x",)).start()
+            frames = await asyncio.gather(*waiters)
+            self.assertEqual([f.seq for f in frames], [1, 1, 1])
+
+        asyncio.run(scenario())
+
+    def test_mjpeg_parts(self):
+        buffer = FrameBuffer()
+        buffer.publish(b"first")
+
+        async def scenario():
+            stream = mjpeg_stream(buffer, "frame")
+            header = await stream.__anext__()
+            self.assertIn(b"--frame\r\nContent-Type: image/jpeg", header)
+            self.assertIn(b"Content-Length: 5", header)
+            self.assertEqual(await stream.__anext__(), b"first")
+            self.assertEqual(await stream.__anext__(), b"\r\n")
+            next_part = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.01)
+            self.assertFalse(next_part.done())
+            buffer.publish(b"second")
+            self.assertIn(b"X-Frame-Seq: 2", await next_part)
+            await stream.aclose()
+
+        asyncio.run(scenario())
+
+
+class TestCameraEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        endpoints.frame_buffer = FrameBuffer()
+        self.client = TestClient(endpoints.setup_api_endpoints(None))
+
+    def test_upload_and_long_poll(self):
+        self.assertEqual(self.client.get("/camera_feed").status_code, 503)
+        response = self.client.post(
+            "/upload_frame", files={"file": ("f.jpg", b"abc", "image/jpeg")}
+        )
+        self.assertEqual(response.json()["seq"], 1)
+        for _ in range(2):
+            # İki izleyici de aynı kareyi alır.
+            response = self.client.get("/camera_feed?after=0")
+            self.assertEqual(response.content, b"abc")
+            self.assertEqual(response.headers["X-Frame-Seq"], "1")
+        self.assertEqual(self.client.get("/camera_feed?after=1&timeout=0.01").status_code, 204)
+
+    def test_renditions_and_etag(self):
+        self.client.post(
+            "/ingest/frame", content=make_jpeg(1280, 720), headers={"Content-Type": "image/jpeg"}
+        )
+        response = self.client.get("/camera_feed?w=160&h=120")
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (160, 90))
+        etag = response.headers["ETag"]
+        response = self.client.get("/camera_feed?w=160&h=120", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get("/camera_feed", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (1280, 720))
+
+    def test_raw_ingest(self):
+        response = self.client.post(
+            "/ingest/frame",
+            content=b"jpeg",
+            headers={"Content-Type": "image/jpeg", "X-Capture-Time": "12.5", "X-Source-Seq": "3"},
+        )
+        self.assertEqual(response.json(), {"seq": 1})
+        response = self.client.get("/camera_feed")
+        self.assertEqual(response.content, b"jpeg")
+        self.assertEqual(response.headers["X-Capture-Time"], "12.5")
+        self.assertEqual(response.headers["X-Source-Seq"], "3")
+        response = self.client.post(
+            "/ingest/frame", content=b"jpeg", headers={"Content-Type": "text/plain"}
+        )
+        self.assertEqual(response.status_code, 415)
+
+    def test_batch_and_websocket_ingest(self):
+        body = pack_frames([(b"a", 1.0, 1), (b"b", 2.0, 2)])
+        response = self.client.post("/ingest/batch", content=body)
+        self.assertEqual(response.json()["seqs"], [1, 2])
+        self.assertEqual(self.client.post("/ingest/batch", content=body[:-1]).status_code, 400)
+        with self.client.websocket_connect("/ingest/ws") as websocket:
+            websocket.send_bytes(pack_frames([(b"c", 3.0, 3)]))
+            websocket.send_bytes(pack_frames([(b"d", 4.0, 5)]))
+        response = self.client.get("/camera_feed")
+        self.assertEqual(response.content, b"d")
+        self.assertEqual(response.headers["X-Frame-Seq"], "4")
+        self.assertEqual(self.client.get("/camera_stats").json()["source_gaps"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from src.core import geodesy
+
+
+class TestDistances(unittest.TestCase):
+
+    def test_vincenty_reference(self):
+        # Vincenty (1975) örneği: Flinders Peak -> Buninyong
+        distance = geodesy.vincenty(
+            -(37 + 57 / 60 + 3.72030 / 3600),
+            144 + 25 / 60 + 29.52440 / 3600,
+            -(37 + 39 / 60 + 10.15610 / 3600),
+            143 + 55 / 60 + 35.38390 / 3600,
+        )
+        self.assertAlmostEqual(float(distance), 54972.271, places=3)
+
+    def test_haversine_close_to_vincenty(self):
+        lat = np.array([41.0, 41.0, 0.0])
+        lon = np.array([29.0, 29.0, 0.0])
+        lat2 = np.array([41.01, 40.0, 0.0])
+        lon2 = np.array([29.01, 30.0, 1.0])
+        h = geodesy.haversine(lat, lon, lat2, lon2)
+        v = geodesy.vincenty(lat, lon, lat2, lon2)
+        self.assertEqual(h.shape, (3,))
+        np.testing.assert_allclose(h, v, rtol=5e-3)
+        self.assertAlmostEqual(float(v[2]), 111319.491, places=2)
+
+    def test_coincident_and_antipodal_points(self):
+        distance = geodesy.vincenty([41.0, 0.0], [29.0, 0.0], [41.0, 0.5], [29.0, 179.7])
+        self.assertEqual(distance[0], 0.0)
+        self.assertTrue(np.isnan(distance[1]))
+
+    def test_path_length(self):
+        lat = np.array([41.0, 41.001, 41.002])
+        lon = np.array([29.0, 29.0, 29.0])
+        segments = geodesy.segment_lengths(lat, lon)
+        self.assertEqual(segments.shape, (2,))
+        self.assertAlmostEqual(geodesy.path_length(lat, lon), segments.sum())
+        self.assertAlmostEqual(
+            geodesy.path_length(lat, lon, method="vincenty"), 222.2, delta=0.5
+        )
+        with self.assertRaises(ValueError):
+            geodesy.path_length(lat, lon, method="flat")
+
+
+class TestDirections(unittest.TestCase):
+
+    def test_bearing(self):
+        bearings = geodesy.bearing(41.0, 29.0, [42.0, 41.0, 40.0, 41.0], [29.0, 30.0, 29.0, 28.0])
+        np.testing.assert_allclose(bearings, [0.0, 89.67, 180.0, 270.33], atol=0.01)
+
+    def test_destination_round_trip(self):
+        headings = np.linspace(0, 350, 36)
+        lat, lon = geodesy.destination(41.0, 29.0, headings, 1000.0)
+        np.testing.assert_allclose(geodesy.haversine(41.0, 29.0, lat, lon), 1000.0)
+        np.testing.assert_allclose(
+            (geodesy.bearing(41.0, 29.0, lat, lon) - headings + 180) % 360 - 180, 0, atol=1e-6
+        )
+
+    def test_body_to_ned(self):
+        north, east = geodesy.body_to_ned(1.0, 0.0, [0.0, 90.0])
+        np.testing.assert_allclose(north, [1.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(east, [0.0, 1.0], atol=1e-12)
+
+
+class TestFrames(unittest.TestCase):
+
+    def test_ned_round_trip(self):
+        north = np.array([0.0, 100.0, -250.0, 5000.0])
+        east = np.array([0.0, 50.0, 1200.0, -3000.0])
+        down = np.array([0.0, -10.0, -100.0, 20.0])
+        lat, lon, alt = geodesy.ned_to_geodetic(north, east, down, 41.0, 29.0, 50.0)
+        self.assertAlmostEqual(lat[0], 41.0, places=10)
+        self.assertAlmostEqual(alt[1], 60.0, delta=0.01)
+        n, e, d = geodesy.geodetic_to_ned(lat, lon, alt, 41.0, 29.0, 50.0)
+        np.testing.assert_allclose(n, north, atol=1e-4)
+        np.testing.assert_allclose(e, east, atol=1e-4)
+        np.testing.assert_allclose(d, down, atol=1e-4)
+
+    def test_small_offsets_match_distance(self):
+        lat, lon, _ = geodesy.ned_to_geodetic(300.0, 400.0, 0.0, 41.0, 29.0)
+        self.assertAlmostEqual(float(geodesy.vincenty(41.0, 29.0, lat, lon)), 500.0, delta=0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
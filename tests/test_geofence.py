@@ -0,0 +1,138 @@
+import random
+import unittest
+
+from src.core.geofence import EXCLUSION, INCLUSION, Geofence
+from src.core.geodesy import destination
+
+
+def square(lat, lon, half):
+    # half: derece cinsinden yarım kenar
+    return [
+        [lon - half, lat - half],
+        [lon + half, lat - half],
+        [lon + half, lat + half],
+        [lon - half, lat + half],
+        [lon - half, lat - half],
+    ]
+
+
+def feature(geometry_type, coordinates, **properties):
+    return {
+        "type": "Feature",
+        "geometry": {"type": geometry_type, "coordinates": coordinates},
+        "properties": properties,
+    }
+
+
+def collection(*features):
+    return {"type": "FeatureCollection", "features": list(features)}
+
+
+class TestGeofence(unittest.TestCase):
+
+    def test_exclusion_polygon_with_hole(self):
+        fence = Geofence.from_geojson(
+            collection(
+                feature(
+                    "Polygon",
+                    [square(41.0, 29.0, 0.01), square(41.0, 29.0, 0.002)],
+                    name="havaalanı",
+                )
+            )
+        )
+        breach = fence.check(41.005, 29.0, 20)
+        self.assertEqual(breach.zone, "havaalanı")
+        self.assertEqual(breach.kind, EXCLUSION)
+        self.assertIsNone(fence.check(41.0, 29.0, 20))
+        self.assertIsNone(fence.check(41.02, 29.0, 20))
+
+    def test_cylinder_and_altitude_band(self):
+        fence = Geofence.from_geojson(
+            collection(
+                feature("Point", [29.0, 41.0], radius=100, min_alt=0, max_alt=50, name="kule")
+            )
+        )
+        lat, lon = destination(41.0, 29.0, 45, 90)
+        self.assertFalse(fence.contains(float(lat), float(lon), 30))
+        self.assertTrue(fence.contains(float(lat), float(lon), 60))
+        lat, lon = destination(41.0, 29.0, 45, 110)
+        self.assertTrue(fence.contains(float(lat), float(lon), 30))
+
+    def test_inclusion_zone(self):
+        fence = Geofence.from_geojson(
+            collection(
+                feature("Polygon", [square(41.0, 29.0, 0.5)], fence=INCLUSION, max_alt=120),
+                feature("Point", [29.0, 41.0], radius=50),
+            )
+        )
+        # Sahayı kaplayan bölge ızgaraya değil her sorguda denetlenen listeye gider.
+        self.assertEqual(len(fence._always), 1)
+        self.assertIsNone(fence.check(41.2, 29.2, 100))
+        self.assertEqual(fence.check(41.2, 29.2, 150).kind, INCLUSION)
+        self.assertEqual(fence.check(41.6, 29.0, 10).kind, INCLUSION)
+        self.assertEqual(fence.check(41.0, 29.0, 10).kind, EXCLUSION)
+
+    def test_check_path_samples_segments(self):
+        fence = Geofence.from_geojson(
+            collection(feature("Point", [29.0, 41.0], radius=30)), cell_size=50
+        )
+        start = (41.0, 28.99, 10)
+        end = (41.0, 29.01, 10)
+        self.assertIsNone(fence.check(*start))
+        self.assertIsNone(fence.check(*end))
+        self.assertIsNotNone(fence.check_path([start, end]))
+        self.assertIsNone(fence.check_path([start, (41.01, 28.99, 10)]))
+
+    def test_check_path_finds_thin_zone_between_samples(self):
+        # Kuzey-güney uzanan 2 m genişliğinde şerit; örnek aralığı 25 m.
+        half = 1.0 / 84000
+        strip = [
+            [29.0 - half, 40.99], [29.0 + half, 40.99],
+            [29.0 + half, 41.01], [29.0 - half, 41.01], [29.0 - half, 40.99],
+        ]
+        fence = Geofence.from_geojson(
+            collection(feature("Polygon", [strip], name="hat", min_alt=0, max_alt=40)),
+            cell_size=100,
+        )
+        start = (41.0, 28.9987, 10)
+        end = (41.0, 29.0013, 10)
+        breach = fence.check_path([start, end])
+        self.assertEqual(breach.zone, "hat")
+        self.assertAlmostEqual(breach.lon, 29.0 - half, places=6)
+        # Bandın üstünden geçen ve banda tırmanarak geçen rotalar.
+        self.assertIsNone(fence.check_path([(41.0, 28.9987, 60), (41.0, 29.0013, 60)]))
+        self.assertIsNotNone(fence.check_path([(41.0, 28.9987, 80), (41.0, 29.0013, 0)]))
+
+    def test_grid_matches_brute_force(self):
+        rng = random.Random(1)
+        features = []
+        for i in range(2000):
+            lat = 41.0 + rng.uniform(-0.1, 0.1)
+            lon = 29.0 + rng.uniform(-0.1, 0.1)
+            if i % 2:
+                features.append(feature("Polygon", [square(lat, lon, rng.uniform(1e-4, 1e-3))]))
+            else:
+                features.append(feature("Point", [lon, lat], radius=rng.uniform(5, 80)))
+        fence = Geofence.from_geojson(collection(*features), cell_size=100)
+        for _ in range(2000):
+            lat = 41.0 + rng.uniform(-0.1, 0.1)
+            lon = 29.0 + rng.uniform(-0.1, 0.1)
+            x, y = fence._local(lon, lat)
+            expected = any(zone.contains(x, y, 10) for zone in fence.zones)
+            self.assertEqual(fence.check(lat, lon, 10) is not None, expected)
+
+    def test_invalid_geojson(self):
+        with self.assertRaises(ValueError):
+            Geofence.from_geojson({"type": "Polygon"})
+        with self.assertRaises(ValueError):
+            Geofence.from_geojson(collection(feature("Point", [29.0, 41.0])))
+        with self.assertRaises(ValueError):
+            Geofence.from_geojson(collection(feature("LineString", [[29.0, 41.0], [29.1, 41.0]])))
+        with self.assertRaises(ValueError):
+            Geofence.from_geojson(
+                collection(feature("Point", [29.0, 41.0], radius=5, fence="maybe"))
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from src.core.history import TelemetryHistory
+from src.core.telemetry import (
+    AttitudeState,
+    BatteryState,
+    EMPTY_SNAPSHOT,
+    GpsFix,
+)
+
+
+def make_snapshot(alt, level=None):
+    return EMPTY_SNAPSHOT._replace(
+        gps=GpsFix(41.0, 29.0, alt),
+        battery=BatteryState(12.0, 1.0, level) if level is not None else None,
+        attitude=AttitudeState(0.0, 0.0, 1.5),
+    )
+
+
+class TestTelemetryHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.history = TelemetryHistory(capacity=10, min_interval=0, clock=lambda: self.now)
+
+    def record(self, count, start=0):
+        for i in range(start, start + count):
+            self.now = float(i)
+            self.history.record(make_snapshot(float(i), level=i))
+
+    def test_query_raw_samples(self):
+        self.record(4)
+        result = self.history.query(fields=["alt"])
+        self.assertEqual(result["count"], 4)
+        self.assertEqual(result["t"], [0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(result["fields"]["alt"]["mean"], [0.0, 1.0, 2.0, 3.0])
+
+    def test_ring_keeps_latest_in_order(self):
+        self.record(25)
+        self.assertEqual(len(self.history), 10)
+        result = self.history.query(fields=["alt"])
+        self.assertEqual(result["t"], [float(i) for i in range(15, 25)])
+
+    def test_downsample_min_max_mean(self):
+        self.record(10)
+        result = self.history.query(fields=["alt"], max_points=2)
+        alt = result["fields"]["alt"]
+        self.assertEqual(alt["min"], [0.0, 5.0])
+        self.assertEqual(alt["max"], [4.0, 9.0])
+        self.assertEqual(alt["mean"], [2.0, 7.0])
+        self.assertEqual(result["t"], [2.0, 7.0])
+
+    def test_since_filter(self):
+        self.record(10)
+        result = self.history.query(since=7.0, fields=["lat"])
+        self.assertEqual(result["count"], 3)
+
+    def test_missing_values_become_none(self):
+        self.now = 1.0
+        self.history.record(make_snapshot(1.0))
+        result = self.history.query(fields=["level", "yaw"])
+        self.assertEqual(result["fields"]["level"]["mean"], [None])
+        self.assertAlmostEqual(result["fields"]["yaw"]["mean"][0], 1.5)
+
+    def test_min_interval_throttles(self):
+        history = TelemetryHistory(capacity=10, min_interval=0.1, clock=lambda: self.now)
+        self.now = 1.0
+        history.record(make_snapshot(1.0))
+        self.now = 1.05
+        history.record(make_snapshot(2.0))
+        self.assertEqual(len(history), 1)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.history.query(fields=["speed"])
+
+    def test_default_capacity_footprint(self):
+        self.assertLess(TelemetryHistory().nbytes, 5 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import httpx
+
+from src.api import endpoints
+from src.api.jobs import JobManager, JobService, RemoteJobs
+from src.core.commands import CommandQueue
+from src.core.fleet import Fleet
+from src.core.ipc import LinkClient, LinkOwner, RemoteFleet
+from src.core.shm import SharedTelemetry
+from src.core.telemetry import GpsFix, TelemetryCache
+
+
+class FakeController:
+    def __init__(self):
+        self.telemetry = TelemetryCache()
+        self.commands = CommandQueue(log=lambda message: None)
+
+    def submit(self, name, *args, **kwargs):
+        return self.commands.submit(name, lambda: getattr(self, name)(*args, **kwargs))
+
+    def cancel(self, future):
+        return self.commands.cancel(future) is not None
+
+    async def move_distance(self, distance):
+        await asyncio.sleep(distance / 100.0)
+        return True
+
+    async def calibrate(self, seconds):
+        await asyncio.sleep(seconds)
+        return True
+
+    async def land(self):
+        raise RuntimeError("İniş reddedildi")
+
+    async def upload_mission(self, waypoints, takeoff_alt=None, finish=None, timeout=30):
+        return len(waypoints)
+
+    def geofence_status(self):
+        # Bağlantı sahibi süreçte yavaş yanıt veren sorgu.
+        time.sleep(0.2)
+        return {"zones": 0}
+
+
+class TestLinkOwner(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.controller = FakeController()
+        self.controller.commands.start(self.loop)
+        self.fleet = Fleet.__new__(Fleet)
+        self.fleet._controllers = {"iha1": self.controller}
+        self.fleet.default_id = "iha1"
+        self.dir = tempfile.TemporaryDirectory()
+        self.telemetry = SharedTelemetry(["iha1"], create=True)
+        self.controller.telemetry.subscribe(self.telemetry.publisher("iha1"))
+        self.owner = LinkOwner(
+            self.fleet,
+            os.path.join(self.dir.name, "link.sock"),
+            b"secret",
+            self.loop,
+            services={"jobs": JobService(JobManager(interval=0.01), self.fleet)},
+        )
+        self.client = LinkClient(self.owner.address, b"secret")
+        self.remote = RemoteFleet(self.client, ["iha1"], self.telemetry)
+
+    def tearDown(self):
+        self.client.close()
+        self.owner.close()
+        self.telemetry.close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.dir.cleanup()
+
+    def query(self, call):
+        # Vekil sorguları worker'ın olay döngüsünde beklenir.
+        async def main():
+            return await call()
+
+        return asyncio.run(main())
+
+    def test_commands_and_queries(self):
+        controller = self.remote.get()
+        self.assertEqual(controller.vehicle_id, "iha1")
+        self.assertTrue(controller.submit("move_distance", 1).result(2))
+        with self.assertRaisesRegex(RuntimeError, "İniş reddedildi"):
+            controller.submit("land").result(2)
+        self.assertEqual(self.query(controller.commands.stats)["executed"], 2)
+        self.assertEqual(self.query(controller.geofence_status), {"zones": 0})
+        upload = controller.submit("upload_mission", [(41.0, 29.0, 10)], takeoff_alt=5)
+        self.assertEqual(upload.result(2), 1)
+        # Alt çizgiyle başlayan öznitelikler çağrılamaz.
+        with self.assertRaises(AttributeError):
+            self.client.request(("vehicle", "iha1"), "commands._lock.acquire")
+
+    def test_telemetry_comes_from_shared_memory(self):
+        self.controller.telemetry.update(gps=GpsFix(41.0, 29.0, 12.0))
+        snapshot = self.remote.get().telemetry.snapshot()
+        self.assertEqual(snapshot.gps.alt, 12.0)
+        self.assertEqual(self.remote.telemetry()["iha1"]["gps"]["alt"], 12.0)
+        # Sahte kontrolcüde olmayan öznitelik hatası worker'a taşınır.
+        with self.assertRaises(AttributeError):
+            self.query(lambda: self.remote.get().mavlink_sent)
+
+    def test_slow_owner_does_not_block_worker_loop(self):
+        app = endpoints.setup_api_endpoints(self.remote.get(), fleet=self.remote)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.ensure_future(ticker())
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://worker") as client:
+                response = await client.get("/geofence")
+            task.cancel()
+            return response, ticks
+
+        response, ticks = asyncio.run(main())
+        self.assertEqual(response.json(), {"zones": 0})
+        # Yanıt beklenirken döngü diğer işleri çalıştırmaya devam eder.
+        self.assertGreater(ticks, 10)
+
+    def test_frozen_fleet_rejects_changes(self):
+        fleet = Fleet()
+        self.addCleanup(fleet.setpoints.close)
+        fleet.register("iha1", self.controller)
+        fleet.freeze("çok worker")
+        with self.assertRaisesRegex(RuntimeError, "çok worker"):
+            fleet.register("iha2", FakeController())
+        with self.assertRaises(RuntimeError):
+            asyncio.run(fleet.remove("iha1"))
+        self.assertEqual(fleet.ids(), ["iha1"])
+
+    def test_cancel_queued_command(self):
+        controller = self.remote.get()
+        running = controller.submit("calibrate", 0.3)
+        queued = controller.submit("calibrate", 0.2)
+        time.sleep(0.05)
+        self.assertTrue(controller.cancel(queued))
+        # İptal edilen komut kuyrukta olduğu gibi False ile tamamlanır.
+        self.assertFalse(queued.result(2))
+        self.assertTrue(running.result(2))
+        self.assertFalse(controller.cancel(running))
+
+    def test_jobs_are_shared_between_workers(self):
+        second = LinkClient(self.owner.address, b"secret")
+        self.addCleanup(second.close)
+
+        def jobs(client):
+            return RemoteJobs(
+                lambda method, *args: client.call(("service", "jobs"), method, *args),
+                interval=0.01,
+            )
+
+        other = jobs(second)
+
+        async def wait():
+            job = await jobs(self.client).submit(self.remote.get(), "move_distance", 5)
+            self.assertIsNone(await other.get("yok"))
+            return await other.wait(await other.get(job.id), timeout=2)
+
+        info = asyncio.run(wait()).to_dict()
+        self.assertEqual(info["status"], "succeeded")
+
+        async def events():
+            started = await jobs(second).submit(self.remote.get(), "move_distance", 5)
+            return [chunk async for chunk in other.events(started)]
+
+        chunks = asyncio.run(events())
+        self.assertTrue(chunks[-1].startswith("event: done"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.api.jobs import JobManager
+from src.core.commands import CommandQueue
+from src.core.telemetry import GpsFix, TelemetryCache
+
+
+class FakeController:
+    def __init__(self):
+        self.telemetry = TelemetryCache()
+        self.telemetry.update(gps=GpsFix(41.0, 29.0, 0.0))
+        self.commands = CommandQueue(log=lambda message: None)
+
+    def submit(self, name, *args):
+        return self.commands.submit(name, lambda: getattr(self, name)(*args))
+
+    def cancel(self, future):
+        return self.commands.cancel(future) is not None
+
+    async def arm_and_takeoff(self, altitude):
+        # Her adımda bir metre tırmanır.
+        alt = 0.0
+        while alt < altitude:
+            await asyncio.sleep(0.01)
+            alt += 1.0
+            self.telemetry.update(gps=GpsFix(41.0, 29.0, alt))
+        return True
+
+    async def land(self):
+        return True
+
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        endpoints.jobs = JobManager(interval=0.01)
+        self.controller = FakeController()
+
+    def client(self):
+        return TestClient(endpoints.setup_api_endpoints(self.controller))
+
+    def wait_done(self, client, job_id):
+        for _ in range(500):
+            job = client.get(f"/jobs/{job_id}").json()
+            if job["status"] not in ("pending", "running"):
+                return job
+            time.sleep(0.01)
+        self.fail("İş bitmedi")
+
+    def test_takeoff_job_reports_progress(self):
+        with self.client() as client:
+            # Aracı kaldıran istek GET ile tetiklenemez.
+            self.assertEqual(client.get("/arm_takeoff?altitude=5").status_code, 405)
+            response = client.post("/arm_takeoff?altitude=5")
+            self.assertEqual(response.status_code, 202)
+            job = response.json()
+            self.assertEqual(response.headers["Location"], f"/jobs/{job['id']}")
+            self.assertEqual(job["command"], "arm_and_takeoff")
+            done = self.wait_done(client, job["id"])
+        self.assertEqual(done["status"], "succeeded")
+        self.assertEqual(done["progress"], {"altitude": 5.0, "fraction": 1.0})
+
+    def test_event_stream(self):
+        with self.client() as client:
+            job = client.post("/arm_takeoff?altitude=20").json()
+            body = client.get(f"/jobs/{job['id']}/events").text
+        events = [block.split("\n") for block in body.strip().split("\n\n")]
+        names = [lines[0] for lines in events]
+        self.assertEqual(names[-1], "event: done")
+        self.assertTrue(all(name == "event: progress" for name in names[:-1]))
+        fractions = [
+            json.loads(lines[1][len("data: "):])["progress"].get("fraction")
+            for lines in events
+        ]
+        self.assertGreater(len(fractions), 2)
+        self.assertEqual(fractions[-1], 1.0)
+
+    def test_cancel(self):
+        with self.client() as client:
+            job = client.post("/arm_takeoff?altitude=1000").json()
+            response = client.delete(f"/jobs/{job['id']}")
+            self.assertEqual(response.status_code, 200)
+            done = self.wait_done(client, job["id"])
+            self.assertEqual(done["status"], "cancelled")
+            self.assertEqual(client.delete(f"/jobs/{job['id']}").status_code, 409)
+            self.assertEqual(client.get("/jobs/unknown").status_code, 404)
+            self.assertEqual(len(client.get("/jobs?status=cancelled").json()), 1)
+
+    def test_wait_keeps_blocking_behaviour(self):
+        with self.client() as client:
+            response = client.get("/land?wait=true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "Drone indi"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from src.core.link import LinkState, VehicleLink
+
+
+class TestVehicleLink(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_vehicle = MagicMock()
+        self.mock_vehicle.last_heartbeat = 0.1
+        self.attempts = []
+        self.ready = []
+        self.lost = []
+
+    def make_link(self, failures=0):
+        def connect_fn(connection_string, wait_ready, timeout):
+            self.attempts.append(connection_string)
+            if len(self.attempts) <= failures:
+                raise RuntimeError("no heartbeat")
+            return self.mock_vehicle
+
+        return VehicleLink(
+            "udp:127.0.0.1:14550",
+            connect_fn,
+            on_ready=self.ready.append,
+            on_lost=self.lost.append,
+            log=lambda message: None,
+            backoff_initial=0.01,
+            backoff_max=0.02,
+            poll_interval=0.01,
+        )
+
+    def test_start_returns_immediately_and_connects(self):
+        async def scenario():
+            link = self.make_link()
+            link.start()
+            self.assertEqual(link.state, LinkState.DISCONNECTED)
+            await asyncio.sleep(0.05)
+            self.assertEqual(link.state, LinkState.READY)
+            self.assertEqual(self.ready, [self.mock_vehicle])
+            await link.stop()
+            self.assertEqual(link.state, LinkState.DISCONNECTED)
+            self.assertEqual(self.lost, [self.mock_vehicle])
+            self.mock_vehicle.close.assert_called_once()
+
+        asyncio.run(scenario())
+
+    def test_retries_with_backoff(self):
+        async def scenario():
+            link = self.make_link(failures=2)
+            link.start()
+            await asyncio.sleep(0.15)
+            self.assertEqual(len(self.attempts), 3)
+            self.assertEqual(link.state, LinkState.READY)
+            await link.stop()
+
+        asyncio.run(scenario())
+
+    def test_heartbeat_loss_reconnects(self):
+        async def scenario():
+            link = self.make_link()
+            link.start()
+            await asyncio.sleep(0.03)
+            self.mock_vehicle.last_heartbeat = 3.0
+            await asyncio.sleep(0.03)
+            self.assertEqual(link.state, LinkState.DEGRADED)
+            self.mock_vehicle.last_heartbeat = 10.0
+            await asyncio.sleep(0.03)
+            self.assertGreaterEqual(len(self.lost), 1)
+            self.mock_vehicle.last_heartbeat = 0.1
+            await asyncio.sleep(0.05)
+            self.assertEqual(link.state, LinkState.READY)
+            self.assertGreaterEqual(len(self.ready), 2)
+            await link.stop()
+
+        asyncio.run(scenario())
+
+    def test_stop_while_connecting_closes_late_vehicle(self):
+        release = threading.Event()
+        connecting = threading.Event()
+
+        def connect_fn(connection_string, wait_ready, timeout):
+            connecting.set()
+            release.wait(2)
+            return self.mock_vehicle
+
+        link = VehicleLink(
+            "udp:127.0.0.1:14550",
+            connect_fn,
+            on_ready=self.ready.append,
+            on_lost=self.lost.append,
+            log=lambda message: None,
+        )
+
+        async def scenario():
+            link.start()
+            await asyncio.to_thread(connecting.wait, 1)
+            await link.stop()
+            release.set()
+            for _ in range(100):
+                if self.mock_vehicle.close.called:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        self.mock_vehicle.close.assert_called_once()
+        self.assertEqual(self.ready, [])
+        self.assertEqual(link.state, LinkState.DISCONNECTED)
+
+    def test_blocked_connect_does_not_hold_short_executor(self):
+        release = threading.Event()
+        connecting = threading.Event()
+
+        def connect_fn(connection_string, wait_ready, timeout):
+            connecting.set()
+            release.wait(2)
+            return self.mock_vehicle
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="short")
+        connect_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="connect")
+        links = [
+            VehicleLink(
+                f"udp:127.0.0.1:{14550 + i}",
+                connect_fn,
+                on_ready=self.ready.append,
+                on_lost=self.lost.append,
+                log=lambda message: None,
+                poll_interval=0.01,
+                executor=executor,
+                connect_executor=connect_executor,
+            )
+            for i in range(2)
+        ]
+
+        async def scenario():
+            for link in links:
+                link.start()
+            await asyncio.to_thread(connecting.wait, 1)
+            # Bağlantılar heartbeat beklerken kısa işler gecikmeden çalışır.
+            short = asyncio.get_running_loop().run_in_executor(executor, lambda: "ok")
+            self.assertEqual(await asyncio.wait_for(short, 0.5), "ok")
+            release.set()
+            for link in links:
+                await link.stop()
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+            connect_executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.api.frames import FrameBuffer
+from src.api.metrics import Histogram, RouteLatency, collect
+from src.core.executor import CountingExecutor
+from src.core.telemetry import GpsFix, TelemetryCache
+
+
+class FakeController:
+    vehicle_id = "uav1"
+
+    def __init__(self):
+        self.telemetry = TelemetryCache(clock=lambda: 100.0)
+        self.telemetry.update(gps=GpsFix(41.0, 29.0, 10.0))
+        self.mavlink_sent = {"COMMAND_LONG": 3}
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_buckets(self):
+        histogram = Histogram(bounds=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+
+    def test_collect_renders_prometheus_text(self):
+        buffer = FrameBuffer()
+        buffer.publish(b"x", source_seq=1)
+        buffer.publish(b"y", source_seq=3)
+        text = collect([("uav1", FakeController())], RouteLatency(), buffer, now=102.5)
+        self.assertIn("# TYPE uav_mavlink_messages_sent_total counter", text)
+        self.assertIn('uav_mavlink_messages_sent_total{vehicle="uav1",type="COMMAND_LONG"} 3', text)
+        self.assertIn('uav_telemetry_age_seconds{vehicle="uav1",field="gps"} 2.5', text)
+        self.assertIn("uav_frames_ingested_total 2", text)
+        self.assertIn("uav_frames_dropped_total 1", text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_executor_counts(self):
+        executor = CountingExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        executor.submit(int).result(1)
+        text = collect([], RouteLatency(), executor=executor)
+        self.assertIn('uav_executor_queue_depth{executor="api"} 0', text)
+        self.assertIn('uav_executor_threads{executor="api"} 1', text)
+
+    def test_endpoint_records_route_latency(self):
+        endpoints.frame_buffer = FrameBuffer()
+        client = TestClient(endpoints.setup_api_endpoints(FakeController()))
+        client.get("/telemetry")
+        client.get("/telemetry")
+        response = client.get("/metrics")
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        lines = response.text.splitlines()
+        self.assertTrue(
+            any(
+                line.startswith('uav_http_request_duration_seconds_count{route="/telemetry"')
+                for line in lines
+            )
+        )
+        self.assertIn('uav_telemetry_version{vehicle="uav1"} 1', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
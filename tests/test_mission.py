@@ -0,0 +1,119 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.core.commands import CommandQueue
+from src.core.geodesy import bearing, haversine
+from src.core.mission import (
+    MAV_CMD_NAV_LAND,
+    MAV_CMD_NAV_TAKEOFF,
+    MAV_CMD_NAV_WAYPOINT,
+    MissionTracker,
+    compile_mission,
+    route_from_legs,
+)
+from src.core.simulator import SimMessage
+
+
+class TestCompileMission(unittest.TestCase):
+
+    def test_takeoff_then_waypoints(self):
+        items = compile_mission([(41.0, 29.0, 15), (41.001, 29.0, 20)])
+        self.assertEqual(
+            [item.command for item in items],
+            [MAV_CMD_NAV_TAKEOFF, MAV_CMD_NAV_WAYPOINT, MAV_CMD_NAV_WAYPOINT],
+        )
+        self.assertEqual(items[0].z, 15)
+        self.assertEqual((items[2].x, items[2].y, items[2].z), (41.001, 29.0, 20))
+
+    def test_finish_and_takeoff_altitude(self):
+        items = compile_mission([(41.0, 29.0, 15)], takeoff_alt=5, finish="LAND")
+        self.assertEqual(items[0].z, 5)
+        self.assertEqual(items[-1].command, MAV_CMD_NAV_LAND)
+
+    def test_invalid_missions(self):
+        with self.assertRaises(ValueError):
+            compile_mission([])
+        with self.assertRaises(ValueError):
+            compile_mission([(41.0, 29.0, 15)], finish="LOITER")
+
+
+class TestRouteFromLegs(unittest.TestCase):
+
+    def test_legs_follow_heading(self):
+        waypoints = route_from_legs(41.0, 29.0, 0, [(0, 100), (90, 100)], alt=10)
+        self.assertEqual(len(waypoints), 2)
+        self.assertAlmostEqual(float(haversine(41.0, 29.0, *waypoints[0][:2])), 100, places=3)
+        self.assertAlmostEqual(waypoints[0].lon, 29.0)
+        self.assertAlmostEqual(float(bearing(*waypoints[0][:2], *waypoints[1][:2])), 90, places=2)
+        self.assertGreater(waypoints[1].lon, 29.0)
+        self.assertEqual(waypoints[1].alt, 10)
+
+
+class TestMissionTracker(unittest.TestCase):
+
+    def test_progress_from_messages(self):
+        tracker = MissionTracker(clock=lambda: 1.0)
+        tracker.loaded(compile_mission([(41.0, 29.0, 10), (41.001, 29.0, 10)]))
+        self.assertEqual(tracker.status()["items"], 3)
+
+        tracker._on_message(None, "MISSION_CURRENT", SimMessage("MISSION_CURRENT", seq=2))
+        for seq in (1, 2, 2):
+            tracker._on_message(
+                None, "MISSION_ITEM_REACHED", SimMessage("MISSION_ITEM_REACHED", seq=seq)
+            )
+        status = tracker.status()
+        self.assertEqual(status["current"], 2)
+        self.assertEqual(status["reached"], [1, 2])
+        self.assertAlmostEqual(status["progress"], 2 / 3)
+        self.assertFalse(status["complete"])
+
+        tracker._on_message(
+            None, "MISSION_ITEM_REACHED", SimMessage("MISSION_ITEM_REACHED", seq=3)
+        )
+        self.assertTrue(tracker.status()["complete"])
+
+
+class FakeMissionController:
+    def __init__(self):
+        self.mission = MissionTracker(clock=lambda: 1.0)
+        self.commands = CommandQueue(log=lambda message: None)
+        self.calls = []
+
+    def submit(self, name, *args, **kwargs):
+        return self.commands.submit(name, lambda: getattr(self, name)(*args, **kwargs))
+
+    async def upload_mission(self, waypoints, takeoff_alt=None, finish=None, timeout=30):
+        self.calls.append("upload_mission")
+        self.mission.loaded(compile_mission(waypoints, takeoff_alt=takeoff_alt, finish=finish))
+        return True
+
+    async def start_mission(self, wait=True, timeout=600):
+        self.calls.append("start_mission")
+        self.mission.started()
+        return True
+
+
+class TestMissionEndpoints(unittest.TestCase):
+
+    def test_upload_and_start(self):
+        controller = FakeMissionController()
+        with TestClient(endpoints.setup_api_endpoints(controller)) as client:
+            response = client.post(
+                "/mission", json={"waypoints": [{"lat": 41.0, "lon": 29.0, "alt": 10}]}
+            )
+            self.assertEqual(response.json()["items"], 2)
+            # Görevi başlatan istek GET ile yapılamaz.
+            self.assertEqual(client.get("/mission/start").status_code, 405)
+            self.assertEqual(controller.calls, ["upload_mission"])
+            response = client.post("/mission/start")
+        self.assertTrue(response.json()["started"])
+        self.assertEqual(response.json()["mission"]["started_at"], 1.0)
+        self.assertEqual(controller.calls, ["upload_mission", "start_mission"])
+        # İkisi de aracın komut kuyruğundan geçer.
+        self.assertEqual(controller.commands.stats()["executed"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
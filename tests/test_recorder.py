@@ -0,0 +1,130 @@
+import math
+import os
+import tempfile
+import time
+import unittest
+
+from src.core.recorder import (
+    KIND_COMMAND,
+    KIND_TELEMETRY,
+    RECORD_DTYPE,
+    RECORD_SIZE,
+    FlightLogReader,
+    FlightRecorder,
+)
+from src.core.replay import FlightReplayer, ReplayController
+from src.core.telemetry import (
+    AttitudeState,
+    BatteryState,
+    EMPTY_SNAPSHOT,
+    GpsFix,
+    TelemetryCache,
+)
+
+
+def make_snapshot(alt):
+    return EMPTY_SNAPSHOT._replace(
+        gps=GpsFix(41.0, 29.0, alt),
+        battery=BatteryState(12.0, 1.0, 90),
+        attitude=AttitudeState(0.0, 0.1, 0.2),
+    )
+
+
+class TestFlightRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = 1000.0
+        self.recorder = FlightRecorder(
+            self.tmp.name, segment_records=4, clock=lambda: self.now
+        )
+
+    def tearDown(self):
+        self.recorder.close()
+        self.tmp.cleanup()
+
+    def write_flight(self, count):
+        for i in range(count):
+            self.now = 1000.0 + i
+            if i == 3:
+                self.recorder.record_command("move_3d", 1, 0, -1, 2)
+            else:
+                self.recorder.record_telemetry(make_snapshot(float(i)))
+
+    def test_record_layout(self):
+        self.assertEqual(RECORD_SIZE, RECORD_DTYPE.itemsize)
+
+    def test_segments_roll_over_and_read_back(self):
+        self.write_flight(10)
+        self.recorder.close()
+        segments = sorted(os.listdir(self.recorder.path))
+        self.assertEqual(len(segments), 3)
+        reader = FlightLogReader(self.recorder.path)
+        self.assertEqual(len(reader), 10)
+        self.assertEqual(reader.time_range(), (1000.0, 1009.0))
+        records = reader.read()
+        self.assertEqual(records["kind"][3], KIND_COMMAND)
+        self.assertEqual(list(records["values"][3][:4]), [1.0, 0.0, -1.0, 2.0])
+        self.assertTrue(math.isnan(records["values"][3][4]))
+        self.assertEqual(records["values"][9][2], 9.0)
+        reader.close()
+
+    def test_reader_sees_live_segment(self):
+        self.write_flight(2)
+        reader = FlightLogReader(self.recorder.path)
+        self.assertEqual(len(reader), 2)
+
+    def test_seek_by_time(self):
+        self.write_flight(10)
+        reader = FlightLogReader(self.recorder.path)
+        self.assertEqual(reader.seek(0), 0)
+        self.assertEqual(reader.seek(1005.0), 5)
+        self.assertEqual(reader.seek(1005.5), 6)
+        self.assertEqual(reader.seek(2000.0), 10)
+        window = reader.read(1002.0, 1006.0, kind=KIND_TELEMETRY)
+        self.assertEqual(list(window["t"]), [1002.0, 1004.0, 1005.0])
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = 1000.0
+        recorder = FlightRecorder(self.tmp.name, clock=lambda: self.now)
+        for i in range(5):
+            self.now = 1000.0 + i * 0.01
+            recorder.record_telemetry(make_snapshot(float(i)))
+        recorder.record_command("land")
+        recorder.close()
+        self.path = recorder.path
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replayer_feeds_telemetry(self):
+        cache = TelemetryCache()
+        messages = []
+        replayer = FlightReplayer(
+            FlightLogReader(self.path), cache, speed=100, log=messages.append
+        )
+        self.assertEqual(FlightReplayer(None, cache, speed=500).speed, 100)
+        started = time.monotonic()
+        replayer.start()
+        replayer.join(timeout=2)
+        self.assertLess(time.monotonic() - started, 1)
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot.gps, (41.0, 29.0, 4.0))
+        self.assertEqual(snapshot.version, 5)
+        self.assertIn("Kayıtlı komut: land()", messages)
+
+    def test_replay_controller(self):
+        controller = ReplayController(self.path, speed=100)
+        self.assertTrue(controller.connected)
+        controller.start()
+        controller.replayer.join(timeout=2)
+        self.assertEqual(controller.telemetry.snapshot().gps.alt, 4.0)
+        self.assertTrue(controller.link.status()["finished"])
+
+
+if __name__ == '__main__':
+    unittest.main()
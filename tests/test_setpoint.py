@@ -0,0 +1,87 @@
+import time
+import unittest
+
+from src.core.setpoint import SetpointStreamer, JitterStats
+
+
+class TestSetpointStreamer(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.streamer = SetpointStreamer(rate_hz=50)
+        self.streamer.start()
+        self.channel = self.streamer.channel(lambda *v: self.sent.append(v))
+
+    def tearDown(self):
+        self.streamer.close()
+        self.streamer.join(timeout=1)
+
+    def test_rate_is_clamped(self):
+        self.assertEqual(SetpointStreamer(rate_hz=1).rate_hz, 10)
+        self.assertEqual(SetpointStreamer(rate_hz=500).rate_hz, 50)
+
+    def test_target_completes_after_duration(self):
+        future = self.channel.set_target(1, 0, 0, 0.1)
+        self.assertTrue(future.result(timeout=1))
+        self.assertIn((1, 0, 0), self.sent)
+        # Süre dolunca sıfır hız gönderilir
+        self.assertEqual(self.sent[-1], (0, 0, 0))
+        self.assertIsNone(self.channel.target)
+
+    def test_new_target_preempts_previous(self):
+        # Thread başlatılmaz; tick'ler sahte saatle elle sürülür.
+        now = [0.0]
+        sent = []
+        channel = SetpointStreamer(rate_hz=50, clock=lambda: now[0]).channel(
+            lambda *v: sent.append(v)
+        )
+        first = channel.set_target(1, 0, 0, 5)
+        second = channel.set_target(0, 1, 0, 0.05)
+        self.assertFalse(first.result(timeout=0))
+        channel.tick(now[0])
+        now[0] = 0.05
+        channel.tick(now[0])
+        self.assertTrue(second.result(timeout=0))
+        self.assertEqual(sent, [(0, 1, 0), (0, 0, 0)])
+
+    def test_clear_resolves_pending_target(self):
+        future = self.channel.set_target(1, 0, 0, 5)
+        self.channel.clear()
+        self.assertFalse(future.result(timeout=1))
+
+    def test_channels_share_one_thread(self):
+        other_sent = []
+        other = self.streamer.channel(lambda *v: other_sent.append(v))
+        first = self.channel.set_target(1, 0, 0, 0.1)
+        second = other.set_target(0, 0, -1, 0.1)
+        self.assertTrue(first.result(timeout=1))
+        self.assertTrue(second.result(timeout=1))
+        self.assertIn((0, 0, -1), other_sent)
+        self.assertNotIn((0, 0, -1), self.sent)
+        self.assertEqual(self.streamer.stats()["channels"], 2)
+        other.close()
+        self.assertEqual(self.streamer.stats()["channels"], 1)
+
+    def test_stats(self):
+        time.sleep(0.1)
+        stats = self.streamer.stats()
+        self.assertEqual(stats["rate_hz"], 50)
+        self.assertGreater(stats["ticks"], 0)
+        self.assertGreaterEqual(stats["max_jitter_ms"], 0)
+
+
+class TestJitterStats(unittest.TestCase):
+
+    def test_record(self):
+        jitter = JitterStats()
+        for lateness in (0.001, 0.003):
+            jitter.record(lateness)
+        stats = jitter.as_dict()
+        self.assertEqual(stats["ticks"], 2)
+        self.assertAlmostEqual(stats["mean_jitter_ms"], 2.0)
+        self.assertAlmostEqual(stats["max_jitter_ms"], 3.0)
+        self.assertAlmostEqual(stats["stddev_jitter_ms"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
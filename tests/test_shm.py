@@ -0,0 +1,188 @@
+import asyncio
+import multiprocessing
+import struct
+import tempfile
+import threading
+import unittest
+
+from src.api.frames import FrameBuffer
+from src.core import shm
+from src.core.shm import (
+    SeqlockSlots,
+    SharedCounter,
+    SharedFrameStore,
+    SharedTelemetry,
+)
+from src.core.telemetry import BatteryState, GpsFix, TelemetryCache
+
+
+def _write_frames(name, lock_path, count):
+    store = SharedFrameStore(name, capacity=4, max_frame_bytes=4096, lock_path=lock_path)
+    for i in range(count):
+        # Her karenin tüm baytları sıra numarasından türetilir.
+        store.write(bytes([i % 256]) * (1000 + i % 3000), float(i), None, i)
+    store.close()
+
+
+class TestSeqlock(unittest.TestCase):
+
+    def test_unfinished_write_is_never_returned(self):
+        buf = bytearray(SeqlockSlots.size_for(1, struct.Struct("<d"), 16))
+        slots = SeqlockSlots(buf, 0, 1, struct.Struct("<d"), 16)
+        self.assertIsNone(slots.read(0))
+        slots.write(0, (1.5,), b"abc")
+        self.assertEqual(slots.read(0), (2, (1.5,), b"abc"))
+        # Yazma ortasında kalmış yuva (tek sayaç) okunmaz.
+        struct.pack_into("<Q", buf, 0, 3)
+        old_retries, shm.READ_RETRIES = shm.READ_RETRIES, 20
+        try:
+            with self.assertRaises(RuntimeError):
+                slots.read(0)
+        finally:
+            shm.READ_RETRIES = old_retries
+        with self.assertRaises(ValueError):
+            slots.write(0, (1.0,), b"x" * 17)
+
+
+class TestSharedTelemetry(unittest.TestCase):
+
+    def test_snapshot_round_trip(self):
+        owner = SharedTelemetry(["a", "b"], create=True)
+        self.addCleanup(owner.close)
+        reader = SharedTelemetry(["a", "b"], name=owner.name)
+        self.addCleanup(reader.close)
+        cache = TelemetryCache(clock=lambda: 100.0)
+        cache.subscribe(owner.publisher("b"))
+        view = reader.view("b")
+        self.assertEqual(view.snapshot().version, 0)
+        cache.update(gps=GpsFix(41.0, 29.0, None), battery=BatteryState(12.5, 1.0, 80))
+        snapshot = view.snapshot()
+        self.assertEqual(snapshot, cache.snapshot())
+        self.assertIsNone(snapshot.attitude)
+        # Değişmemiş yuva aynı nesneyi döndürür.
+        self.assertIs(view.snapshot(), snapshot)
+        self.assertEqual(reader.view("a").snapshot().version, 0)
+
+
+class TestSharedFrameStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.lock_path = f"{self.dir.name}/frames.lock"
+        self.owner = SharedFrameStore(
+            capacity=4, max_frame_bytes=4096, lock_path=self.lock_path, create=True
+        )
+        self.addCleanup(self.owner.close)
+
+    def attach(self):
+        store = SharedFrameStore(
+            self.owner.name, capacity=4, max_frame_bytes=4096, lock_path=self.lock_path
+        )
+        self.addCleanup(store.close)
+        return store
+
+    def test_sequence_is_shared(self):
+        other = self.attach()
+        self.assertEqual(self.owner.write(b"a", 1.0), 1)
+        self.assertEqual(other.write(b"b", 2.0, 5.0, 7), 2)
+        self.assertEqual(self.owner.read(2), (2, b"b", 2.0, 5.0, 7))
+        self.assertEqual(other.read(1), (1, b"a", 1.0, None, None))
+        for i in range(4):
+            other.write(b"c", 3.0)
+        self.assertIsNone(self.owner.read(1))
+        with self.assertRaises(ValueError):
+            other.write(b"x" * 4097, 4.0)
+
+    def test_reader_never_sees_torn_frames(self):
+        process = multiprocessing.get_context("fork").Process(
+            target=_write_frames, args=(self.owner.name, self.lock_path, 3000)
+        )
+        process.start()
+        checked = 0
+        while process.is_alive() or checked == 0:
+            seq = self.owner.latest_seq()
+            if seq == 0:
+                continue
+            record = self.owner.read(seq)
+            if record is None:
+                continue
+            _, data, timestamp, _, source_seq = record
+            i = source_seq
+            self.assertEqual(timestamp, float(i))
+            self.assertEqual(data, bytes([i % 256]) * (1000 + i % 3000))
+            checked += 1
+        process.join()
+        self.assertEqual(self.owner.latest_seq(), 3000)
+        self.assertGreater(checked, 0)
+
+    def test_frame_buffers_in_different_workers(self):
+        first = FrameBuffer(capacity=4, poll_interval=0.005)
+        second = FrameBuffer(capacity=4, poll_interval=0.005)
+        first.share(self.owner)
+        second.share(self.attach())
+        self.assertEqual(first.publish(b"one", 1.0, 1), 1)
+        self.assertEqual(second.publish(b"two", 2.0, 3), 2)
+        self.assertEqual(first.latest().data, b"two")
+        self.assertEqual(second.get(1).data, b"one")
+        self.assertEqual(first.stats()["source_gaps"], 1)
+
+        async def scenario():
+            waiter = asyncio.ensure_future(second.wait_after(2, timeout=2))
+            await asyncio.sleep(0.02)
+            first.publish(b"three")
+            return await waiter
+
+        frame = asyncio.run(scenario())
+        self.assertEqual((frame.seq, frame.data), (3, b"three"))
+
+    def test_frame_arriving_while_waiter_registers(self):
+        other = self.attach()
+        buffer = FrameBuffer(capacity=4, poll_interval=0.005)
+        buffer.share(_RacingStore(self.owner, lambda: other.write(b"late", 1.0)))
+        result = []
+
+        def run():
+            result.append(asyncio.run(buffer.wait_after(None, timeout=1)))
+
+        # Kilitlenme olursa döngü thread'i takılır; test yine de biter.
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result[0].data, b"late")
+
+
+class _RacingStore:
+    """İlk latest_seq() okumasından hemen sonra başka worker'ın kare yazdığı halka."""
+
+    def __init__(self, store, write):
+        self._store = store
+        self._write = write
+
+    def latest_seq(self):
+        seq = self._store.latest_seq()
+        write, self._write = self._write, None
+        if write is not None:
+            write()
+        return seq
+
+    def __getattr__(self, name):
+        return getattr(self._store, name)
+
+
+class TestSharedCounter(unittest.TestCase):
+
+    def test_increment(self):
+        lock_path = tempfile.mktemp()
+        owner = SharedCounter(lock_path=lock_path, create=True)
+        self.addCleanup(owner.close)
+        other = SharedCounter(owner.name, lock_path=lock_path)
+        self.addCleanup(other.close)
+        self.assertEqual(owner.increment(), 1)
+        self.assertEqual(other.increment(), 2)
+        self.assertEqual(owner.value(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from src.core.backend import DronekitBackend, backend_for
+from src.core.simulator import SimClock, SimulatedVehicle, SimulatorBackend
+
+
+class TestSimulatedVehicle(unittest.TestCase):
+
+    def setUp(self):
+        # Thread başlatılmadan advance() ile deterministik adımlar atılır.
+        self.now = 0.0
+        self.vehicle = SimulatedVehicle(clock=lambda: self.now)
+        self.acks = []
+        self.vehicle.add_message_listener(
+            "COMMAND_ACK", lambda v, name, msg: self.acks.append((msg.command, msg.result))
+        )
+
+    def fly(self, seconds, dt=0.05):
+        for _ in range(int(seconds / dt)):
+            self.now += dt
+            self.vehicle.advance(dt, self.now)
+
+    def takeoff(self, altitude=10):
+        self.vehicle.mode = SimulatorBackend().mode("GUIDED")
+        self.vehicle.armed = True
+        self.vehicle.simple_takeoff(altitude)
+        self.fly(10)
+
+    def test_takeoff_reaches_altitude(self):
+        self.takeoff(10)
+        self.assertAlmostEqual(self.vehicle.location.global_relative_frame.alt, 10, delta=0.5)
+        self.assertIn((400, 0), self.acks)
+        self.assertIn((22, 0), self.acks)
+
+    def test_takeoff_rejected_when_disarmed(self):
+        self.vehicle.simple_takeoff(10)
+        self.assertEqual(self.acks, [(22, 4)])
+
+    def test_body_velocity_follows_heading(self):
+        self.takeoff()
+        msg = self.vehicle.message_factory.command_long_encode(0, 0, 115, 0, 90, 0, 1, 1, 0, 0, 0)
+        self.vehicle.send_mavlink(msg)
+        self.fly(4)
+        self.assertEqual(self.vehicle.heading, 90)
+        start = self.vehicle.location.global_relative_frame
+        msg = self.vehicle.message_factory.set_position_target_local_ned_encode(
+            0, 0, 0, 8, 0b0000111111000111, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0
+        )
+        self.vehicle.send_mavlink(msg)
+        self.fly(2)
+        end = self.vehicle.location.global_relative_frame
+        # 90 derece yönünde ileri gitmek doğuya hareket demektir.
+        self.assertGreater(end.lon, start.lon)
+        self.assertAlmostEqual(end.lat, start.lat, places=6)
+
+    def test_land_disarms(self):
+        self.takeoff(5)
+        self.vehicle.mode = "LAND"
+        self.fly(8)
+        self.assertFalse(self.vehicle.armed)
+        self.assertEqual(self.vehicle.location.global_relative_frame.alt, 0)
+
+    def test_battery_drains_in_flight(self):
+        before = self.vehicle.battery.level
+        self.takeoff()
+        self.fly(120)
+        self.assertLess(self.vehicle.battery.level, before)
+        self.assertGreater(self.vehicle.battery.current, 10)
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_backend_for(self):
+        backend = backend_for("sim://?time_scale=50&lat=40.5&lon=30.5")
+        self.assertIsInstance(backend, SimulatorBackend)
+        self.assertEqual(backend.clock.time_scale, 50)
+        self.assertEqual(backend.home, (40.5, 30.5))
+        self.assertIsInstance(backend_for("udp:127.0.0.1:14550"), DronekitBackend)
+
+    def test_sim_clock_is_accelerated(self):
+        clock = SimClock(time_scale=1000)
+        start = clock()
+        for _ in range(10000):
+            pass
+        self.assertGreater(clock() - start, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
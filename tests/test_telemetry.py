@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.core.telemetry import TelemetryCache, EMPTY_SNAPSHOT
+
+
+class TestTelemetryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.cache = TelemetryCache(clock=lambda: self.now)
+        self.mock_vehicle = MagicMock()
+        self.mock_vehicle.location.global_frame.lat = 34.0
+        self.mock_vehicle.location.global_frame.lon = -118.0
+        self.mock_vehicle.location.global_relative_frame.alt = 50.0
+        self.mock_vehicle.battery.voltage = 12.5
+        self.mock_vehicle.battery.current = 10.0
+        self.mock_vehicle.battery.level = 80
+        self.mock_vehicle.attitude.roll = 0.1
+        self.mock_vehicle.attitude.pitch = 0.2
+        self.mock_vehicle.attitude.yaw = 0.3
+
+    def test_empty_snapshot(self):
+        snapshot = self.cache.snapshot()
+        self.assertIs(snapshot, EMPTY_SNAPSHOT)
+        self.assertEqual(snapshot.to_dict()["gps"], {})
+
+    def test_attach_seeds_and_subscribes(self):
+        self.cache.attach(self.mock_vehicle)
+        snapshot = self.cache.snapshot()
+        self.assertEqual(snapshot.gps, (34.0, -118.0, 50.0))
+        self.assertEqual(snapshot.battery.level, 80)
+        self.assertEqual(snapshot.attitude.yaw, 0.3)
+        self.assertEqual(snapshot.timestamps.gps, 100.0)
+        names = [c.args[0] for c in self.mock_vehicle.add_attribute_listener.call_args_list]
+        self.assertIn("attitude", names)
+        self.assertIn("location.global_relative_frame", names)
+
+    def test_listener_publishes_new_version(self):
+        self.cache.attach(self.mock_vehicle)
+        before = self.cache.snapshot()
+        self.now = 101.0
+        attitude = MagicMock(roll=1.0, pitch=2.0, yaw=3.0)
+        self.cache._on_attitude(self.mock_vehicle, "attitude", attitude)
+        after = self.cache.snapshot()
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(after.attitude, (1.0, 2.0, 3.0))
+        self.assertEqual(after.timestamps.attitude, 101.0)
+        self.assertEqual(after.timestamps.gps, 100.0)
+        # Eski snapshot değişmemeli
+        self.assertEqual(before.attitude, (0.1, 0.2, 0.3))
+
+    def test_subscribers_run_outside_write_lock(self):
+        seen = []
+
+        def subscriber(snapshot):
+            # Abone içinden yazma kilitlenmeden tamamlanabilmeli.
+            seen.append((snapshot.version, self.cache._write_lock.locked()))
+            if snapshot.version == 1:
+                self.cache.update_position(alt=20.0)
+
+        self.cache.subscribe(subscriber)
+        self.cache.update_position(lat=41.0, lon=29.0)
+        self.assertEqual(seen, [(1, False), (2, False)])
+        self.assertEqual(self.cache.snapshot().gps, (41.0, 29.0, 20.0))
+
+    def test_detach_removes_listeners(self):
+        self.cache.attach(self.mock_vehicle)
+        self.cache.detach()
+        self.assertEqual(self.mock_vehicle.remove_attribute_listener.call_count, 4)
+
+    def test_to_dict(self):
+        self.cache.attach(self.mock_vehicle)
+        data = self.cache.snapshot().to_dict()
+        self.assertEqual(data["gps"], {"lat": 34.0, "lon": -118.0, "alt": 50.0})
+        self.assertEqual(data["battery"]["voltage"], 12.5)
+        self.assertEqual(data["timestamps"]["battery"], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api.endpoints import setup_api_endpoints
+from src.core.telemetry import BatteryState, GpsFix, TelemetryCache
+
+
+class FakeController:
+    def __init__(self):
+        self.telemetry = TelemetryCache()
+
+
+class TestTelemetryWebSocket(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = FakeController()
+        self.controller.telemetry.update(
+            gps=GpsFix(41.0, 29.0, 10.0), battery=BatteryState(12.4, 1.0, 90)
+        )
+        self.client = TestClient(setup_api_endpoints(self.controller))
+
+    def test_initial_message_has_selected_fields(self):
+        with self.client.websocket_connect("/ws/telemetry?fields=gps,battery.level") as ws:
+            message = ws.receive_json()
+        self.assertEqual(message["version"], 1)
+        self.assertEqual(
+            message["data"],
+            {"gps.lat": 41.0, "gps.lon": 29.0, "gps.alt": 10.0, "battery.level": 90},
+        )
+
+    def test_only_changed_fields_are_sent(self):
+        with self.client.websocket_connect("/ws/telemetry?rate=50") as ws:
+            first = ws.receive_json()
+            self.assertIn("attitude.yaw", first["data"])
+            self.controller.telemetry.update(gps=GpsFix(41.0, 29.0, 12.5))
+            update = ws.receive_json()
+        self.assertEqual(set(update["data"]), {"gps.alt", "timestamps.gps"})
+        self.assertEqual(update["data"]["gps.alt"], 12.5)
+
+    def test_subscription_can_change(self):
+        with self.client.websocket_connect("/ws/telemetry?fields=gps.lat&rate=50") as ws:
+            ws.receive_json()
+            ws.send_json({"fields": ["battery"], "rate": 20})
+            message = ws.receive_json()
+            self.assertEqual(
+                message["data"], {"battery.voltage": 12.4, "battery.current": 1.0, "battery.level": 90}
+            )
+            ws.send_json({"fields": ["altitude"]})
+            self.assertIn("error", ws.receive_json())
+
+    def test_unknown_field_closes_connection(self):
+        with self.client.websocket_connect("/ws/telemetry?fields=speed") as ws:
+            message = ws.receive()
+        self.assertEqual(message["type"], "websocket.close")
+        self.assertEqual(message["code"], 1008)
+
+
+if __name__ == '__main__':
+    unittest.main()
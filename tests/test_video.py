@@ -0,0 +1,129 @@
+import io
+import threading
+import time
+import unittest
+
+import requests
+from PIL import Image
+
+from src.api.frames import FrameBuffer
+from src.gui.video import VideoConsumer, decode_frame
+
+
+def make_jpeg(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 200, 30)).save(output, "JPEG")
+    return output.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append(dict(params))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        pass
+
+
+class TestVideoConsumer(unittest.TestCase):
+
+    def test_decode_fits_box(self):
+        image = decode_frame(make_jpeg(1280, 960), (320, 240))
+        self.assertEqual(image.size, (320, 240))
+        self.assertEqual(decode_frame(make_jpeg(160, 120), (320, 240)).size, (160, 120))
+
+    def test_keeps_only_newest_frame(self):
+        jpeg = make_jpeg(640, 480)
+        session = FakeSession(
+            [
+                FakeResponse(503),
+                FakeResponse(200, jpeg, {"X-Frame-Seq": "4"}),
+                FakeResponse(200, jpeg, {"X-Frame-Seq": "9"}),
+                FakeResponse(204),
+            ]
+        )
+        consumer = VideoConsumer(size=(320, 240), session=session)
+        self.assertEqual(consumer.poll(), consumer.retry_delay)
+        self.assertEqual(consumer.messages.get_nowait(), "Kamera akışı bekleniyor...")
+        for _ in range(3):
+            self.assertEqual(consumer.poll(), 0)
+        # Long-poll son görülen kareden sonrasını ister.
+        self.assertNotIn("after", session.requests[1])
+        self.assertEqual(session.requests[2]["after"], 4)
+        self.assertEqual(session.requests[3]["after"], 9)
+        seq, image = consumer.take()
+        self.assertEqual((seq, image.size), (9, (320, 240)))
+        self.assertIsNone(consumer.take())
+        self.assertEqual(consumer.stats()["dropped"], 1)
+
+    def test_ready_tracks_untaken_frame(self):
+        session = FakeSession([FakeResponse(200, make_jpeg(64, 48), {"X-Frame-Seq": "1"})])
+        consumer = VideoConsumer(size=(32, 24), session=session)
+        self.assertFalse(consumer.ready())
+        consumer.poll()
+        self.assertTrue(consumer.ready())
+        self.assertEqual(consumer.take()[0], 1)
+        self.assertFalse(consumer.ready())
+
+    def test_connection_error_restarts_sequence(self):
+        session = FakeSession(
+            [
+                FakeResponse(200, make_jpeg(64, 48), {"X-Frame-Seq": "7"}),
+                requests.ConnectionError("kapalı"),
+                requests.ConnectionError("kapalı"),
+            ]
+        )
+        consumer = VideoConsumer(session=session)
+        consumer.poll()
+        self.assertEqual(consumer.poll(), consumer.retry_delay)
+        self.assertIsNone(consumer.seq)
+        consumer.poll()
+        # Aynı hata bir kez loglanır.
+        self.assertTrue(consumer.messages.get_nowait().startswith("Görüntü alınamadı"))
+        self.assertTrue(consumer.messages.empty())
+        self.assertEqual(consumer.stats()["errors"], 2)
+
+    def test_local_frames_bypass_http(self):
+        buffer = FrameBuffer()
+        buffer.publish(make_jpeg(64, 48))
+        consumer = VideoConsumer(size=(32, 24), frames=buffer)
+        self.assertIsNone(consumer.session)
+        consumer.start()
+        try:
+            self.assertEqual(self._take(consumer)[0], 1)
+            jpeg = make_jpeg(640, 480)
+            threading.Thread(target=buffer.publish, args=(jpeg,)).start()
+            seq, image = self._take(consumer)
+            self.assertEqual((seq, image.size), (2, (32, 24)))
+        finally:
+            consumer.stop()
+            consumer.join(1)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(buffer.stats()["subscribers"], 0)
+
+    def _take(self, consumer, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            frame = consumer.take()
+            if frame is not None:
+                return frame
+            time.sleep(0.005)
+        self.fail("Kare gelmedi")
+
+
+if __name__ == '__main__':
+    unittest.main()